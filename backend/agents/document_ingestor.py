@@ -1,23 +1,104 @@
 import os
+import re
 import json
+import math
+import asyncio
+import functools
+import time
+import zipfile
 import fitz  # PyMuPDF
 import traceback
-from typing import List, Dict, Any, Optional
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from email import message_from_bytes, policy
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
+import numpy as np
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.shapes.picture import Picture
 from prompts import get_analysis_prompt, get_comprehensive_analysis_prompt
 # import aspose.slides as slides
+import shutil
 import tempfile 
 import base64
 from io import BytesIO
 
 # Setup API key
 from config import get_settings
+from utils.rasterizer import ocr_available, ocr_page_text, ocr_pages, render_page, render_page_png
+from utils.page_cache import (
+    PHASH_SIZE,
+    create_document_version_repository,
+    create_page_analysis_repository,
+    diff_pages,
+    document_key,
+    is_near_duplicate,
+    page_fingerprint,
+    perceptual_hash,
+    text_fingerprint
+)
 
 settings = get_settings()
 
+# Supported document kinds by file extension
+DOCUMENT_KINDS = {
+    ".pdf": "pdf",
+    ".pptx": "pptx",
+    ".eml": "email",
+    ".vtt": "call",
+    ".srt": "call",
+    ".txt": "text",
+    ".md": "text",
+    ".csv": "text",
+    ".json": "text",
+    ".zip": "zip",
+}
+
+# Pages and slides are sent to the vision model only when a picture covers at least this share of
+# the page; charts and tables are read natively where possible and logos or icons are ignored
+VISION_MIN_PICTURE_AREA = 0.15
+VISION_IMAGE_TYPES = {"image/png", "image/jpeg"}
+
+# PDF pages whose vector graphics outside tables (bars, pie slices, diagram shapes) together cover at
+# least this share of the page still need vision; coverage is measured on a coarse grid over the page
+VISION_MIN_DRAWING_AREA = 0.04
+DRAWING_GRID_CELLS = 64
+
+# A PDF page is a scan (and needs OCR) when a picture covers most of it and its text layer has fewer
+# than TEXT_LAYER_SCAN_CHARS characters (a stamped header or page number); short vector text, as on
+# title and closing slides, is a real text layer. Pages with less than TEXT_LAYER_MIN_CHARS characters
+# are sent to vision if they have any picture or drawing.
+TEXT_LAYER_MIN_CHARS = 20
+TEXT_LAYER_SCAN_CHARS = 200
+SCANNED_PICTURE_AREA = 0.8
+
+# A single number token, e.g. "$1.2M", "40%", "(12)", "3.5x", "1,200"
+NUMBER_TOKEN = re.compile(r"^[($€£¥+-]*\d[\d,]*(\.\d+)?%?([KMBkmb]n?|[xX])?\)?$")
+MAX_FIGURES_PER_PAGE = 60
+
+def document_kind(filename: str) -> Optional[str]:
+    """Returns the kind of document ("pdf", "pptx", "email", "call", "text" or "zip"), or None if unsupported."""
+    kind = DOCUMENT_KINDS.get(Path(filename).suffix.lower())
+    if kind == "text":
+        # Plain-text exports are classified by name, e.g. "call_transcript.txt", "emails.txt"
+        name = Path(filename).stem.lower()
+        if "transcript" in name or "call" in name:
+            return "call"
+        if "email" in name or "mail" in name:
+            return "email"
+    return kind
+
+def email_to_text(raw: bytes) -> str:
+    """Returns the headers and plain-text body of an .eml message."""
+    message = message_from_bytes(raw, policy=policy.default)
+    headers = [f"{name}: {message[name]}" for name in ("From", "To", "Cc", "Subject", "Date") if message[name]]
+    body = message.get_body(preferencelist=("plain", "html"))
+    content = body.get_content() if body is not None else ""
+    return "\n".join(headers) + "\n\n" + content
+
 class StartupAnalyzer:
     def __init__(self):
         # Initialize text-only model
@@ -32,37 +113,306 @@ class StartupAnalyzer:
         google_api_key=settings.google_api_key
         )
     
+    def extract_pdf_page_structure(self, page) -> Tuple[Dict[str, Any], List[Any]]:
+        """
+        Deterministically extract tables and labeled numbers from a page's text layer.
+        
+        Returns:
+            (structured data with "tables" (rows of cells) and "figures" ({label, value}), table rectangles)
+        """
+        structured_data = {}
+        tables, table_rects = [], []
+        try:
+            found = page.find_tables().tables
+        except Exception as e:
+            print(f"⚠️ Table detection failed on page {page.number + 1}: {e}")
+            found = []
+        for table in found:
+            rows = [[(cell or "").strip() for cell in row] for row in table.extract()]
+            if any(cell for row in rows for cell in row):
+                tables.append(rows)
+                table_rects.append(fitz.Rect(table.bbox))
+        if tables:
+            structured_data["tables"] = tables
+
+        # Numbers outside tables, labeled with the words before them on their line
+        # ("Revenue: $1.2M Growth 40%"), or the words after them when none precede
+        lines: Dict[Tuple[int, int], List[str]] = {}
+        for x0, y0, x1, y1, word, block_no, line_no, _ in page.get_text("words"):
+            if any(fitz.Rect(x0, y0, x1, y1).intersects(rect) for rect in table_rects):
+                continue
+            lines.setdefault((block_no, line_no), []).append(word)
+        figures = []
+        for words in lines.values():
+            line_figures, label_words = [], []
+            for word in words:
+                if NUMBER_TOKEN.match(word):
+                    line_figures.append((" ".join(label_words), word))
+                    label_words = []
+                else:
+                    label_words.append(word)
+            for label, value in line_figures:
+                label = (label or " ".join(label_words)).strip(" :-–|")
+                if label:
+                    figures.append({"label": label, "value": value})
+        if figures:
+            structured_data["figures"] = figures[:MAX_FIGURES_PER_PAGE]
+
+        return structured_data, table_rects
+
+    def pdf_page_needs_vision(self, page, page_text: str, table_rects: List[Any]) -> bool:
+        """
+        Whether a page has content only an image can convey: a scanned page, a large
+        picture, or vector graphics (charts, diagrams) outside its tables.
+        """
+        page_area = abs(page.rect) or 1
+        if len(page_text.strip()) < TEXT_LAYER_MIN_CHARS:
+            return bool(page.get_images()) or bool(page.get_drawings())
+        for image in page.get_image_info():
+            if abs(fitz.Rect(image["bbox"]) & page.rect) / page_area >= VISION_MIN_PICTURE_AREA:
+                return True
+        # Vector graphics other than the page background and table rules, measured by the area they
+        # cover rather than by path count: a 4-slice pie is a few large paths, a ruled form many thin ones
+        covered = np.zeros((DRAWING_GRID_CELLS, DRAWING_GRID_CELLS), dtype=bool)
+        cell_width = (page.rect.width or 1) / DRAWING_GRID_CELLS
+        cell_height = (page.rect.height or 1) / DRAWING_GRID_CELLS
+        for drawing in page.get_drawings():
+            rect = fitz.Rect(drawing["rect"]) & page.rect
+            if not rect.is_valid:
+                continue  # off the page
+            if abs(rect) >= 0.9 * page_area or any(table.contains(rect) for table in table_rects):
+                continue  # page background or table rules
+            x0 = int((rect.x0 - page.rect.x0) / cell_width)
+            y0 = int((rect.y0 - page.rect.y0) / cell_height)
+            x1 = max(x0 + 1, math.ceil((rect.x1 - page.rect.x0) / cell_width))
+            y1 = max(y0 + 1, math.ceil((rect.y1 - page.rect.y0) / cell_height))
+            covered[y0:y1, x0:x1] = True
+        return covered.mean() >= VISION_MIN_DRAWING_AREA
+
+    def pdf_page_has_text_layer(self, page, page_text: str) -> bool:
+        """Whether a page's text comes from a real text layer rather than a scan that needs OCR."""
+        if len(page_text.strip()) >= TEXT_LAYER_SCAN_CHARS:
+            return True
+        page_area = abs(page.rect) or 1
+        for image in page.get_image_info():
+            if abs(fitz.Rect(image["bbox"]) & page.rect) / page_area >= SCANNED_PICTURE_AREA:
+                return False
+        return True
+
     def extract_pdf_pages_content_from_bytes(self,pdf_bytes: bytes) -> List[Dict[str, Any]]:
         """Extract from PDF bytes (useful for S3/GCS files)."""
+        return self.extract_pdf_pages_content(pdf_bytes)
+
+    def extract_pdf_pages_content(self, source: Union[bytes, str]) -> List[Dict[str, Any]]:
+        """
+        Extract each page of a PDF given as bytes or a file path.
+        
+        A file is opened from disk, so MuPDF reads objects on demand instead
+        of holding the whole document in memory. Tables and labeled numbers
+        are pre-extracted from the text layer; pages whose content is fully
+        covered by text and tables are not rendered and go to the text model
+        instead of the multimodal one.
+        
+        Pages that need vision are rendered only when they are analyzed (see
+        `page_image`) for files on disk, in the rendering process pool so PNG
+        encoding doesn't hold the API process's GIL; only one image per model
+        call is held in memory. PDFs given as bytes are rendered here.
+        
+        Scanned pages without a text layer are OCRed in the same pool when
+        Tesseract is available (INGESTION_OCR), so they still have page text
+        for the text models, the RAG index and the fact checker. Each page's
+        `text_source` is "text_layer", "ocr" or None.
+        """
+        from_memory = isinstance(source, (bytes, bytearray))
         try:
-            print("🔄 Processing PDF from memory with PyMuPDF")
+            print(f"🔄 Processing PDF from {'memory' if from_memory else 'disk'} with PyMuPDF")
 
-            # Open PDF from bytes
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            doc = fitz.open(stream=source, filetype="pdf") if from_memory else fitz.open(source)
             pages_data = []
+            vision_pages = []
+            scanned_pages = []
 
             for page_num in range(doc.page_count):
                 page = doc.load_page(page_num)  # modern method
                 page_text = page.get_text("text")  # modern method
-
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                img_data = pix.tobytes("png")
-                img_base64 = base64.b64encode(img_data).decode('utf-8')
+                structured_data, table_rects = self.extract_pdf_page_structure(page)
+
+                # Low-resolution grayscale render for near-duplicate detection
+                thumbnail = page.get_pixmap(
+                    matrix=fitz.Matrix(PHASH_SIZE / page.rect.width, PHASH_SIZE / page.rect.height),
+                    colorspace=fitz.csGRAY,
+                    alpha=False
+                )
+
+                needs_vision = self.pdf_page_needs_vision(page, page_text, table_rects)
+                if needs_vision:
+                    vision_pages.append(page_num)
+                has_text_layer = self.pdf_page_has_text_layer(page, page_text)
+                if not has_text_layer:
+                    scanned_pages.append(page_num)
 
                 pages_data.append({
                     "page_number": page_num + 1,
                     "text_content": page_text.strip(),
-                    "image_base64": img_base64,
-                    "has_content": True
+                    "structured_data": structured_data,
+                    "image_base64": None,  # filled in below for PDFs in memory, else rendered on analysis
+                    "image_mime": None,
+                    "render_path": None,
+                    "has_content": bool(page_text.strip() or needs_vision),
+                    "text_source": "text_layer" if has_text_layer and page_text.strip() else None,
+                    "phash": perceptual_hash(thumbnail.samples, thumbnail.width, thumbnail.height)
                 })
 
-                print(f"✅ Processed page {page_num + 1} from memory")
-
+                print(f"✅ Processed page {page_num + 1}")
+
+            print(f"📊 {len(vision_pages)} of {len(pages_data)} pages need vision")
+            if scanned_pages and settings.ingestion_ocr and ocr_available():
+                print(f"🔠 Running OCR on {len(scanned_pages)} pages without a text layer")
+                language, dpi = settings.ingestion_ocr_language, settings.ingestion_ocr_dpi
+                if from_memory:
+                    ocr_texts = {page_num: ocr_page_text(doc.load_page(page_num), language, dpi) for page_num in scanned_pages}
+                else:
+                    ocr_texts = ocr_pages(source, scanned_pages, language, dpi, max_workers=settings.ingestion_render_processes)
+                for page_num, ocr_text in ocr_texts.items():
+                    # Keep whatever the text layer had if recognition found less
+                    if len(ocr_text) > len(pages_data[page_num]["text_content"]):
+                        pages_data[page_num]["text_content"] = ocr_text
+                        pages_data[page_num]["text_source"] = "ocr"
+                        pages_data[page_num]["has_content"] = True
+            elif scanned_pages:
+                print(f"⚠️ {len(scanned_pages)} pages have no text layer and OCR is unavailable (install Tesseract)")
+            for page_data in pages_data:
+                if page_data["text_source"] is None and page_data["text_content"]:
+                    page_data["text_source"] = "text_layer"
+                page_data["text_hash"] = text_fingerprint(page_data["text_content"], page_data["structured_data"])
+            for page_num in vision_pages:
+                pages_data[page_num]["image_mime"] = "image/png"
+                if from_memory:
+                    pages_data[page_num]["image_base64"] = base64.b64encode(render_page_png(doc.load_page(page_num))).decode('utf-8')
+                else:
+                    pages_data[page_num]["render_path"] = source
             doc.close()
             return pages_data
 
         except Exception as e:
-            print(f"❌ Error processing PDF from bytes: {e}")
+            print(f"❌ Error processing PDF: {e}")
+            return []
+
+    def _pptx_chart_data(self, chart) -> Dict[str, Any]:
+        """Returns a chart's type, title and exact series values."""
+        chart_data = {
+            "chart_type": getattr(chart.chart_type, "name", str(chart.chart_type)),
+            "title": chart.chart_title.text_frame.text.strip() if chart.has_title and chart.chart_title.has_text_frame else None,
+            "series": []
+        }
+        for plot in chart.plots:
+            try:
+                categories = [str(category) for category in plot.categories]
+            except Exception:
+                categories = []  # e.g. XY charts have no categories
+            for series in plot.series:
+                chart_data["series"].append({
+                    "name": series.name,
+                    "categories": categories,
+                    "values": list(series.values)
+                })
+        return chart_data
+
+    def _collect_pptx_shape(self, shape, slide_content: Dict[str, List]) -> None:
+        """Sorts a slide shape's content into text, tables, charts and pictures (recursing into groups)."""
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            for child in shape.shapes:
+                self._collect_pptx_shape(child, slide_content)
+        elif getattr(shape, "has_chart", False) and shape.has_chart:
+            slide_content["charts"].append(self._pptx_chart_data(shape.chart))
+        elif getattr(shape, "has_table", False) and shape.has_table:
+            slide_content["tables"].append([[cell.text.strip() for cell in row.cells] for row in shape.table.rows])
+        elif isinstance(shape, Picture):
+            try:
+                slide_content["pictures"].append(((shape.width or 0) * (shape.height or 0), shape.image))
+            except Exception:
+                pass  # linked or missing image
+        elif shape.has_text_frame and shape.text_frame.text.strip():
+            slide_content["texts"].append(shape.text_frame.text.strip())
+
+    def _vision_image(self, image) -> Optional[Tuple[str, str]]:
+        """Returns (base64, mime type) of an embedded image in a format the vision model accepts, or None."""
+        if image.content_type in VISION_IMAGE_TYPES:
+            return base64.b64encode(image.blob).decode('utf-8'), image.content_type
+        try:
+            # BMP, GIF, TIFF...; vector formats (EMF/WMF) can't be rendered without LibreOffice
+            pix = fitz.Pixmap(image.blob)
+            return base64.b64encode(pix.tobytes("png")).decode('utf-8'), "image/png"
+        except Exception:
+            return None
+
+    def _image_phash(self, blob: bytes) -> Optional[str]:
+        """Returns the pHash of an embedded image, or None if it can't be decoded."""
+        try:
+            pix = fitz.Pixmap(blob)
+            if pix.alpha:
+                pix = fitz.Pixmap(pix, 0)
+            if pix.n != 1:
+                pix = fitz.Pixmap(fitz.csGRAY, pix)
+            pix = fitz.Pixmap(pix, PHASH_SIZE, PHASH_SIZE, None)
+            return perceptual_hash(pix.samples, pix.width, pix.height)
+        except Exception:
+            return None
+
+    def extract_pptx_slides_content_from_bytes(self, pptx_bytes: bytes) -> List[Dict[str, Any]]:
+        """Extract slides from PPTX bytes."""
+        return self.extract_pptx_slides_content(pptx_bytes)
+
+    def extract_pptx_slides_content(self, source: Union[bytes, str]) -> List[Dict[str, Any]]:
+        """
+        Extract slides from a PPTX deck (bytes or file path) natively, one entry per slide.
+        
+        Text, speaker notes, tables and chart series come out as exact
+        structured data. Only slides dominated by a picture carry an image
+        (the embedded picture itself, no rendering) for the vision model.
+        """
+        from_memory = isinstance(source, (bytes, bytearray))
+        try:
+            print(f"🔄 Processing PPTX from {'memory' if from_memory else 'disk'} with python-pptx")
+
+            presentation = Presentation(BytesIO(source) if from_memory else source)
+            slide_area = (presentation.slide_width or 1) * (presentation.slide_height or 1)
+            pages_data = []
+
+            for slide_num, slide in enumerate(presentation.slides):
+                slide_content = {"texts": [], "tables": [], "charts": [], "pictures": []}
+                for shape in slide.shapes:
+                    self._collect_pptx_shape(shape, slide_content)
+                texts = slide_content["texts"]
+                if slide.has_notes_slide and slide.notes_slide.notes_text_frame.text.strip():
+                    texts.append(f"Speaker notes: {slide.notes_slide.notes_text_frame.text.strip()}")
+
+                image_base64, image_mime, phash = None, None, None
+                pictures = sorted(slide_content["pictures"], key=lambda picture: picture[0], reverse=True)
+                if pictures and pictures[0][0] / slide_area >= VISION_MIN_PICTURE_AREA:
+                    image_base64, image_mime = self._vision_image(pictures[0][1]) or (None, None)
+                    if image_base64:
+                        phash = self._image_phash(pictures[0][1].blob)
+
+                structured_data = {key: slide_content[key] for key in ("tables", "charts") if slide_content[key]}
+                pages_data.append({
+                    "page_number": slide_num + 1,
+                    "text_content": "\n".join(texts),
+                    "structured_data": structured_data,
+                    "image_base64": image_base64,
+                    "image_mime": image_mime,
+                    "has_content": bool(texts or structured_data or image_base64),
+                    # Slides without a vision image are fully described by their text hash
+                    "text_hash": text_fingerprint("\n".join(texts), structured_data),
+                    "phash": phash
+                })
+
+            vision_slides = sum(1 for page in pages_data if page["image_base64"])
+            print(f"✅ Processed {len(pages_data)} slides ({vision_slides} need vision)")
+            return pages_data
+
+        except Exception as e:
+            print(f"❌ Error processing PPTX: {e}")
             return []
 
     def read_pdf_to_bytes(self, pdf_path: str) -> bytes:
@@ -96,8 +446,7 @@ class StartupAnalyzer:
             print(f"\n🔄 Starting per-page multimodal PDF analysis: {pdf_path}")
             
             # Step 1: Extract content and images for each page
-            pdf_bytes = self.read_pdf_to_bytes(pdf_path)
-            pages_data = self.extract_pdf_pages_content_from_bytes(pdf_bytes)
+            pages_data = self.extract_pdf_pages_content(pdf_path)
 
             if not pages_data:
                 return {
@@ -108,83 +457,142 @@ class StartupAnalyzer:
                 }
             
             # Step 2: Analyze each page individually with multimodal model
-            page_analyses = []
-            successful_analyses = 0
-            
-            for page_data in pages_data:
-                page_number = page_data["page_number"]
-                page_text = page_data["text_content"]
-                page_image = page_data["image_base64"]
-                
-                print(f"\n🤖 Analyzing page {page_number} with multimodal AI...")
-                
-                try:
-                    # Create prompt for this specific page
-                    prompt = self.create_per_page_multimodal_prompt(page_number, page_text)
-                    
-                    # Prepare multimodal message content
-                    message_content = [{"type": "text", "text": prompt}]
-                    
-                    # Add page image if available
-                    if page_image:
-                        message_content.append({
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{page_image}"
-                            }
-                        })
-                    
-                    # Send to multimodal model
-                    messages = [HumanMessage(content=message_content)]
-                    response = self.multimodal_model.invoke(messages)
-                    
-                    page_analysis = {
-                        "page_number": page_number,
-                        "text_content": page_text,
-                        "has_image": bool(page_image),
-                        "analysis": response.content,
-                        "status": "success"
-                    }
-                    
-                    successful_analyses += 1
-                    print(f"✅ Page {page_number} analysis completed")
-                    
-                except Exception as e:
-                    page_analysis = {
-                        "page_number": page_number,
-                        "text_content": page_text,
-                        "has_image": bool(page_image),
-                        "analysis": f"Analysis failed: {str(e)}",
-                        "status": "failed"
-                    }
-                    print(f"❌ Page {page_number} analysis failed: {e}")
-                
-                page_analyses.append(page_analysis)
+            page_analyses = [self.analyze_page(page_data) for page_data in pages_data]
             
             # Step 3: Generate overall document summary
             print("\n📊 Generating overall document summary...")
             overall_summary = self.generate_document_summary_from_pages(page_analyses, doc_type)
             
+            return self.build_pages_result(doc_type, pdf_path, pages_data, page_analyses, overall_summary)
+            
+        except Exception as e:
             return {
                 "document_type": doc_type,
                 "file_path": pdf_path,
-                "total_pages": len(pages_data),
-                "successful_analyses": successful_analyses,
-                "page_analyses": page_analyses,
-                "overall_summary": overall_summary,
-                "analysis_type": "per_page_multimodal",
-                "status": "success"
+                "error": f"Per-page multimodal analysis failed: {str(e)}",
+                "traceback": traceback.format_exc(),
+                "status": "failed"
             }
+
+    def analyze_pptx_document(self, pptx_path: str, doc_type: str = "general") -> Dict[str, Any]:
+        """Analyze PPTX deck slide by slide from its native text, tables and notes."""
+        try:
+            print(f"\n🔄 Starting per-slide PPTX analysis: {pptx_path}")
+            
+            pages_data = self.extract_pptx_slides_content(pptx_path)
+            if not pages_data:
+                raise ValueError("No slides could be extracted")
+            
+            page_analyses = [self.analyze_page(page_data) for page_data in pages_data]
+            overall_summary = self.generate_document_summary_from_pages(page_analyses, doc_type)
+            
+            return self.build_pages_result(doc_type, pptx_path, pages_data, page_analyses, overall_summary)
             
         except Exception as e:
             return {
                 "document_type": doc_type,
-                "file_path": pdf_path,
-                "error": f"Per-page multimodal analysis failed: {str(e)}",
+                "file_path": pptx_path,
+                "error": f"Per-slide PPTX analysis failed: {str(e)}",
                 "traceback": traceback.format_exc(),
                 "status": "failed"
             }
 
+    def page_result(self, page_data: Dict[str, Any]) -> Dict[str, Any]:
+        """The fields of a page analysis that come from the extracted page itself."""
+        return {
+            "page_number": page_data["page_number"],
+            "text_content": page_data["text_content"],
+            "structured_data": page_data.get("structured_data") or {},
+            "text_source": page_data.get("text_source"),
+            "has_image": bool(page_data["image_base64"] or page_data.get("render_path"))
+        }
+
+    def page_image(self, page_data: Dict[str, Any]) -> Optional[str]:
+        """The page's image as base64, rendered from its PDF on disk if it wasn't extracted with the page."""
+        if page_data["image_base64"] or not page_data.get("render_path"):
+            return page_data["image_base64"]
+        image = render_page(page_data["render_path"], page_data["page_number"] - 1, zoom=2, max_workers=settings.ingestion_render_processes)
+        return base64.b64encode(image).decode('utf-8')
+
+    def analyze_page(self, page_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze one extracted page.
+        
+        Pages with an image go to the multimodal model; pages with only text and
+        structured data (e.g. most PPTX slides) go to the cheaper text model, and
+        empty pages are skipped.
+        """
+        page_number = page_data["page_number"]
+        page_text = page_data["text_content"]
+        structured_data = page_data.get("structured_data") or {}
+        page_result = self.page_result(page_data)
+        
+        if not page_data.get("has_content", True):
+            return {**page_result, "analysis": "", "analysis_model": None, "status": "skipped"}
+        
+        model_name = "multimodal" if page_result["has_image"] else "text"
+        print(f"\n🤖 Analyzing page {page_number} with {model_name} AI...")
+        
+        try:
+            # Rendered just before the call and dropped with it, not held for the whole document
+            page_image = self.page_image(page_data)
+            
+            # Exact values extracted from the file take precedence over reading them off the image
+            prompt_text = page_text
+            if structured_data:
+                prompt_text += "\n\nStructured data extracted from the page (exact values):\n"
+                prompt_text += json.dumps(structured_data, indent=1, default=str)
+            
+            # Create prompt for this specific page
+            prompt = self.create_per_page_multimodal_prompt(page_number, prompt_text)
+            
+            if page_image:
+                # Prepare multimodal message content with the page image
+                message_content = [{"type": "text", "text": prompt}]
+                message_content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{page_data.get('image_mime') or 'image/png'};base64,{page_image}"
+                    }
+                })
+                messages = [HumanMessage(content=message_content)]
+                response = self.multimodal_model.invoke(messages)
+            else:
+                response = self.text_model.invoke([HumanMessage(content=prompt)])
+            
+            print(f"✅ Page {page_number} analysis completed")
+            return {**page_result, "analysis": response.content, "analysis_model": model_name, "status": "success"}
+            
+        except Exception as e:
+            print(f"❌ Page {page_number} analysis failed: {e}")
+            return {**page_result, "analysis": f"Analysis failed: {str(e)}", "analysis_model": model_name, "status": "failed"}
+
+    def build_pages_result(self, doc_type: str, file_path: str, pages_data: List[Dict], page_analyses: List[Dict], overall_summary: str) -> Dict[str, Any]:
+        """
+        Assemble the result of a per-page document analysis.
+        
+        Pages that reused the analysis of a near-duplicate page count as
+        duplicate pages (same batch) or cached pages (earlier uploads), not as model calls.
+        """
+        analyzed = [page for page in page_analyses if not page.get("reused_from")]
+        reused = [page["reused_from"]["source"] for page in page_analyses if page.get("reused_from")]
+        return {
+            "document_type": doc_type,
+            "file_path": file_path,
+            "total_pages": len(pages_data),
+            "successful_analyses": sum(1 for page in page_analyses if page["status"] == "success"),
+            "multimodal_calls": sum(1 for page in analyzed if page.get("analysis_model") == "multimodal"),
+            "text_calls": sum(1 for page in analyzed if page.get("analysis_model") == "text"),
+            "skipped_pages": sum(1 for page in page_analyses if page["status"] == "skipped"),
+            "ocr_pages": sum(1 for page in pages_data if page.get("text_source") == "ocr"),
+            "duplicate_pages": reused.count("batch"),
+            "cached_pages": reused.count("cache"),
+            "page_analyses": page_analyses,
+            "overall_summary": overall_summary,
+            "analysis_type": "per_page_multimodal",
+            "status": "success"
+        }
+
     def generate_document_summary_from_pages(self, page_analyses: List[Dict], doc_type: str) -> str:
         """Generate overall document summary from individual page analyses."""
         try:
@@ -294,6 +702,38 @@ All business operations information:
             return f"Summary generation failed: {str(e)}"
 
     
+    def update_document_summary(self, previous_summary: str, page_analyses: List[Dict], changes: Dict[str, List], doc_type: str) -> str:
+        """Update the summary of a document's previous version with the analyses of its changed and new pages."""
+        try:
+            by_number = {page["page_number"]: page for page in page_analyses}
+            changed_analyses = ""
+            for page_number in sorted(changes["changed"] + changes["new"]):
+                page = by_number.get(page_number)
+                if page and page["status"] == "success":
+                    label = "CHANGED" if page_number in changes["changed"] else "NEW"
+                    changed_analyses += f"\n=== PAGE {page_number} ANALYSIS ({label}) ===\n"
+                    changed_analyses += page["analysis"]
+                    changed_analyses += "\n"
+            moved = [pair for pair in changes["unchanged"] if pair["page_number"] != pair["previous_page_number"]]
+            page_changes = "\n".join([
+                f"Changed pages: {changes['changed'] or 'none'}",
+                f"New pages: {changes['new'] or 'none'}",
+                f"Removed pages (previous numbering): {changes['removed'] or 'none'}",
+                "Unchanged pages that moved: " + (", ".join(f"{pair['previous_page_number']} -> {pair['page_number']}" for pair in moved) or "none")
+            ])
+            prompt = get_analysis_prompt(
+                "document_update",
+                doc_type=doc_type,
+                previous_summary=previous_summary,
+                page_changes=page_changes,
+                changed_analyses=changed_analyses or "(no content)"
+            )
+            response = self.text_model.invoke([HumanMessage(content=prompt)])
+            return response.content
+            
+        except Exception as e:
+            return f"Summary generation failed: {str(e)}"
+    
     def analyze_raw_email(self, raw_email_text: str) -> Dict[str, Any]:
         """Analyze raw email text."""
         try:
@@ -315,6 +755,27 @@ All business operations information:
                 "status": "failed"
             }
 
+    def analyze_raw_text(self, raw_text: str, doc_type: str = "general") -> Dict[str, Any]:
+        """Analyze a plain-text document (notes, exports, memos)."""
+        try:
+            prompt = self.create_pdf_analysis_prompt(raw_text)
+            
+            messages = [HumanMessage(content=prompt)]
+            response = self.text_model.invoke(messages)
+            
+            return {
+                "document_type": doc_type,
+                "analysis": response.content,
+                "status": "success"
+            }
+            
+        except Exception as e:
+            return {
+                "error": f"Text analysis failed: {str(e)}",
+                "traceback": traceback.format_exc(),
+                "status": "failed"
+            }
+
     def analyze_raw_call_transcript(self, raw_transcript: str) -> Dict[str, Any]:
         """Analyze raw call transcript text."""
         try:
@@ -337,31 +798,458 @@ All business operations information:
             }
 
     
-def analyze_startup_documents(file_paths: List[str]) -> Dict[str, Any]:
-    """Analyze multiple startup documents."""
-    analyzer = StartupAnalyzer()
-    results = {}
+# --- Batch Ingestion ---
+
+_ingestion_executor: Optional[ThreadPoolExecutor] = None
+
+def get_ingestion_executor() -> ThreadPoolExecutor:
+    """Shared pool for all ingestion work (extraction and model calls), bounded by INGESTION_MAX_WORKERS."""
+    global _ingestion_executor
+    if _ingestion_executor is None:
+        _ingestion_executor = ThreadPoolExecutor(
+            max_workers=settings.ingestion_max_workers,
+            thread_name_prefix="ingestion"
+        )
+    return _ingestion_executor
+
+async def run_in_ingestion_pool(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_ingestion_executor(), functools.partial(fn, *args))
+
+# Uploads and archive members are copied to disk in chunks of this size
+SPOOL_CHUNK_SIZE = 1024 * 1024
+# Memory reserved per document while it is analyzed, as a multiple of its size on disk (parsed
+# objects and extracted text; PDF page images are rendered one per model call, not held per document)
+DOCUMENT_MEMORY_FACTOR = 2
+
+class UploadTooLarge(ValueError):
+    """An upload or archive exceeds the configured size limits."""
+
+class MemoryBudget:
+    """
+    Bytes of document data that concurrent ingestions may hold in memory together.
     
-    for file_path in file_paths:
-        file_path = Path(file_path)
+    Documents reserve their estimated footprint before they are opened and
+    wait while the budget is used up. A document larger than the whole budget
+    reserves all of it, so it runs alone instead of never.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._waiters: deque = deque()
+
+    async def acquire(self, amount: int) -> int:
+        """Reserves `amount` bytes (capped at the limit), waiting first come, first served."""
+        amount = min(max(amount, 0), self.limit)
+        if not self._waiters and self.used + amount <= self.limit:
+            self.used += amount
+            return amount
+        print(f"⏳ Waiting for ingestion memory budget ({amount // (1024 * 1024)} MB)")
+        waiter = (amount, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except BaseException:
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release(amount)  # granted just before the cancellation
+            else:
+                self._waiters.remove(waiter)
+                self._grant()
+            raise
+        return amount
+
+    def release(self, amount: int) -> None:
+        self.used -= amount
+        self._grant()
+
+    def _grant(self) -> None:
+        # Waiters are served in order, so a small document doesn't overtake a large one
+        while self._waiters and self.used + self._waiters[0][0] <= self.limit:
+            amount, future = self._waiters.popleft()
+            self.used += amount
+            future.set_result(None)
+
+ingestion_memory_budget = MemoryBudget(settings.ingestion_memory_budget_mb * 1024 * 1024)
+
+async def spool_upload(upload, directory: str) -> str:
+    """
+    Copies an upload to a file in `directory` chunk by chunk, so it is never held in memory whole.
+    
+    Args:
+        upload: FastAPI UploadFile
+        directory: Directory for the spooled file (removed by the caller)
+        
+    Returns:
+        Path of the spooled file
         
+    Raises:
+        UploadTooLarge: If the upload exceeds INGESTION_MAX_UPLOAD_MB
+    """
+    max_bytes = settings.ingestion_max_upload_mb * 1024 * 1024
+    fd, path = tempfile.mkstemp(suffix=Path(upload.filename or "").suffix.lower(), dir=directory)
+    size = 0
+    with os.fdopen(fd, "wb") as spooled:
+        while chunk := await upload.read(SPOOL_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"{upload.filename} is larger than {settings.ingestion_max_upload_mb} MB")
+            await asyncio.to_thread(spooled.write, chunk)
+    return path
+
+# Analyses of pages already seen per startup, and the versions of each startup's documents
+# (DATABASE_URL, memory:// keeps them in process)
+page_analysis_cache = create_page_analysis_repository(settings.database_url)
+document_versions = create_document_version_repository(settings.database_url)
+
+# Share of a new upload's pages that must match a differently named document to count as its next version
+MIN_VERSION_OVERLAP = 0.5
+
+class PageDeduplicator:
+    """
+    Runs each distinct page of a batch through the models once.
+    
+    Near-duplicate pages (equal text hash, close pHash) within the batch wait
+    for the first one's analysis instead of making their own call, and are
+    analyzed themselves if that analysis fails. With a
+    startup ID, pages are also looked up in, and successful analyses added
+    to, that startup's page analysis cache.
+    """
+
+    def __init__(self, startup_id: Optional[str] = None, cache=None):
+        self.startup_id = startup_id
+        self.cache = cache if cache is not None else page_analysis_cache
+        # text_hash -> (phash, has_text, origin, future of the origin's analysis)
+        self._pages: Dict[str, List[Tuple[Optional[str], bool, Dict[str, Any], asyncio.Future]]] = defaultdict(list)
+
+    def _reuse(self, analyzer: StartupAnalyzer, page_data: Dict[str, Any], analysis: Dict[str, Any], origin: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **analyzer.page_result(page_data),
+            "analysis": analysis["analysis"],
+            "analysis_model": analysis["analysis_model"],
+            "status": analysis["status"],
+            "reused_from": origin
+        }
+
+    async def analyze(self, analyzer: StartupAnalyzer, filename: str, page_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze a page, reusing the analysis of a near-duplicate page when there is one."""
+        text_hash = page_data.get("text_hash")
+        if not text_hash or not page_data.get("has_content", True):
+            return await run_in_ingestion_pool(analyzer.analyze_page, page_data)
+        
+        phash, has_text = page_data.get("phash"), bool(page_data["text_content"])
+        for other_phash, other_has_text, origin, future in self._pages[text_hash]:
+            if not is_near_duplicate(text_hash, phash, text_hash, other_phash, has_text and other_has_text):
+                continue
+            try:
+                analysis = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this page's task was cancelled, not the origin's
+                continue
+            except Exception:
+                continue
+            # Only successful analyses are shared; after a failure the page gets its own call
+            if analysis["status"] == "success":
+                return self._reuse(analyzer, page_data, analysis, origin)
+        
+        # Registered before the first await, so later duplicates in the batch wait on it
+        origin = {"document": filename, "page_number": page_data["page_number"], "source": "batch"}
+        future = asyncio.get_running_loop().create_future()
+        self._pages[text_hash].append((phash, has_text, origin, future))
         try:
-            if file_path.suffix.lower() == '.pdf':
-                result = analyzer.analyze_pdf_document(str(file_path))
-            elif file_path.suffix.lower() in ['.pptx', '.ppt']:
-                result = analyzer.analyze_pitch_deck_pptx(str(file_path))
+            cached = None
+            if self.startup_id:
+                try:
+                    cached = await self.cache.find(self.startup_id, text_hash, phash, has_text)
+                except Exception as e:
+                    print(f"⚠️ Page cache lookup failed: {e}")
+            if cached:
+                result = self._reuse(analyzer, page_data, {**cached, "status": "success"}, {
+                    "document": cached["document"],
+                    "page_number": cached["page_number"],
+                    "source": "cache"
+                })
+            else:
+                result = await run_in_ingestion_pool(analyzer.analyze_page, page_data)
+                if self.startup_id and result["status"] == "success":
+                    try:
+                        await self.cache.add({
+                            "startup_id": self.startup_id,
+                            "document": filename,
+                            "page_number": page_data["page_number"],
+                            "text_hash": text_hash,
+                            "phash": phash,
+                            "has_text": has_text,
+                            "analysis": result["analysis"],
+                            "analysis_model": result["analysis_model"]
+                        })
+                    except Exception as e:
+                        print(f"⚠️ Page cache update failed: {e}")
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
             else:
-                result = {"error": f"Unsupported file type: {file_path.suffix}"}
+                future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+async def find_previous_version(startup_id: str, filename: str, fingerprints: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Finds the previous version of an uploaded document.
+    
+    That is the latest version of the startup's document with the same name
+    (ignoring version markers such as "_v2"), or else the document sharing
+    the most pages with the upload, if that is at least half of them.
+    """
+    try:
+        versions = await document_versions.latest_versions(startup_id)
+    except Exception as e:
+        print(f"⚠️ Document version lookup failed: {e}")
+        return None
+    key = document_key(filename)
+    for version in versions:
+        if version["document_key"] == key:
+            return version
+    best, best_overlap = None, max(MIN_VERSION_OVERLAP * len(fingerprints), 1)
+    for version in versions:
+        overlap = len(diff_pages(version["pages"], fingerprints)["unchanged"])
+        if overlap >= best_overlap:
+            best, best_overlap = version, overlap + 1
+    return best
+
+def version_order(filename: str) -> List[Any]:
+    """Sort key that orders filenames naturally, so "deck_v2.pdf" comes before "deck_v10.pdf"."""
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.split(r"(\d+)", filename.lower())]
+
+def expand_documents(files: List[Tuple[str, str]], directory: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Unpacks zip archives into their member documents.
+    
+    Archive sizes and the document count are checked from the zip directories
+    before anything is extracted. Archives nested inside an archive are not
+    unpacked; they are returned as skipped instead.
+    
+    Args:
+        files: (filename, path) pairs as uploaded
+        directory: Directory the archive members are extracted to
+        
+    Returns:
+        (filename, path) pairs with archives replaced by their members, and
+        (filename, reason) pairs for the members that were skipped
+        
+    Raises:
+        ValueError: If there are too many documents
+        UploadTooLarge: If an archive unpacks too large
+    """
+    max_archive_bytes = settings.ingestion_max_archive_mb * 1024 * 1024
+    entries: List[Tuple[str, str, Optional[zipfile.ZipFile], List[zipfile.ZipInfo]]] = []
+    skipped: List[Tuple[str, str]] = []
+    try:
+        for filename, path in files:
+            if document_kind(filename) != "zip":
+                entries.append((filename, path, None, []))
+                continue
+            try:
+                archive = zipfile.ZipFile(path)
+            except zipfile.BadZipFile:
+                entries.append((filename, path, None, []))  # reported as a failed document
+                continue
+            entries.append((filename, path, archive, []))
+            for info in archive.infolist():
+                if info.is_dir() or info.filename.startswith("__MACOSX/") or Path(info.filename).name.startswith("."):
+                    continue
+                if document_kind(info.filename) == "zip":
+                    skipped.append((f"{filename}/{info.filename}", "Nested archives are not supported; upload them separately"))
+                    continue
+                entries[-1][3].append(info)
+            # Declared sizes are checked before anything is decompressed
+            if sum(info.file_size for info in entries[-1][3]) > max_archive_bytes:
+                raise UploadTooLarge(f"{filename} unpacks to more than {settings.ingestion_max_archive_mb} MB")
+        
+        total = sum(len(members) if archive else 1 for _, _, archive, members in entries)
+        if total > settings.ingestion_max_files:
+            raise ValueError(f"Too many documents: {total} (maximum {settings.ingestion_max_files})")
+        
+        documents = []
+        for filename, path, archive, members in entries:
+            if not archive:
+                documents.append((filename, path))
+                continue
+            for info in members:
+                fd, extracted_path = tempfile.mkstemp(suffix=Path(info.filename).suffix.lower(), dir=directory)
+                with os.fdopen(fd, "wb") as extracted, archive.open(info) as member:
+                    shutil.copyfileobj(member, extracted, SPOOL_CHUNK_SIZE)
+                documents.append((f"{filename}/{info.filename}", extracted_path))
+    finally:
+        for _, _, archive, _ in entries:
+            if archive:
+                archive.close()
+    return documents, skipped
+
+async def analyze_document_async(analyzer: StartupAnalyzer, filename: str, path: str, doc_type: str = "general", deduplicator: Optional[PageDeduplicator] = None) -> Dict[str, Any]:
+    """
+    Analyze one document from disk, running its extraction and every model call in the shared ingestion pool.
+    
+    The document first reserves its share of the ingestion memory budget, so
+    concurrent uploads of large scanned decks queue instead of exhausting memory.
+    
+    Pages of PDFs and PPTX decks are analyzed concurrently, so a large deck
+    spreads over the pool instead of occupying one worker. Near-duplicate
+    pages share one analysis through the deduplicator.
+    
+    When the deduplicator has a startup ID, a deck is diffed against the
+    previous version of the same document: unchanged pages come from the page
+    analysis cache, and the previous summary is updated with the changed and
+    new pages instead of being rebuilt.
+    """
+    kind = document_kind(filename)
+    deduplicator = deduplicator or PageDeduplicator()
+    reserved = 0
+    try:
+        reserved = await ingestion_memory_budget.acquire(DOCUMENT_MEMORY_FACTOR * os.path.getsize(path))
+        if kind in ("pdf", "pptx"):
+            extract = analyzer.extract_pdf_pages_content if kind == "pdf" else analyzer.extract_pptx_slides_content
+            pages_data = await run_in_ingestion_pool(extract, path)
+            if not pages_data:
+                raise ValueError(f"No pages could be extracted from {filename}")
+            fingerprints = [page_fingerprint(page_data) for page_data in pages_data]
+            previous = await find_previous_version(deduplicator.startup_id, filename, fingerprints) if deduplicator.startup_id else None
+            changes = diff_pages(previous["pages"], fingerprints) if previous else None
             
-            results[file_path.name] = result
+            page_analyses = list(await asyncio.gather(*[
+                deduplicator.analyze(analyzer, filename, page_data) for page_data in pages_data
+            ]))
             
-        except Exception as e:
-            results[file_path.name] = {
-                "error": f"Processing failed: {str(e)}",
-                "traceback": traceback.format_exc()
-            }
+            if changes and previous["summary"] and not (changes["changed"] or changes["new"] or changes["removed"]):
+                overall_summary, summary_mode = previous["summary"], "reused"
+            elif changes and previous["summary"]:
+                print(f"📝 {filename}: {len(changes['changed'])} changed, {len(changes['new'])} new, {len(changes['removed'])} removed pages since version {previous['version']}")
+                overall_summary = await run_in_ingestion_pool(analyzer.update_document_summary, previous["summary"], page_analyses, changes, doc_type)
+                summary_mode = "incremental"
+            else:
+                overall_summary = await run_in_ingestion_pool(analyzer.generate_document_summary_from_pages, page_analyses, doc_type)
+                summary_mode = "full"
+            result = analyzer.build_pages_result(doc_type, filename, pages_data, page_analyses, overall_summary)
+            result["summary_mode"] = summary_mode
+            
+            if deduplicator.startup_id:
+                summary_ok = not overall_summary.startswith("Summary generation failed")
+                try:
+                    version = await document_versions.add({
+                        "startup_id": deduplicator.startup_id,
+                        # A renamed upload continues the lineage it was matched to
+                        "document_key": previous["document_key"] if previous else document_key(filename),
+                        "filename": filename,
+                        "pages": fingerprints,
+                        "summary": overall_summary if summary_ok else None
+                    })
+                    result["version"] = version["version"]
+                except Exception as e:
+                    print(f"⚠️ Document version update failed: {e}")
+                result["previous_version"] = previous["version"] if previous else None
+                result["page_changes"] = changes
+        elif kind in ("email", "call", "text"):
+            content = await run_in_ingestion_pool(Path(path).read_bytes)
+            if kind == "email":
+                text = email_to_text(content) if filename.lower().endswith(".eml") else content.decode("utf-8", errors="ignore")
+                result = await run_in_ingestion_pool(analyzer.analyze_raw_email, text)
+            elif kind == "call":
+                result = await run_in_ingestion_pool(analyzer.analyze_raw_call_transcript, content.decode("utf-8", errors="ignore"))
+            else:
+                result = await run_in_ingestion_pool(analyzer.analyze_raw_text, content.decode("utf-8", errors="ignore"), doc_type)
+        else:
+            result = {"error": f"Unsupported file type: {Path(filename).suffix or filename}", "status": "failed"}
+    except Exception as e:
+        result = {
+            "error": f"Processing failed: {str(e)}",
+            "traceback": traceback.format_exc(),
+            "status": "failed"
+        }
+    finally:
+        ingestion_memory_budget.release(reserved)
+    return {"filename": filename, "kind": kind, **result}
+
+async def analyze_documents_batch(files: List[Tuple[str, str]], doc_type: str = "general", analyzer: Optional[StartupAnalyzer] = None, startup_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyze a set of documents (e.g. a whole data room) concurrently and aggregate the results.
     
-    return results
+    Args:
+        files: (filename, path) pairs, e.g. spooled uploads; zip archives are unpacked
+        doc_type: Document type passed to the summaries
+        analyzer: Analyzer to use (defaults to the shared instance)
+        startup_id: Startup the documents belong to; pages it uploaded before reuse their analyses,
+            and versions of one document in the batch are analyzed in order, each diffed against the last
+        
+    Returns:
+        Per-document results keyed by filename (nested archives are listed as skipped), plus batch totals
+    """
+    analyzer = analyzer or startup_analyzer
+    start_time = time.time()
+    with tempfile.TemporaryDirectory(prefix="ingestion-") as archive_directory:
+        # Unpacking archives is blocking file I/O; keep it off the event loop
+        documents, skipped = await run_in_ingestion_pool(expand_documents, files, archive_directory)
+        print(f"📚 Ingesting {len(documents)} documents with {settings.ingestion_max_workers} workers")
+        if skipped:
+            print(f"⏭️ Skipped {len(skipped)} nested archives")
+        
+        deduplicator = PageDeduplicator(startup_id)
+        results: List[Dict[str, Any]] = [{}] * len(documents)
+        
+        async def analyze_versions(indices: List[int]) -> None:
+            # Versions of one document run oldest first, so each is recorded before the next is diffed against it
+            for index in indices:
+                filename, path = documents[index]
+                results[index] = await analyze_document_async(analyzer, filename, path, doc_type, deduplicator)
+        
+        lineages: Dict[str, List[int]] = defaultdict(list)
+        for index, (filename, _) in enumerate(documents):
+            lineages[document_key(filename) if startup_id else str(index)].append(index)
+        await asyncio.gather(*[
+            analyze_versions(sorted(indices, key=lambda index: version_order(documents[index][0])))
+            for indices in lineages.values()
+        ])
+    results.extend(
+        {"filename": filename, "kind": "zip", "error": reason, "status": "skipped"}
+        for filename, reason in skipped
+    )
+    
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        name, copy = result["filename"], 2
+        while name in by_name:
+            name = f"{result['filename']} ({copy})"
+            copy += 1
+        by_name[name] = result
+    successful = sum(1 for result in results if result.get("status") == "success")
+    totals = {
+        key: sum(result.get(key, 0) for result in results)
+        for key in ("multimodal_calls", "text_calls", "ocr_pages", "duplicate_pages", "cached_pages")
+    }
+    if totals["duplicate_pages"] or totals["cached_pages"]:
+        print(f"♻️ Reused analyses for {totals['duplicate_pages']} duplicate and {totals['cached_pages']} cached pages")
+    
+    return {
+        "documents": by_name,
+        "total_documents": len(results),
+        "successful_documents": successful,
+        "failed_documents": len(results) - successful - len(skipped),
+        "skipped_documents": len(skipped),
+        "total_pages": sum(result.get("total_pages", 0) for result in results),
+        **totals,
+        "model_calls": totals["multimodal_calls"] + totals["text_calls"],
+        "model_calls_saved": totals["duplicate_pages"] + totals["cached_pages"],
+        "processing_time": round(time.time() - start_time, 2),
+        "max_workers": settings.ingestion_max_workers,
+        "status": "success" if successful else "failed"
+    }
+
+def analyze_startup_documents(file_paths: List[str]) -> Dict[str, Any]:
+    """Analyze multiple startup documents concurrently (blocking; use analyze_documents_batch from async code)."""
+    files = [(Path(file_path).name, str(file_path)) for file_path in file_paths]
+    batch = asyncio.run(analyze_documents_batch(files, analyzer=StartupAnalyzer()))
+    return batch["documents"]
 
 def analyze_raw_email_text(raw_email: str) -> Dict[str, Any]:
     """Analyze raw email text."""
@@ -22,39 +22,122 @@ implementing custom, stateful agent logic with this library.
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events.event import Event
-from google.genai.types import Content, Part
+from google.adk.models.llm_request import LlmRequest
+from google.genai.types import Content, GenerateContentConfig, Part
 
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, AsyncGenerator
+import contextlib
 import datetime
+import re
+import string
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 # --- Pydantic Models for State and Output ---
 
 class InterviewState(BaseModel):
-    """Manages the state of a single investor-founder interview session."""
+    """
+    Manages the compact, per-turn state of a single investor-founder interview session.
+
+    Only small, bounded fields live here so that loading and saving the state costs the
+    same on every turn. The conversation history is kept in the session's append-only
+    `HISTORY_LOG`, and the startup context is stored once as a blob referenced by
+    `startup_context_ref`.
+    """
     interview_started: bool = Field(default=False, description="True if the interview has begun.")
     current_question_index: int = Field(default=0, description="Index of the current primary question.")
     total_questions: int = Field(default=0, description="Total number of primary questions.")
     questions_list: List[str] = Field(default=[], description="The full, ordered list of primary questions.")
-    answers_collected: List[Dict[str, Any]] = Field(default=[], description="Log of questions asked and answers received.")
     followup_count_for_current: int = Field(default=0, description="Number of follow-ups asked for the current primary question.")
     max_followups_per_question: int = Field(default=3, description="Maximum follow-up questions allowed per primary question.")
     interview_complete: bool = Field(default=False, description="True if all questions have been answered.")
     followups_asked: List[str] = Field(default=[], description="A list of follow-up questions already asked for the current primary question to avoid repetition.")
-    startup_context: str = Field(default="", description="The initial context document about the startup.")
-    full_history: List[Dict[str, str]] = Field(default=[], description="Full conversation history")
+    startup_context_ref: str = Field(default="", description="Blob reference of the initial context document about the startup.")
+    history_length: int = Field(default=0, description="Number of entries in the conversation history log.")
     last_question_asked_by_bot: str = Field(default="", description="The exact text of the last question (primary or follow-up) asked by the bot.")
 
+# Name of the append-only session log holding {"role", "content", "question_index"} entries.
+HISTORY_LOG = "history"
+
 class InterviewerOutput(BaseModel):
-    """The structured output from the Interviewer Agent."""
-    response_text: str = Field(description="The text to be spoken to the user (e.g., a question, a transition, or a closing statement).")
+    """
+    The structured output from the Interviewer Agent.
+
+    The decision fields come before `response_text` so that, when the assessment is
+    streamed, the agent knows whether the text will be spoken before it arrives.
+    """
     is_followup_question: bool = Field(description="True if this is a follow-up question based on the user's last answer.")
     is_primary_question: bool = Field(description="True if this is the next primary question from the initial list.")
     is_closing_statement: bool = Field(description="True if the interview is over and this is a concluding remark.")
-    confidence_in_answer_coverage: float = Field(
-        description="A score from 0.0 to 1.0 indicating how well the user's last answer addressed the question. 1.0 means fully addressed."
+    confidence_in_answer_coverage: Optional[float] = Field(
+        description="A score from 0.0 to 1.0 indicating how well the user's last answer addressed the question. 1.0 means fully addressed. Null if the answer was not assessed."
     )
+    response_text: str = Field(description="The text to be spoken to the user (e.g., a question, a transition, or a closing statement).")
+
+# --- Streaming Helpers ---
+
+_JSON_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+def partial_json_bool(buffer: str, field: str) -> Optional[bool]:
+    """Returns the value of a boolean field from an incomplete JSON object, once it has been generated."""
+    match = re.search(rf'"{field}"\s*:\s*(true|false)', buffer)
+    return None if match is None else match.group(1) == "true"
+
+def partial_json_number(buffer: str, field: str) -> Optional[float]:
+    """Returns the value of a numeric field from an incomplete JSON object, once it is complete."""
+    match = re.search(rf'"{field}"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)\s*[,}}]', buffer)
+    return None if match is None else float(match.group(1))
+
+def _json_hex4(buffer: str, start: int) -> Optional[int]:
+    """Returns the value of the 4 hex digits of a \\u escape, or None if they are incomplete or malformed."""
+    digits = buffer[start:start + 4]
+    if len(digits) < 4 or not all(ch in string.hexdigits for ch in digits):
+        return None
+    return int(digits, 16)
+
+def partial_json_string(buffer: str, field: str) -> Optional[str]:
+    """
+    Returns the decoded prefix of a string field from an incomplete JSON object.
+
+    Returns None while the field has not started. Incomplete escape sequences at the
+    end of the buffer (including a surrogate pair missing its second half) are held
+    back until the next chunk arrives; decoding stops at a malformed escape.
+    """
+    match = re.search(rf'"{field}"\s*:\s*"', buffer)
+    if match is None:
+        return None
+    chars = []
+    i = match.end()
+    while i < len(buffer):
+        ch = buffer[i]
+        if ch == '"':
+            break
+        if ch != '\\':
+            chars.append(ch)
+            i += 1
+            continue
+        if i + 1 >= len(buffer):
+            break
+        escape = buffer[i + 1]
+        if escape == 'u':
+            code = _json_hex4(buffer, i + 2)
+            if code is None:
+                break
+            length = 6
+            if 0xD800 <= code <= 0xDBFF:
+                # A high surrogate is only a character together with the low surrogate after it
+                if i + 12 > len(buffer):
+                    break
+                low = _json_hex4(buffer, i + 8) if buffer.startswith('\\u', i + 6) else None
+                if low is not None and 0xDC00 <= low <= 0xDFFF:
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                    length = 12
+            chars.append('\ufffd' if 0xD800 <= code <= 0xDFFF else chr(code))
+            i += length
+        else:
+            chars.append(_JSON_ESCAPES.get(escape, escape))
+            i += 2
+    return "".join(chars)
 
 # --- Agent Instruction ---
 
@@ -109,21 +192,83 @@ You are VentureMind AI, a sophisticated interviewing agent for a venture capital
 - Your goal is to get direct answers or expose a lack of direct answers.
 """
 
+# --- Templated Responses ---
+
+CLOSING_STATEMENT = "Thank you for completing the interview. Your comprehensive answers have been recorded and will be analyzed."
+
+def begin_interview(state: InterviewState) -> str:
+    """
+    Marks the interview as started and returns the greeting with the first question.
+
+    This needs no model call, so callers can return the greeting as soon as the
+    questions exist instead of running a full agent turn.
+    """
+    state.interview_started = True
+    state.total_questions = len(state.questions_list)
+    state.current_question_index = 0
+    first_question = f"Hello! I'm VentureMind AI, and I will be your interviewer. We are impressed by your traction. My first question, which is based on our analysis of your documents, is: {state.questions_list[0]}"
+    state.last_question_asked_by_bot = first_question
+    return first_question
+
+def sufficient_answer_response(state: InterviewState) -> str:
+    """
+    The reply the interviewer gives if the current answer is judged sufficient.
+
+    It only depends on the state before the answer arrives, so callers can prepare it
+    (and its audio) speculatively while the founder is still answering.
+    """
+    next_index = state.current_question_index + 1
+    if next_index >= state.total_questions:
+        return CLOSING_STATEMENT
+    return f"Understood. Next question: {state.questions_list[next_index]}"
+
 # --- The Agent Definition ---
 
 class InterviewAgent(LlmAgent):
     """A stateful agent to conduct interviews, refactored to use subclassing."""
+
+    async def _stream_assessment(self, assessment_prompt: str) -> AsyncGenerator[str, None]:
+        """Streams the raw JSON text of the answer assessment as the model generates it."""
+        llm_request = LlmRequest(
+            model=self.canonical_model.model,
+            contents=[Content(role="user", parts=[Part(text=assessment_prompt)])],
+            config=GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=InterviewerOutput,
+            ),
+        )
+        streamed = False
+        async for llm_response in self.canonical_model.generate_content_async(llm_request, stream=True):
+            if not llm_response.content or not llm_response.content.parts:
+                continue
+            text = "".join(part.text or "" for part in llm_response.content.parts)
+            if llm_response.partial:
+                streamed = True
+                yield text
+            elif not streamed:
+                # Non-streaming backends only return the final, aggregated response.
+                yield text
     
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """The core logic for the interview flow."""
-        session_obj = await ctx.session_service.get_session(ctx.session_id)
+        # The runner has already loaded the session; reuse it instead of fetching it again.
+        session_obj = ctx.session
         state = InterviewState(**session_obj.state)
-        message = ctx.new_message
+        message = ctx.user_content
+        new_history: List[Dict[str, Any]] = []
 
-        # Helper to update state and yield event
+        def record(role: str, content: str):
+            new_history.append({"role": role, "content": content, "question_index": state.current_question_index})
+
+        # Helper to save the compact state, append new history and yield event.
+        # The versioned state write decides whether this turn wins; history is only
+        # appended once it has, so a conflicting turn leaves no entries behind.
         async def update_and_yield(output: InterviewerOutput):
+            state.history_length += len(new_history)
             session_obj.state = state.dict()
             await ctx.session_service.update_session(session_obj)
+            if new_history:
+                await ctx.session_service.append_log(session_obj.id, HISTORY_LOG, new_history)
             yield Event(
                 invocation_id=ctx.invocation_id,
                 author=self.name,
@@ -145,15 +290,8 @@ class InterviewAgent(LlmAgent):
                     yield event
                 return
 
-            state.interview_started = True
-            state.total_questions = len(state.questions_list)
-            state.current_question_index = 0
-            
-            first_question = f"Hello! I'm VentureMind AI, and I will be your interviewer. We are impressed by your traction. My first question, which is based on our analysis of your documents, is: {state.questions_list[0]}"
-            
-            state.answers_collected.append({"question": state.questions_list[0], "answers": []})
-            state.full_history.append({"role": "bot", "content": first_question})
-            state.last_question_asked_by_bot = first_question
+            first_question = begin_interview(state)
+            record("bot", first_question)
             
             output = InterviewerOutput(
                 response_text=first_question,
@@ -169,8 +307,7 @@ class InterviewAgent(LlmAgent):
         # --- 2. Process User's Answer ---
         user_answer = message.parts[0].text
         
-        state.answers_collected[-1]["answers"].append(user_answer)
-        state.full_history.append({"role": "user", "content": user_answer})
+        record("user", user_answer)
 
         # --- 3. LLM Call to Assess the Answer and Generate Next Response ---
         assessment_prompt = f"""
@@ -190,22 +327,65 @@ class InterviewAgent(LlmAgent):
         **Your output MUST be in the format defined by the `InterviewerOutput` schema.**
         """
         
-        model_response = await self.canonical_model.generate_content_async(
-            assessment_prompt,
-            generation_config={"response_mime_type": "application/json"},
-        )
-        assessed_output = InterviewerOutput.model_validate_json(model_response.text)
+        # Follow-up text is streamed to the caller as partial events while it is generated.
+        # Primary-question transitions and closings are templated (and may already have
+        # been prepared speculatively), so once the model has decided against a follow-up
+        # and scored the answer, the rest of its output is not needed and the stream is closed.
+        assessed_output: Optional[InterviewerOutput] = None
+        if state.followup_count_for_current >= state.max_followups_per_question:
+            # The follow-up limit forces a move to the next question; no assessment needed,
+            # so there is no coverage score to record either.
+            assessed_output = InterviewerOutput(
+                is_followup_question=False,
+                is_primary_question=True,
+                is_closing_statement=False,
+                confidence_in_answer_coverage=None,
+                response_text=""
+            )
+        else:
+            raw_assessment = ""
+            streamed_text = ""
+            async with contextlib.aclosing(self._stream_assessment(assessment_prompt)) as assessment_stream:
+                async for chunk in assessment_stream:
+                    raw_assessment += chunk
+                    is_followup = partial_json_bool(raw_assessment, "is_followup_question")
+                    if is_followup is False:
+                        confidence = partial_json_number(raw_assessment, "confidence_in_answer_coverage")
+                        if confidence is not None:
+                            assessed_output = InterviewerOutput(
+                                is_followup_question=False,
+                                is_primary_question=True,
+                                is_closing_statement=False,
+                                confidence_in_answer_coverage=confidence,
+                                response_text=""
+                            )
+                            break
+                        continue
+                    if is_followup is not True:
+                        continue
+                    visible_text = partial_json_string(raw_assessment, "response_text") or ""
+                    if len(visible_text) > len(streamed_text):
+                        yield Event(
+                            invocation_id=ctx.invocation_id,
+                            author=self.name,
+                            branch=ctx.branch,
+                            partial=True,
+                            content=Content(parts=[Part(text=visible_text[len(streamed_text):])])
+                        )
+                        streamed_text = visible_text
+            if assessed_output is None:
+                assessed_output = InterviewerOutput.model_validate_json(raw_assessment)
 
         # --- 4. Construct the Response based on the Assessment ---
         final_output: InterviewerOutput
         if not assessed_output.is_followup_question:
+            response_text = sufficient_answer_response(state)
             state.current_question_index += 1
             state.followup_count_for_current = 0
             state.followups_asked = []
 
             if state.current_question_index >= state.total_questions:
                 state.interview_complete = True
-                response_text = "Thank you for completing the interview. Your comprehensive answers have been recorded and will be analyzed."
                 final_output = InterviewerOutput(
                     response_text=response_text,
                     is_followup_question=False,
@@ -214,9 +394,6 @@ class InterviewAgent(LlmAgent):
                     confidence_in_answer_coverage=assessed_output.confidence_in_answer_coverage
                 )
             else:
-                next_question = state.questions_list[state.current_question_index]
-                response_text = f"Understood. Next question: {next_question}"
-                state.answers_collected.append({"question": next_question, "answers": []})
                 final_output = InterviewerOutput(
                     response_text=response_text,
                     is_followup_question=False,
@@ -224,12 +401,12 @@ class InterviewAgent(LlmAgent):
                     is_closing_statement=False,
                     confidence_in_answer_coverage=assessed_output.confidence_in_answer_coverage
                 )
-            state.full_history.append({"role": "bot", "content": response_text})
+            record("bot", response_text)
             state.last_question_asked_by_bot = response_text
         else:
             state.followup_count_for_current += 1
             state.followups_asked.append(assessed_output.response_text)
-            state.full_history.append({"role": "bot", "content": assessed_output.response_text})
+            record("bot", assessed_output.response_text)
             state.last_question_asked_by_bot = assessed_output.response_text
             final_output = assessed_output
         
@@ -1,6 +1,6 @@
 """
 main.py — Fact-checking agent runner
-• Sessions live only in RAM (InMemorySessionService)  
+• Sessions live only in RAM (in-memory SQLite session store)  
 • Artifacts are persisted (in-memory)
 """
 import sys
@@ -18,7 +18,6 @@ os.environ['PYTHONWARNINGS'] = 'ignore::ResourceWarning'
 import asyncio, os
 from dotenv import load_dotenv
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.adk.artifacts import InMemoryArtifactService
 from factcheck_agent import factcheck_agent,factcheck_pipeline
 from business_model_agent import startup_economics_analyzer
@@ -33,6 +32,8 @@ from founders_research import founder_research_agent
 from competition_discovery import competitor_discovery_analyzer
 from question_generation_agent import investor_questions_agent
 from interview_agent import investor_interview_agent
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.session_service import create_session_service
 import warnings
 warnings.filterwarnings('ignore', message="Unclosed client session")
 warnings.filterwarnings('ignore', message='Unclosed client session')
@@ -40,9 +41,9 @@ warnings.filterwarnings('ignore', message='Unclosed connector')
 load_dotenv()
 
 # ────────────────────────────────────────────────────────────────
-# 1. Session service - in-memory, wiped when the app exits
+# 1. Session service - in-memory SQLite, wiped when the app exits
 # ────────────────────────────────────────────────────────────────
-session_service = InMemorySessionService() # sessions are *not* saved to disk
+session_service = create_session_service("memory://") # sessions are *not* saved to disk
 
 # ────────────────────────────────────────────────────────────────
 # 2. Artifact service (in-memory)
@@ -129,12 +130,12 @@ async def main_async() -> None:
         "current_question_index": 0,
         "total_questions": 0,
         "questions_list": [],
-        "answers_collected": [],
         "followup_count_for_current": 0,
         "max_followups_per_question": 3,
         "interview_complete": False,
         "followups_asked": [],
-        "startup_context": ""
+        "startup_context_ref": "",
+        "history_length": 0
     }
     
     # Always start a fresh session — no DB lookup / resume
@@ -1,5 +1,7 @@
+import asyncio
+import hashlib
 import json
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from typing import Dict, Any, List, Optional
 import logging
 from pydantic import BaseModel, Field
@@ -8,22 +10,31 @@ from datetime import datetime
 
 # ADK Imports
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService, Session
-from google.adk.artifacts import InMemoryArtifactService
+from google.adk.sessions import Session
+from google.adk.artifacts import GcsArtifactService, InMemoryArtifactService
 from google.genai.types import Content, Part
 
 # Agent Imports
-from agents.interview_agent import investor_interview_agent, InterviewState, InterviewerOutput
+from agents.interview_agent import investor_interview_agent, InterviewState, InterviewerOutput, HISTORY_LOG, begin_interview, sufficient_answer_response
 from agents.question_generation_agent import investor_questions_agent, InvestorQuestionsOutput
+from api.routers.ai_voice_service import SentenceBuffer, VoiceRequest, get_speech_audio, prefetch_speech, split_sentences, tts_client
+from config import get_settings
+from utils.session_service import create_session_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["ai-interviewer-session"], prefix="/api/interviewer")
 
 # --- Session and Artifact Services ---
-# WARNING: Using in-memory services. Sessions and artifacts will be lost on restart.
-# For production, replace with persistent services (e.g., FirestoreSessionService).
-session_service = InMemorySessionService()
-artifact_service = InMemoryArtifactService()
+# Sessions are persisted (SQLite by default, Redis for multi-node) so any worker
+# can serve any interview. Artifacts go to GCS when a bucket is configured.
+settings = get_settings()
+# Only recent events are loaded per turn; the interview history lives in its own log.
+session_service = create_session_service(settings.session_store_url, max_loaded_events=20)
+artifact_service = (
+    GcsArtifactService(bucket_name=settings.artifact_bucket)
+    if settings.artifact_bucket
+    else InMemoryArtifactService()
+)
 
 # --- Pydantic Models for API ---
 
@@ -34,23 +45,132 @@ class StartSessionRequest(BaseModel):
 
 class InterviewResponseRequest(BaseModel):
     user_response: str
+    history_from: Optional[int] = Field(default=None, description="Only return the history from this entry on (e.g. the number of entries the client already has); the full history by default.")
 
 class InterviewStatusResponse(BaseModel):
     session_id: str
     status: str # e.g., 'generating_questions', 'in_progress', 'completed'
     response_text: str
-    history: List[Dict[str, str]] = []
+    history: List[Dict[str, Any]] = []
+    history_offset: int = Field(default=0, description="Position of the first `history` entry in the conversation; 0 unless the request set `history_from`.")
     questions_remaining: int
     current_question: str
 
-# --- Helper Function to get ADK Runner ---
+class StreamTurnRequest(BaseModel):
+    """A single turn sent over the streaming WebSocket."""
+    user_response: str
+    synthesize_audio: bool = True
+    history_from: Optional[int] = Field(default=None, description="Only return the history from this entry on in `turn_complete`; the full history by default.")
+    speculate_next_turn: bool = Field(default=True, description="Pre-synthesize the reply for a sufficient answer to the next question while the founder is answering.")
+    voice: VoiceRequest = Field(default_factory=lambda: VoiceRequest(text=""), description="Voice settings; `text` is ignored.")
+
+# --- Helper Functions for ADK Runners ---
+
+_runners: Dict[tuple, Runner] = {}
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-flight.
+_background_tasks: set = set()
 
 def get_runner(app_name: str, agent):
-    return Runner(
-        app_name=app_name,
-        agent=agent,
-        session_service=session_service,
-        artifact_service=artifact_service,
+    """Returns a runner for the agent, reusing one runner per (app, agent) pair."""
+    key = (app_name, agent.name)
+    if key not in _runners:
+        _runners[key] = Runner(
+            app_name=app_name,
+            agent=agent,
+            session_service=session_service,
+            artifact_service=artifact_service,
+        )
+    return _runners[key]
+
+def run_in_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+async def run_agent_turn(runner: Runner, user_id: str, session_id: str, text: str) -> str:
+    """Runs one turn through the runner and returns the text of the final (non-partial) response."""
+    response_text = ""
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=Content(role="user", parts=[Part(text=text)])
+    ):
+        if not event.partial and event.content and event.content.parts and event.content.parts[0].text:
+            response_text = event.content.parts[0].text
+    return response_text
+
+async def warm_up_interview_runner(app_name: str):
+    """Creates the interview runner and the model client ahead of the founder's first answer."""
+    try:
+        get_runner(app_name, investor_interview_agent)
+        await asyncio.to_thread(lambda: investor_interview_agent.canonical_model.api_client)
+    except Exception as e:
+        logger.warning(f"Interview runner warm-up failed: {e}")
+
+async def get_interview_questions(app_name: str, user_id: str, startup_context: str, investor_context: str) -> List[str]:
+    """
+    Generates the primary interview questions for a startup/investor context pair.
+
+    Question sets are cached in the session store, keyed by a hash of both contexts,
+    so repeated interviews for the same pair skip the question generation call.
+    """
+    prompt = f"Startup Context:\n{startup_context}\n\nInvestor Context:\n{investor_context}"
+    cache_ref = "questions:" + hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    cached = await session_service.load_blob(cache_ref)
+    if cached:
+        return json.loads(cached)
+
+    # Question generation runs in a temporary session that is discarded afterwards
+    question_runner = get_runner(app_name, investor_questions_agent)
+    q_session = await session_service.create_session(app_name=app_name, user_id=user_id)
+    try:
+        raw_output = await run_agent_turn(question_runner, user_id, q_session.id, prompt)
+    finally:
+        run_in_background(session_service.delete_session(app_name=app_name, user_id=user_id, session_id=q_session.id))
+
+    response = InvestorQuestionsOutput.model_validate_json(raw_output) if raw_output else None
+    if not response or not response.questions:
+        raise HTTPException(status_code=500, detail="Failed to generate interview questions.")
+
+    generated_questions = [q.question for q in response.questions]
+    await session_service.save_blob(json.dumps(generated_questions), ref=cache_ref)
+    return generated_questions
+
+async def load_interview_state(session_id: str) -> InterviewState:
+    session_data = await session_service.get_session(session_id)
+    return InterviewState(**session_data.state)
+
+async def build_status_response(session_id: str, response_text: str, history_from: Optional[int] = None, state: Optional[InterviewState] = None) -> InterviewStatusResponse:
+    """
+    Builds the status payload for a session after a turn has been processed.
+
+    The full history is returned unless the client asked only for the entries from
+    `history_from` on, which keeps the cost of its turns independent of the interview length.
+    """
+    if state is None:
+        state = await load_interview_state(session_id)
+
+    history_offset = max(history_from or 0, 0)
+    history = await session_service.read_log(session_id, HISTORY_LOG, start=history_offset)
+
+    status = "completed" if state.interview_complete else "in_progress"
+
+    if status == "completed":
+        questions_remaining = 0
+        current_question = ""
+    else:
+        questions_remaining = state.total_questions - state.current_question_index
+        current_question = state.questions_list[state.current_question_index] if state.current_question_index < state.total_questions else ""
+
+    return InterviewStatusResponse(
+        session_id=session_id,
+        status=status,
+        response_text=response_text,
+        history=history,
+        history_offset=history_offset,
+        questions_remaining=questions_remaining,
+        current_question=current_question
     )
 
 # --- API Endpoints ---
@@ -59,76 +179,55 @@ def get_runner(app_name: str, agent):
 async def start_interview_session(request: StartSessionRequest):
     """
     Starts a new interview session.
-    1. Generates investor questions based on startup and investor context.
-    2. Initializes the interview agent with these questions.
-    3. Returns the first question to the user.
+    1. Generates investor questions based on startup and investor context (or reuses a cached set).
+    2. Builds the greeting and first question, which need no model call.
+    3. Creates the session, then returns; runner warm-up and synthesis of the
+       first question's audio continue in the background.
     """
     user_id = f"user_{request.startup_id}" # Or some other user identifier
     app_name = "InvestorInterviewApp"
     
     try:
-        # --- 1. Generate Questions ---
-        question_runner = get_runner(app_name, investor_questions_agent)
-        
-        # Create a temporary session for question generation
-        q_session = await session_service.create_session(app_name=app_name, user_id=user_id)
-        
-        prompt = f"Startup Context:\n{request.startup_context}\n\nInvestor Context:\n{request.investor_context}"
-        
-        # This is a simplified way to call the agent.
-        # A more robust implementation would use the runner's async event stream.
-        response: InvestorQuestionsOutput = await question_runner.run_sync(
-            user_id=user_id,
-            session_id=q_session.id,
-            new_message=Content(parts=[Part(text=prompt)])
+        # --- 1. Generate Questions (concurrently with storing the startup context) ---
+        # The startup context is large and immutable: store it once and keep only its reference in state.
+        generated_questions, startup_context_ref = await asyncio.gather(
+            get_interview_questions(app_name, user_id, request.startup_context, request.investor_context),
+            session_service.save_blob(request.startup_context),
         )
-        
-        if not response or not response.questions:
-            raise HTTPException(status_code=500, detail="Failed to generate interview questions.")
-            
-        generated_questions = [q.question for q in response.questions]
 
-        # --- 2. Initialize Interview Agent Session ---
-        interview_runner = get_runner(app_name, investor_interview_agent)
-        
+        # --- 2. Greeting and First Question ---
         initial_state = InterviewState(
-            startup_context=request.startup_context,
+            startup_context_ref=startup_context_ref,
             questions_list=generated_questions,
             total_questions=len(generated_questions)
         )
-        
+        first_question = begin_interview(initial_state)
+        history = [{"role": "bot", "content": first_question, "question_index": 0}]
+        initial_state.history_length = len(history)
+
+        # --- 3. Session Creation, Warm-up and Audio Pre-synthesis ---
+        run_in_background(warm_up_interview_runner(app_name))
+        prefetch_speech(first_question)
+
         interview_session = await session_service.create_session(
             app_name=app_name,
             user_id=user_id,
             state=initial_state.dict() # Pass state as a dictionary
         )
         session_id = interview_session.id
-
-        # --- 3. Get the First Question ---
-        # The interview_flow_logic in the agent will be triggered by the first message.
-        # We send an empty message to kick it off.
-        first_turn_event: Event = await interview_runner.run_sync(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=Content(parts=[Part(text="")]) # Empty message to start
-        )
-
-        # Re-fetch the session state to get the full history
-        session_data = await session_service.get_session(session_id)
-        state = InterviewState(**session_data.state)
-        history = state.full_history
-        questions_remaining = state.total_questions - state.current_question_index
-        current_question = state.questions_list[state.current_question_index] if state.current_question_index < state.total_questions else ""
+        await session_service.append_log(session_id, HISTORY_LOG, history)
 
         return InterviewStatusResponse(
             session_id=session_id,
             status="in_progress",
-            response_text=first_turn_event.content.parts[0].text,
+            response_text=first_question,
             history=history,
-            questions_remaining=questions_remaining,
-            current_question=current_question
+            questions_remaining=initial_state.total_questions,
+            current_question=generated_questions[0]
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error starting interview session: {e}", exc_info=True)
         raise HTTPException(
@@ -153,40 +252,159 @@ async def process_interview_response(session_id: str, request: InterviewResponse
         interview_runner = get_runner(app_name, investor_interview_agent)
 
         # Send the user's response to the agent
-        agent_response_event: Event = await interview_runner.run_sync(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=Content(parts=[Part(text=request.user_response)])
-        )
-
-        # Re-fetch the session state to get the full history
-        session_data = await session_service.get_session(session_id)
-        state = InterviewState(**session_data.state)
-        
-        # Get history from the state
-        history = state.full_history
-
-        status = "completed" if state.interview_complete else "in_progress"
+        response_text = await run_agent_turn(interview_runner, user_id, session_id, request.user_response)
 
-        if status == "completed":
-            questions_remaining = 0
-            current_question = ""
-        else:
-            questions_remaining = state.total_questions - state.current_question_index
-            current_question = state.questions_list[state.current_question_index] if state.current_question_index < state.total_questions else ""
-
-        return InterviewStatusResponse(
-            session_id=session_id,
-            status=status,
-            response_text=agent_response_event.content.parts[0].text,
-            history=history,
-            questions_remaining=questions_remaining,
-            current_question=current_question
-        )
+        return await build_status_response(session_id, response_text, request.history_from)
 
     except Exception as e:
         logger.error(f"Error processing interview response: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error processing interview response: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.websocket("/sessions/{session_id}/stream")
+async def stream_interview_turns(websocket: WebSocket, session_id: str):
+    """
+    Streams interview turns over a WebSocket.
+
+    For each JSON `StreamTurnRequest` received, the server sends:
+      - `{"type": "text_delta", "text": ...}` as the interviewer's reply is generated,
+      - `{"type": "text_replace", "text": ...}` with the full reply, in the rare case the final
+        reply does not extend the streamed deltas; it replaces the text streamed so far and
+        is followed by the audio of the full reply,
+      - `{"type": "audio", "index": n, "text": sentence}` followed by one binary MP3 frame,
+        per sentence, in order; sentences are synthesized in parallel as soon as they end,
+      - `{"type": "turn_complete", ...InterviewStatusResponse}` once the turn is persisted.
+    Errors are reported as `{"type": "error", "detail": ...}` without closing the socket.
+
+    With `speculate_next_turn`, the audio for the templated "sufficient answer" reply
+    (next primary question or closing statement) is synthesized while the founder is
+    answering. It is used if the assessment confirms the answer, and discarded otherwise.
+    """
+    app_name = "InvestorInterviewApp"
+    await websocket.accept()
+
+    session_data = await session_service.get_session(session_id)
+    if not session_data:
+        await websocket.send_json({"type": "error", "detail": "Interview session not found."})
+        await websocket.close(code=4404)
+        return
+    user_id = session_data.user_id
+    interview_runner = get_runner(app_name, investor_interview_agent)
+    # Audio headers and their binary frames must not interleave with text deltas.
+    send_lock = asyncio.Lock()
+    # Speculatively synthesized sentences, keyed by (sentence, voice_name, pitch, speaking_rate).
+    prepared_audio: Dict[tuple, "asyncio.Future[bytes]"] = {}
+
+    def discard_prepared_audio():
+        for synthesis in prepared_audio.values():
+            synthesis.cancel()
+        prepared_audio.clear()
+
+    async def send_json(payload: Dict[str, Any]):
+        async with send_lock:
+            await websocket.send_json(payload)
+
+    async def send_audio_in_order(queue: "asyncio.Queue[Optional[tuple]]"):
+        index = 0
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            sentence, synthesis = item
+            try:
+                audio_bytes = await synthesis
+            except Exception as e:
+                logger.error(f"Error synthesizing interview sentence: {e}", exc_info=True)
+                await send_json({"type": "error", "detail": f"Failed to synthesize audio: {str(e)}"})
+                continue
+            async with send_lock:
+                await websocket.send_json({"type": "audio", "index": index, "text": sentence, "content_type": "audio/mpeg"})
+                await websocket.send_bytes(audio_bytes)
+            index += 1
+
+    try:
+        while True:
+            try:
+                turn = StreamTurnRequest(**await websocket.receive_json())
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                await send_json({"type": "error", "detail": f"Invalid turn request: {str(e)}"})
+                continue
+
+            voice = turn.voice
+            synthesize = turn.synthesize_audio and tts_client is not None
+            sentences = SentenceBuffer()
+            audio_queue: "asyncio.Queue[Optional[tuple]]" = asyncio.Queue()
+            audio_sender = asyncio.create_task(send_audio_in_order(audio_queue))
+
+            def schedule(new_sentences: List[str]):
+                for sentence in new_sentences:
+                    synthesis = prepared_audio.pop((sentence, voice.voice_name, voice.pitch, voice.speaking_rate), None)
+                    if synthesis is None:
+                        synthesis = asyncio.ensure_future(
+                            get_speech_audio(sentence, voice.voice_name, voice.pitch, voice.speaking_rate)
+                        )
+                    audio_queue.put_nowait((sentence, synthesis))
+
+            async def emit(text: str):
+                if not text:
+                    return
+                await send_json({"type": "text_delta", "text": text})
+                if synthesize:
+                    schedule(sentences.feed(text))
+
+            streamed_text = ""
+            response_text = ""
+            try:
+                async for event in interview_runner.run_async(
+                    user_id=user_id,
+                    session_id=session_id,
+                    new_message=Content(role="user", parts=[Part(text=turn.user_response)])
+                ):
+                    if not event.content or not event.content.parts:
+                        continue
+                    text = event.content.parts[0].text or ""
+                    if event.partial:
+                        streamed_text += text
+                        await emit(text)
+                    elif text.startswith(streamed_text):
+                        # The final event carries the full reply; send whatever was not streamed.
+                        response_text = text
+                        await emit(text[len(streamed_text):])
+                    else:
+                        # The reply diverged from what was streamed: the client replaces its text,
+                        # the unfinished streamed sentence is dropped and the final reply is voiced.
+                        response_text = text
+                        await send_json({"type": "text_replace", "text": text})
+                        if synthesize:
+                            sentences = SentenceBuffer()
+                            schedule(sentences.feed(text))
+                if synthesize:
+                    schedule(sentences.flush())
+            except Exception as e:
+                logger.error(f"Error processing streamed interview turn: {e}", exc_info=True)
+                await send_json({"type": "error", "detail": f"Error processing interview response: {str(e)}"})
+                continue
+            finally:
+                audio_queue.put_nowait(None)
+                await audio_sender
+                # Whatever speculation was not confirmed by this turn is stale now.
+                discard_prepared_audio()
+
+            state = await load_interview_state(session_id)
+            status_response = await build_status_response(session_id, response_text, turn.history_from, state)
+            await send_json({"type": "turn_complete", **status_response.dict()})
+
+            if synthesize and turn.speculate_next_turn and not state.interview_complete:
+                for sentence in split_sentences(sufficient_answer_response(state)):
+                    prepared_audio[(sentence, voice.voice_name, voice.pitch, voice.speaking_rate)] = asyncio.ensure_future(
+                        get_speech_audio(sentence, voice.voice_name, voice.pitch, voice.speaking_rate)
+                    )
+
+    except WebSocketDisconnect:
+        logger.info(f"Interview stream for session {session_id} disconnected.")
+    finally:
+        discard_prepared_audio()
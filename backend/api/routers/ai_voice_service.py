@@ -1,10 +1,15 @@
+import asyncio
 import base64
+import functools
+import json
 import os
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+import re
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional
 
 # --- Google Cloud Imports ---
 from google.auth.exceptions import DefaultCredentialsError
@@ -13,8 +18,21 @@ from google.cloud import speech
 from google.cloud.texttospeech_v1.types import SynthesisInput, VoiceSelectionParams, AudioConfig, SsmlVoiceGender
 # --- End Google Cloud Imports ---
 
+from config import get_settings
+from utils.audio_cache import AudioCache, audio_cache_key
+from utils.speech_streaming import FakeStreamingRecognizer, GoogleStreamingRecognizer, StreamingRecognizer, release_when_done
+
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["ai-voice-service"])
+settings = get_settings()
+
+# Content-addressed cache of synthesized audio; greetings, transitions and the
+# closing statement repeat constantly across interviews.
+audio_cache = AudioCache(
+    settings.tts_cache_dir,
+    max_memory_bytes=settings.tts_cache_memory_mb * 1024 * 1024,
+    max_disk_bytes=settings.tts_cache_disk_mb * 1024 * 1024,
+)
 
 # Initialize the Google Cloud TTS/STT Clients (done once)
 try:
@@ -30,6 +48,36 @@ except Exception as e:
     tts_client = None
     stt_client = None
 
+# The Google Cloud clients used here are synchronous. Calls run on a dedicated, bounded
+# executor (not the default one shared with the rest of the app), behind per-service
+# concurrency limits and timeouts, so voice traffic can't stall other requests.
+voice_executor = ThreadPoolExecutor(max_workers=settings.voice_executor_workers, thread_name_prefix="voice")
+_tts_slots = asyncio.Semaphore(settings.tts_max_concurrency)
+_stt_slots = asyncio.Semaphore(settings.stt_max_concurrency)
+# Streaming recognition holds a thread for a whole utterance (up to STT_STREAM_TIMEOUT_SECONDS),
+# so streams get their own executor and can't starve short TTS/STT calls of threads.
+stt_stream_executor = ThreadPoolExecutor(max_workers=settings.stt_stream_max_concurrency, thread_name_prefix="stt-stream")
+_stt_stream_slots = asyncio.Semaphore(settings.stt_stream_max_concurrency)
+
+async def run_voice_call(slots: asyncio.Semaphore, timeout: float, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Runs a blocking TTS/STT client call on the voice executor.
+
+    Waiting for a free slot counts towards `timeout`; raises asyncio.TimeoutError when exceeded.
+    The slot is held until the call returns, even if the caller has given up on it by then,
+    so timed-out calls can't pile up threads beyond the concurrency limit.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    await asyncio.wait_for(slots.acquire(), timeout=timeout)
+    try:
+        future = voice_executor.submit(functools.partial(fn, *args, **kwargs))
+    except BaseException:
+        slots.release()
+        raise
+    release_when_done(future, slots)
+    return await asyncio.wait_for(asyncio.wrap_future(future), timeout=max(deadline - loop.time(), 0))
+
 # --- Pydantic Models ---
 
 class VoiceRequest(BaseModel):
@@ -43,6 +91,7 @@ class VoiceResponse(BaseModel):
     success: bool
     audio_content: str # Base64 encoded audio bytes
     content_type: str = "audio/mpeg"
+    audio_url: Optional[str] = None # Cacheable GET URL for the same audio
 
 class SpeechToTextResponse(BaseModel):
     success: bool
@@ -50,47 +99,216 @@ class SpeechToTextResponse(BaseModel):
     confidence: Optional[float] = None
     error: Optional[str] = None
 
+# --- TTS Helpers ---
+
+def synthesize_speech(text: str, voice_name: str = "en-US-Wavenet-F", pitch: float = 0.0, speaking_rate: float = 1.0) -> bytes:
+    """Synthesizes text to MP3 bytes with Google Cloud TTS (blocking call)."""
+    synthesis_input = SynthesisInput(text=text)
+
+    # Build the voice request using the new Wavenet default
+    voice = VoiceSelectionParams(
+        language_code="en-US",
+        name=voice_name,
+        ssml_gender=SsmlVoiceGender.FEMALE
+    )
+
+    audio_config = AudioConfig(
+        audio_encoding=AudioConfig.AudioEncoding.MP3,
+        pitch=pitch,
+        speaking_rate=speaking_rate
+    )
+
+    # The client-side deadline frees the executor thread even if the caller gave up waiting.
+    response = tts_client.synthesize_speech(
+        input=synthesis_input, voice=voice, audio_config=audio_config, timeout=settings.tts_timeout_seconds
+    )
+    return response.audio_content
+
+async def synthesize_speech_async(text: str, voice_name: str = "en-US-Wavenet-F", pitch: float = 0.0, speaking_rate: float = 1.0) -> bytes:
+    """Runs synthesize_speech on the voice executor so several sentences can be synthesized in parallel."""
+    return await run_voice_call(_tts_slots, settings.tts_timeout_seconds, synthesize_speech, text, voice_name, pitch, speaking_rate)
+
+# Syntheses in progress, keyed by cache key, so concurrent requests (and prefetches)
+# for the same audio share one TTS call.
+_inflight_speech: Dict[str, asyncio.Future] = {}
+
+async def _load_or_synthesize(key: str, text: str, voice_name: str, pitch: float, speaking_rate: float) -> bytes:
+    audio = await audio_cache.get(key)
+    if audio is None:
+        audio = await synthesize_speech_async(text, voice_name, pitch, speaking_rate)
+        await audio_cache.put(key, audio)
+    return audio
+
+def _speech_future(key: str, text: str, voice_name: str, pitch: float, speaking_rate: float) -> asyncio.Future:
+    future = _inflight_speech.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_load_or_synthesize(key, text, voice_name, pitch, speaking_rate))
+        _inflight_speech[key] = future
+        future.add_done_callback(lambda _: _inflight_speech.pop(key, None))
+    return future
+
+async def get_speech_audio(text: str, voice_name: str = "en-US-Wavenet-F", pitch: float = 0.0, speaking_rate: float = 1.0) -> bytes:
+    """Returns the MP3 audio of `text`, from the cache, an in-flight synthesis, or a new one."""
+    key = audio_cache_key(text, voice_name, pitch, speaking_rate)
+    audio = audio_cache.get_from_memory(key)
+    if audio is not None:
+        return audio
+    # Shielded so a client disconnect doesn't cancel a synthesis other requests may share.
+    return await asyncio.shield(_speech_future(key, text, voice_name, pitch, speaking_rate))
+
+def prefetch_speech(text: str, voice_name: str = "en-US-Wavenet-F", pitch: float = 0.0, speaking_rate: float = 1.0) -> None:
+    """Starts synthesizing `text` in the background so a later /voice/generate call finds it ready."""
+    if tts_client is None or not text:
+        return
+    key = audio_cache_key(text, voice_name, pitch, speaking_rate)
+    if audio_cache.get_from_memory(key) is not None:
+        return
+    future = _speech_future(key, text, voice_name, pitch, speaking_rate)
+    # Failures are surfaced to whoever awaits the audio; don't log them as unretrieved here.
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def audio_response(request: Request, key: str, audio: bytes) -> Response:
+    """
+    Builds a binary audio/mpeg response for cached audio.
+
+    The content address is used as a strong ETag, so browsers can revalidate with
+    If-None-Match, and single byte ranges are honoured for streaming playback.
+    """
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+        "Content-Location": f"/voice/audio/{key}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        match = _RANGE_PATTERN.match(range_header.strip())
+        # Multi-range and malformed headers fall through to a full response
+        if match and (match.group(1) or match.group(2)):
+            total = len(audio)
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+            else:
+                start = max(total - int(match.group(2)), 0)
+                end = total - 1
+            if start >= total or start > end:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{total}"})
+            headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+            return Response(content=audio[start:end + 1], status_code=206, media_type="audio/mpeg", headers=headers)
+
+    return Response(content=audio, media_type="audio/mpeg", headers=headers)
+
+# Sentence boundary: terminal punctuation (optionally followed by closing quotes/brackets) and whitespace.
+_SENTENCE_END = re.compile(r'(?<=[.!?])["\')\]]*\s+')
+
+class SentenceBuffer:
+    """
+    Accumulates streamed text and releases complete sentences as soon as they end,
+    so each sentence can be sent to TTS while the rest of the reply is still being generated.
+    """
+
+    def __init__(self, min_chars: int = 20):
+        self._buffer = ""
+        # Very short fragments ("Understood.") are merged with the next sentence
+        # to avoid paying a TTS round trip for a single word.
+        self.min_chars = min_chars
+
+    def feed(self, text: str) -> List[str]:
+        """Adds streamed text and returns the sentences completed by it."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if len(candidate) >= self.min_chars:
+                sentences.append(candidate)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Returns whatever text remains once the stream has ended."""
+        remaining = self._buffer.strip()
+        self._buffer = ""
+        return [remaining] if remaining else []
+
+def split_sentences(text: str, min_chars: int = 20) -> List[str]:
+    """Splits a complete text into TTS-sized sentences."""
+    buffer = SentenceBuffer(min_chars)
+    return buffer.feed(text) + buffer.flush()
+
+async def stream_speech(text: str, voice_name: str = "en-US-Wavenet-F", pitch: float = 0.0, speaking_rate: float = 1.0) -> AsyncIterator[bytes]:
+    """
+    Yields the MP3 audio of `text` sentence by sentence, in order.
+
+    All sentences are synthesized concurrently (within the TTS limits) and each one is
+    cached on its own, so the first segment is ready after one sentence's synthesis
+    regardless of the reply length, and repeated sentences are served from the cache.
+    """
+    syntheses = [
+        asyncio.ensure_future(get_speech_audio(sentence, voice_name, pitch, speaking_rate))
+        for sentence in split_sentences(text)
+    ]
+    try:
+        for synthesis in syntheses:
+            yield await synthesis
+    finally:
+        for synthesis in syntheses:
+            synthesis.cancel()
+            synthesis.add_done_callback(lambda f: f.cancelled() or f.exception())
+
 # --- TTS Endpoint ---
 
 @router.post("/voice/generate", response_model=VoiceResponse)
-async def generate_voice(request: VoiceRequest):
+async def generate_voice(
+    request: VoiceRequest,
+    http_request: Request,
+    response_format: str = Query("json", pattern="^(json|binary)$", description="'binary' returns audio/mpeg bytes instead of base64 JSON."),
+):
     """
     Generates voice audio from text using Google Cloud TTS.
+
+    Audio is served from the content-addressed cache when available. With
+    `response_format=binary` (or `Accept: audio/mpeg`) the MP3 is returned directly
+    with ETag/Range support; the JSON response includes a cacheable `audio_url`.
     """
-    if tts_client is None:
-        raise HTTPException(status_code=503, detail="TTS service is unavailable. Check backend configuration.")
-        
     if not request.text:
         raise HTTPException(status_code=400, detail="Text field cannot be empty.")
+
+    key = audio_cache_key(request.text, request.voice_name, request.pitch, request.speaking_rate)
+    if tts_client is None and audio_cache.get_from_memory(key) is None:
+        raise HTTPException(status_code=503, detail="TTS service is unavailable. Check backend configuration.")
         
     try:
-        synthesis_input = SynthesisInput(text=request.text)
-
-        # Build the voice request using the new Wavenet default
-        voice = VoiceSelectionParams(
-            language_code="en-US",
-            name=request.voice_name,
-            ssml_gender=SsmlVoiceGender.FEMALE
+        audio_bytes = await get_speech_audio(
+            request.text, request.voice_name, request.pitch, request.speaking_rate
         )
 
-        audio_config = AudioConfig(
-            audio_encoding=AudioConfig.AudioEncoding.MP3,
-            pitch=request.pitch,
-            speaking_rate=request.speaking_rate
-        )
+        accept = http_request.headers.get("accept", "")
+        if response_format == "binary" or ("audio/mpeg" in accept and "application/json" not in accept):
+            return audio_response(http_request, key, audio_bytes)
 
-        response = tts_client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
-        )
-
-        audio_base64 = base64.b64encode(response.audio_content).decode('utf-8')
+        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
 
         return VoiceResponse(
             success=True,
             audio_content=audio_base64,
-            content_type="audio/mpeg"
+            content_type="audio/mpeg",
+            audio_url=f"/voice/audio/{key}"
         )
 
+    except asyncio.TimeoutError:
+        logger.warning(f"Google TTS timed out after {settings.tts_timeout_seconds}s")
+        raise HTTPException(status_code=504, detail="Voice generation timed out. Please retry.")
     except Exception as e:
         logger.error(f"Error generating voice audio with Google TTS: {e}", exc_info=True)
         raise HTTPException(
@@ -98,6 +316,90 @@ async def generate_voice(request: VoiceRequest):
             detail=f"Failed to generate voice audio: {str(e)}"
         )
 
+@router.post("/voice/stream")
+async def stream_voice(request: VoiceRequest):
+    """
+    Generates voice audio for long texts in sentence-sized segments.
+
+    The MP3 segments are streamed in order as a single audio/mpeg body, so playback
+    can start as soon as the first sentence is synthesized.
+    """
+    if not request.text:
+        raise HTTPException(status_code=400, detail="Text field cannot be empty.")
+    if tts_client is None:
+        raise HTTPException(status_code=503, detail="TTS service is unavailable. Check backend configuration.")
+
+    segments = stream_speech(request.text, request.voice_name, request.pitch, request.speaking_rate)
+    # Wait for the first segment so failures can still be reported with a status code
+    try:
+        first_segment = await segments.__anext__()
+    except asyncio.TimeoutError:
+        await segments.aclose()
+        logger.warning(f"Google TTS timed out after {settings.tts_timeout_seconds}s")
+        raise HTTPException(status_code=504, detail="Voice generation timed out. Please retry.")
+    except Exception as e:
+        await segments.aclose()
+        logger.error(f"Error generating voice audio with Google TTS: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to generate voice audio: {str(e)}")
+
+    async def body():
+        try:
+            yield first_segment
+            async for segment in segments:
+                yield segment
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated stream.
+            logger.error(f"Error streaming voice audio segment: {e}", exc_info=True)
+        finally:
+            await segments.aclose()
+
+    return StreamingResponse(body(), media_type="audio/mpeg", headers={"Cache-Control": "no-store"})
+
+@router.get("/voice/audio/{audio_key}")
+async def get_cached_voice_audio(audio_key: str, http_request: Request):
+    """
+    Serves previously generated audio by its content address (as returned in `audio_url`).
+    Responses are immutable, so browsers can cache them and stream them with Range requests.
+    """
+    if not re.fullmatch(r"[0-9a-f]{64}", audio_key):
+        raise HTTPException(status_code=404, detail="Audio not found.")
+    audio_bytes = await audio_cache.get(audio_key)
+    if audio_bytes is None:
+        raise HTTPException(status_code=404, detail="Audio not found or evicted from the cache.")
+    return audio_response(http_request, audio_key, audio_bytes)
+
+# --- STT Helpers ---
+
+def recognition_encoding(content_type: str):
+    """Determine encoding based on MIME type (required for Google Cloud STT)"""
+    if "webm" in content_type or "opus" in content_type:
+        return speech.RecognitionConfig.AudioEncoding.OGG_OPUS
+    elif "mp3" in content_type or "mpeg" in content_type:
+        return speech.RecognitionConfig.AudioEncoding.MP3
+    elif "wav" in content_type:
+        return speech.RecognitionConfig.AudioEncoding.LINEAR16
+    return speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED # Let API decide
+
+def recognize_audio(audio_content: bytes, encoding, sample_rate_hertz: int):
+    """Performs synchronous Google Cloud speech recognition (blocking call)."""
+    audio = speech.RecognitionAudio(content=audio_content)
+    config = speech.RecognitionConfig(
+        encoding=encoding,
+        sample_rate_hertz=sample_rate_hertz,
+        language_code="en-US",
+        model="default"
+    )
+    return stt_client.recognize(config=config, audio=audio, timeout=settings.stt_timeout_seconds)
+
+def get_streaming_recognizer() -> Optional[StreamingRecognizer]:
+    """Returns the configured streaming recognizer, or None if it is unavailable."""
+    if settings.speech_recognizer == "fake":
+        return FakeStreamingRecognizer()
+    if stt_client is None:
+        return None
+    # Each stream holds a thread of the stream executor for its whole duration, bounded by the stream slots.
+    return GoogleStreamingRecognizer(stt_client, stt_stream_executor, _stt_stream_slots, settings.stt_stream_timeout_seconds)
+
 # --- STT Endpoint ---
 
 @router.post("/speech/recognize", response_model=SpeechToTextResponse)
@@ -114,29 +416,17 @@ async def recognize_speech(audio_file: UploadFile = File(...), sample_rate_hertz
 
     try:
         audio_content = await audio_file.read()
-        
-        audio = speech.RecognitionAudio(content=audio_content)
-
-        # Determine encoding based on MIME type (required for Google Cloud STT)
-        if "webm" in audio_file.content_type or "opus" in audio_file.content_type:
-            encoding = speech.RecognitionConfig.AudioEncoding.OGG_OPUS
-        elif "mp3" in audio_file.content_type or "mpeg" in audio_file.content_type:
-             encoding = speech.RecognitionConfig.AudioEncoding.MP3
-        elif "wav" in audio_file.content_type:
-            encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
-        else:
-            encoding = speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED # Let API decide
 
-        config = speech.RecognitionConfig(
-            encoding=encoding,
-            sample_rate_hertz=sample_rate_hertz,
-            language_code="en-US",
-            model="default"
+        # Perform the speech recognition on the voice executor
+        response = await run_voice_call(
+            _stt_slots,
+            settings.stt_timeout_seconds,
+            recognize_audio,
+            audio_content,
+            recognition_encoding(audio_file.content_type),
+            sample_rate_hertz,
         )
 
-        # Perform the speech recognition
-        response = stt_client.recognize(config=config, audio=audio)
-
         if response.results and response.results[0].alternatives:
             best_alternative = response.results[0].alternatives[0]
             return SpeechToTextResponse(
@@ -151,9 +441,67 @@ async def recognize_speech(audio_file: UploadFile = File(...), sample_rate_hertz
                 error="No speech recognized in the audio file."
             )
 
+    except asyncio.TimeoutError:
+        logger.warning(f"Google STT timed out after {settings.stt_timeout_seconds}s")
+        raise HTTPException(status_code=504, detail="Speech recognition timed out. Please retry.")
     except Exception as e:
         logger.error(f"Error recognizing speech with Google STT: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to recognize speech: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.websocket("/speech/stream")
+async def stream_speech_recognition(websocket: WebSocket, content_type: str = "audio/webm", sample_rate_hertz: int = 16000):
+    """
+    Streaming speech recognition.
+
+    The client sends audio chunks as binary frames while the founder speaks, and
+    `{"type": "end"}` when they stop. The server pushes
+    `{"type": "transcript", "transcript", "is_final", "stability", "confidence"}`
+    messages as results arrive, then `{"type": "complete", "transcript"}` with the
+    joined final transcripts, which can be sent straight on as the interview answer.
+    """
+    await websocket.accept()
+    recognizer = get_streaming_recognizer()
+    if recognizer is None:
+        await websocket.send_json({"type": "error", "detail": "STT service is unavailable. Check backend configuration."})
+        await websocket.close(code=1011)
+        return
+
+    async def audio_chunks():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                yield message["bytes"]
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except json.JSONDecodeError:
+                    continue
+                if control.get("type") == "end":
+                    return
+
+    final_transcripts: List[str] = []
+    try:
+        async for result in recognizer.recognize(audio_chunks(), recognition_encoding(content_type), sample_rate_hertz):
+            if result.is_final and result.transcript.strip():
+                final_transcripts.append(result.transcript.strip())
+            await websocket.send_json({"type": "transcript", **result.dict()})
+        await websocket.send_json({"type": "complete", "transcript": " ".join(final_transcripts)})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("Client disconnected from speech stream")
+    except asyncio.TimeoutError:
+        logger.warning("Streaming speech recognition timed out")
+        await websocket.send_json({"type": "error", "detail": "Speech recognition timed out. Please retry."})
+        await websocket.close(code=1011)
+    except Exception as e:
+        logger.error(f"Error in streaming speech recognition: {e}", exc_info=True)
+        try:
+            await websocket.send_json({"type": "error", "detail": f"Failed to recognize speech: {str(e)}"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
@@ -3,21 +3,29 @@ Analysis API router for InvestAI platform.
 Handles all analysis-related endpoints including text analysis, fact checking, and comprehensive analysis.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, UploadFile, File
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, UploadFile, File, Form
+from typing import Dict, Any, List, Optional
 import logging
 from pydantic import BaseModel
 import asyncio
+import tempfile
 import time
 # Using utils agent_runner instead of Google ADK
 
-from agents.document_ingestor import startup_analyzer
+from agents.document_ingestor import (
+    UploadTooLarge,
+    analyze_document_async,
+    analyze_documents_batch,
+    spool_upload,
+    startup_analyzer
+)
 from utils.agent_runner import run_agent, AgentError
 from config import get_settings
 
 # All analysis routes now use document_ingestor for consistency
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter(tags=["analysis"])
 
@@ -433,6 +441,9 @@ async def analyze_document(file: UploadFile = File(...)):
     """
     Analyze uploaded document (PDF, PPTX, etc.).
     
+    The upload is spooled to a temporary file in chunks and analyzed from
+    disk, so large files never sit in memory whole.
+    
     Args:
         file: Uploaded document file
         
@@ -442,16 +453,9 @@ async def analyze_document(file: UploadFile = File(...)):
     try:
         logger.info(f"Starting document analysis for file: {file.filename}")
         
-        # Read file content
-        content = await file.read()
-        
-        if file.filename.lower().endswith('.pdf'):
-            # For PDF files, use the PDF analyzer
-            result = startup_analyzer.analyze_pdf(content)
-        else:
-            # For other files, treat as text
-            text_content = content.decode('utf-8', errors='ignore')
-            result = startup_analyzer.analyze_document(text_content, file.filename)
+        with tempfile.TemporaryDirectory(prefix="upload-") as upload_directory:
+            path = await spool_upload(file, upload_directory)
+            result = await analyze_document_async(startup_analyzer, file.filename, path)
         
         # Add frontend compatibility fields
         result['ready_for_firebase'] = True
@@ -459,11 +463,13 @@ async def analyze_document(file: UploadFile = File(...)):
         result['file_type'] = file.content_type
         
         return AnalysisResponse(
-            success=True,
+            success=result.get('status') != 'failed',
             data=result,
             analysis_type="document"
         )
         
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         logger.error(f"Error in document analysis: {str(e)}")
         raise HTTPException(
@@ -471,6 +477,65 @@ async def analyze_document(file: UploadFile = File(...)):
             detail=f"Document analysis failed: {str(e)}"
         )
 
+# Batch Document Ingestion Route
+@router.post("/documents", response_model=AnalysisResponse)
+async def analyze_documents(
+    files: List[UploadFile] = File(...),
+    document_type: str = Form("general"),
+    startup_id: Optional[str] = Form(None)
+):
+    """
+    Analyze a set of documents at once, e.g. a whole data room.
+    
+    Accepts PDFs, PPTX decks, emails (.eml), call transcripts (.vtt, .srt),
+    text files and zip archives of these. Uploads are spooled to disk in
+    chunks; all documents and their pages are processed concurrently through
+    a shared, bounded worker pool within the ingestion memory budget, and
+    near-duplicate pages are analyzed once.
+    
+    Args:
+        files: Uploaded documents
+        document_type: Document type used for the summaries
+        startup_id: Startup the documents belong to; pages from its earlier uploads reuse their analyses
+        
+    Returns:
+        Aggregated results with one entry per document
+    """
+    if len(files) > settings.ingestion_max_files:
+        # Rejected before anything is spooled; archive members are counted again after unpacking
+        raise HTTPException(status_code=400, detail=f"Too many documents: {len(files)} (maximum {settings.ingestion_max_files})")
+    
+    try:
+        print(f"\n📚 [DOCUMENT BATCH] Received {len(files)} files")
+        logger.info(f"Starting batch document analysis for {len(files)} files")
+        
+        with tempfile.TemporaryDirectory(prefix="upload-") as upload_directory:
+            uploads = [(file.filename, await spool_upload(file, upload_directory)) for file in files]
+            result = await analyze_documents_batch(uploads, doc_type=document_type, startup_id=startup_id)
+        
+        print(f"✅ [DOCUMENT BATCH] {result['successful_documents']}/{result['total_documents']} documents analyzed in {result['processing_time']}s")
+        
+        # Add frontend compatibility fields
+        result['ready_for_firebase'] = True
+        
+        return AnalysisResponse(
+            success=result['status'] == 'success',
+            data=result,
+            analysis_type="document_batch",
+            processing_time=result['processing_time']
+        )
+        
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in batch document analysis: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch document analysis failed: {str(e)}"
+        )
+
 # Email Analysis Route
 @router.post("/email", response_model=AnalysisResponse)
 async def analyze_email(request: dict):
@@ -9,8 +9,12 @@ import logging
 from pydantic import BaseModel, Field
 from datetime import datetime, timedelta
 from enum import Enum
+import uuid
 
 from config import get_settings
+from utils.availability import free_intervals, slot_bounds, to_utc
+from utils.exceptions import ConflictError
+from utils.meeting_store import create_meeting_repository
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -69,10 +73,44 @@ class MeetingListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None # Pass back as `cursor` to get the next page
 
-# In-memory storage (in production, use a database)
-meetings_db = {}
-meeting_counter = 0
+class BusySlot(BaseModel):
+    meeting_id: str
+    start_time: datetime
+    end_time: datetime
+
+class FreeSlot(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+class AvailabilityResponse(BaseModel):
+    user_id: str
+    start_time: datetime
+    end_time: datetime
+    busy: List[BusySlot]
+    free: List[FreeSlot]
+
+# Meetings are stored in DATABASE_URL (memory:// keeps them in process)
+meetings_db = create_meeting_repository(settings.database_url)
+
+async def check_slot_conflicts(user_ids: List[str], slot: Any, exclude_meeting_id: Optional[str] = None) -> None:
+    """
+    Raises a 409 if the slot overlaps a confirmed meeting of any of the users.
+    
+    Args:
+        user_ids: Users whose calendars are checked
+        slot: TimeSlot model or dict
+        exclude_meeting_id: Meeting being rescheduled, which can't conflict with itself
+    """
+    start, end = slot_bounds(slot)
+    for user_id in dict.fromkeys(user_ids):
+        conflict = await meetings_db.find_conflict(user_id, start, end, exclude_meeting_id)
+        if conflict:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Time slot {start.isoformat()} - {end.isoformat()} UTC conflicts with confirmed meeting {conflict[2]} of {user_id}"
+            )
 
 @router.post("/request", response_model=MeetingResponse)
 async def create_meeting_request(request: MeetingRequest):
@@ -86,9 +124,8 @@ async def create_meeting_request(request: MeetingRequest):
         Created meeting request with unique ID
     """
     try:
-        global meeting_counter
-        meeting_counter += 1
-        meeting_id = f"meeting_{meeting_counter}_{int(datetime.now().timestamp())}"
+        # Unique across workers sharing the database
+        meeting_id = f"meeting_{uuid.uuid4().hex[:12]}_{int(datetime.now().timestamp())}"
         
         # Validate time slots
         for slot in request.preferred_time_slots:
@@ -102,6 +139,7 @@ async def create_meeting_request(request: MeetingRequest):
                     status_code=400,
                     detail="Time slots must be in the future"
                 )
+            await check_slot_conflicts([request.requester_id, request.recipient_id], slot)
         
         # Create meeting record
         meeting = MeetingResponse(
@@ -118,12 +156,14 @@ async def create_meeting_request(request: MeetingRequest):
         )
         
         # Store in database
-        meetings_db[meeting_id] = meeting.dict()
+        await meetings_db.add(meeting.dict())
         
         logger.info(f"Meeting request created: {meeting_id}")
         
         return meeting
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating meeting request: {e}")
         raise HTTPException(
@@ -142,13 +182,14 @@ async def get_meeting(meeting_id: str):
     Returns:
         Meeting details
     """
-    if meeting_id not in meetings_db:
+    meeting_data = await meetings_db.get(meeting_id)
+    if meeting_data is None:
         raise HTTPException(
             status_code=404,
             detail="Meeting not found"
         )
     
-    return MeetingResponse(**meetings_db[meeting_id])
+    return MeetingResponse(**meeting_data)
 
 @router.put("/{meeting_id}", response_model=MeetingResponse)
 async def update_meeting(meeting_id: str, update: MeetingUpdate):
@@ -162,26 +203,31 @@ async def update_meeting(meeting_id: str, update: MeetingUpdate):
     Returns:
         Updated meeting details
     """
-    if meeting_id not in meetings_db:
-        raise HTTPException(
-            status_code=404,
-            detail="Meeting not found"
-        )
-    
-    meeting_data = meetings_db[meeting_id]
-    
     # Update fields
+    changes = {}
     if update.status:
-        meeting_data["status"] = update.status
+        changes["status"] = update.status
     if update.selected_time_slot:
-        meeting_data["selected_time_slot"] = update.selected_time_slot.dict()
+        changes["selected_time_slot"] = update.selected_time_slot.dict()
     if update.message:
-        meeting_data["message"] = update.message
+        changes["message"] = update.message
     
-    meeting_data["updated_at"] = datetime.now()
+    changes["updated_at"] = datetime.now()
     
-    # Store updated meeting
-    meetings_db[meeting_id] = meeting_data
+    # Store updated meeting; a confirmed slot must not overlap other confirmed
+    # meetings of either participant, which the store checks atomically with the write
+    try:
+        meeting_data = await meetings_db.update(meeting_id, changes)
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail="Meeting not found"
+        )
+    except ConflictError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=e.message
+        )
     
     logger.info(f"Meeting updated: {meeting_id}, status: {update.status}")
     
@@ -192,7 +238,8 @@ async def get_user_meetings(
     user_id: str,
     status: Optional[MeetingStatus] = None,
     page: int = 1,
-    page_size: int = 20
+    page_size: int = 20,
+    cursor: Optional[str] = None
 ):
     """
     Get all meetings for a specific user.
@@ -200,33 +247,70 @@ async def get_user_meetings(
     Args:
         user_id: User identifier
         status: Filter by meeting status (optional)
-        page: Page number for pagination
+        page: Page number for pagination (pages after the cursor, if given)
         page_size: Number of meetings per page
+        cursor: `next_cursor` of the previous page; cheaper than deep page numbers
         
     Returns:
         List of meetings for the user
     """
-    user_meetings = []
+    # Newest first, served from the per-user indexes
+    try:
+        page_data, total, next_cursor = await meetings_db.list_for_user(
+            user_id,
+            status=status,
+            offset=max(page - 1, 0) * page_size,
+            limit=page_size,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    for meeting_data in meetings_db.values():
-        if (meeting_data["requester_id"] == user_id or 
-            meeting_data["recipient_id"] == user_id):
-            if not status or meeting_data["status"] == status:
-                user_meetings.append(MeetingResponse(**meeting_data))
+    return MeetingListResponse(
+        meetings=[MeetingResponse(**meeting_data) for meeting_data in page_data],
+        total=total,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor
+    )
+
+@router.get("/availability/{user_id}", response_model=AvailabilityResponse)
+async def get_user_availability(
+    user_id: str,
+    start_time: datetime,
+    end_time: datetime,
+    timezone: str = "UTC",
+    min_duration: int = 30
+):
+    """
+    Get a user's busy (confirmed) and free time over a date range.
     
-    # Sort by created_at (newest first)
-    user_meetings.sort(key=lambda x: x.created_at, reverse=True)
+    Args:
+        user_id: User identifier
+        start_time: Start of the range
+        end_time: End of the range
+        timezone: Timezone of naive start/end times
+        min_duration: Shortest free slot to return, in minutes
+        
+    Returns:
+        Busy and free intervals in UTC
+    """
+    range_start, range_end = to_utc(start_time, timezone), to_utc(end_time, timezone)
+    if range_start >= range_end:
+        raise HTTPException(
+            status_code=400,
+            detail="Start time must be before end time"
+        )
     
-    # Pagination
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_meetings = user_meetings[start_idx:end_idx]
+    busy = await meetings_db.busy_intervals(user_id, range_start, range_end)
+    free = free_intervals(busy, range_start, range_end, timedelta(minutes=min_duration))
     
-    return MeetingListResponse(
-        meetings=paginated_meetings,
-        total=len(user_meetings),
-        page=page,
-        page_size=page_size
+    return AvailabilityResponse(
+        user_id=user_id,
+        start_time=range_start,
+        end_time=range_end,
+        busy=[BusySlot(meeting_id=meeting_id, start_time=start, end_time=end) for start, end, meeting_id in busy],
+        free=[FreeSlot(start_time=start, end_time=end) for start, end in free]
     )
 
 @router.delete("/{meeting_id}")
@@ -240,18 +324,17 @@ async def cancel_meeting(meeting_id: str):
     Returns:
         Success message
     """
-    if meeting_id not in meetings_db:
+    try:
+        await meetings_db.update(meeting_id, {
+            "status": MeetingStatus.CANCELLED,
+            "updated_at": datetime.now()
+        })
+    except KeyError:
         raise HTTPException(
             status_code=404,
             detail="Meeting not found"
         )
     
-    meeting_data = meetings_db[meeting_id]
-    meeting_data["status"] = MeetingStatus.CANCELLED
-    meeting_data["updated_at"] = datetime.now()
-    
-    meetings_db[meeting_id] = meeting_data
-    
     logger.info(f"Meeting cancelled: {meeting_id}")
     
     return {"message": "Meeting cancelled successfully"}
@@ -267,33 +350,17 @@ async def get_meeting_stats(user_id: str):
     Returns:
         Meeting statistics
     """
-    stats = {
-        "total_meetings": 0,
-        "pending_requests": 0,
-        "accepted_meetings": 0,
-        "confirmed_meetings": 0,
-        "completed_meetings": 0,
-        "cancelled_meetings": 0
-    }
+    # Maintained incrementally by the repository
+    counts = await meetings_db.status_counts(user_id)
     
-    for meeting_data in meetings_db.values():
-        if (meeting_data["requester_id"] == user_id or 
-            meeting_data["recipient_id"] == user_id):
-            stats["total_meetings"] += 1
-            status = meeting_data["status"]
-            
-            if status == MeetingStatus.PENDING:
-                stats["pending_requests"] += 1
-            elif status == MeetingStatus.ACCEPTED:
-                stats["accepted_meetings"] += 1
-            elif status == MeetingStatus.CONFIRMED:
-                stats["confirmed_meetings"] += 1
-            elif status == MeetingStatus.COMPLETED:
-                stats["completed_meetings"] += 1
-            elif status == MeetingStatus.CANCELLED:
-                stats["cancelled_meetings"] += 1
-    
-    return stats
+    return {
+        "total_meetings": sum(counts.values()),
+        "pending_requests": counts.get(MeetingStatus.PENDING.value, 0),
+        "accepted_meetings": counts.get(MeetingStatus.ACCEPTED.value, 0),
+        "confirmed_meetings": counts.get(MeetingStatus.CONFIRMED.value, 0),
+        "completed_meetings": counts.get(MeetingStatus.COMPLETED.value, 0),
+        "cancelled_meetings": counts.get(MeetingStatus.CANCELLED.value, 0)
+    }
 
 @router.get("/health")
 async def health_check():
@@ -302,5 +369,5 @@ async def health_check():
         "status": "healthy",
         "service": "meetings",
         "version": "1.0.0",
-        "total_meetings": len(meetings_db)
+        "total_meetings": await meetings_db.count()
     }
@@ -5,16 +5,33 @@ Handles user profile management for startups and investors.
 
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Dict, Any, Optional, List
+import asyncio
+import json
 import logging
+import time
+from datetime import datetime, timedelta
 from pydantic import BaseModel, EmailStr
 
 from config import get_settings
+from prompts.agent_prompts import INVESTOR_MATCHING_PROMPT
+from utils.matching import MatchingEngine, create_embedder, score_all_pairs
+from utils.profile_search import create_search_index, decode_search_cursor, encode_search_cursor
+from utils.profile_store import INVESTOR, STARTUP, create_profile_repository, profile_matches
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 router = APIRouter(tags=["profiles"])
 
+# Profiles are stored in DATABASE_URL (memory:// keeps them in process)
+profiles_db = create_profile_repository(settings.database_url)
+
+# Full-text index over profile names, descriptions and tags (PROFILE_SEARCH_URL)
+search_index = create_search_index(settings.profile_search_url)
+
+# Profile embeddings for investor-startup matching, held in process and saved with the profiles
+match_engine = MatchingEngine(create_embedder(settings.matching_embedder), store=profiles_db)
+
 # Pydantic models
 class StartupProfile(BaseModel):
     company_name: str
@@ -41,6 +58,7 @@ class StartupProfile(BaseModel):
     growth_strategy: str
     challenges: str
     goals: str
+    tags: List[str] = []
 
 class InvestorProfile(BaseModel):
     name: str
@@ -64,6 +82,102 @@ class ProfileResponse(BaseModel):
     profile: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
+class ProfileListResponse(BaseModel):
+    profiles: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to get the next page
+    has_more: bool
+
+class MatchScoringResponse(BaseModel):
+    startups: int
+    investors: int
+    pairs: int
+    seconds: float
+    pairs_per_second: float
+    updated_startups: int # Profiles whose stored top matches changed
+    updated_investors: int
+
+# Search index maintenance
+
+def search_document(profile_type: str, profile: Dict[str, Any]) -> Dict[str, str]:
+    """Returns the searchable name, description and tags text of a profile."""
+    def join(*values):
+        parts = []
+        for value in values:
+            if isinstance(value, list):
+                parts.extend(str(item) for item in value)
+            elif value:
+                parts.append(str(value))
+        return " ".join(parts)
+    
+    if profile_type == STARTUP:
+        return {
+            "name": join(profile.get("company_name")),
+            "description": join(profile.get("description"), profile.get("value_proposition")),
+            "tags": join(profile.get("tags", []), profile.get("industry"))
+        }
+    return {
+        "name": join(profile.get("name"), profile.get("company")),
+        "description": join(profile.get("bio"), profile.get("investment_criteria")),
+        "tags": join(profile.get("investment_focus", []))
+    }
+
+async def index_profile(profile_type: str, user_id: str, profile: Dict[str, Any]) -> None:
+    """Re-indexes one profile after it changes; a failure leaves the stored profile intact."""
+    try:
+        await search_index.index(profile_type, user_id, search_document(profile_type, profile), profile["updated_at"].isoformat())
+    except Exception as e:
+        logger.error(f"Error indexing {profile_type} profile {user_id}: {str(e)}")
+    try:
+        await match_engine.index(profile_type, {**profile, "user_id": user_id})
+    except Exception as e:
+        logger.error(f"Error embedding {profile_type} profile {user_id}: {str(e)}")
+
+# Profiles changed through other workers or nodes are picked up by reading profiles
+# updated after the last reconciliation. Changes this close before the watermark are
+# read again, in case their transaction committed after a later one (or clocks differ).
+INDEX_SYNC_OVERLAP = timedelta(seconds=60)
+
+async def changed_profiles(profile_type: str, since: Optional[datetime]):
+    """Yields pages of the profiles updated after `since` (all profiles if None), oldest change first."""
+    after = None
+    while True:
+        page = await profiles_db.changed_since(profile_type, since=since, after=after, limit=500)
+        if page:
+            yield page
+        if len(page) < 500:
+            return
+        after = (page[-1]["updated_at"], page[-1]["user_id"])
+
+async def ensure_search_index(profile_type: str) -> None:
+    """Reconciles the search index with the profile store: indexes profiles created or changed since the last run."""
+    synced_until = await search_index.synced_until(profile_type)
+    since = datetime.fromisoformat(synced_until) - INDEX_SYNC_OVERLAP if synced_until else None
+    latest = None
+    indexed = 0
+    async for page in changed_profiles(profile_type, since):
+        versions = await search_index.versions(profile_type, [profile["user_id"] for profile in page])
+        for profile in page:
+            version = profile["updated_at"].isoformat()
+            if versions.get(profile["user_id"]) != version:
+                await search_index.index(profile_type, profile["user_id"], search_document(profile_type, profile), version)
+                indexed += 1
+        latest = page[-1]["updated_at"]
+    if latest is not None:
+        await search_index.set_synced_until(profile_type, latest.isoformat())
+    if indexed:
+        logger.info(f"Indexed {indexed} changed {profile_type} profiles for search")
+
+async def ensure_match_index(profile_type: str) -> None:
+    """Brings the matching engine up to date with profiles created or changed since its last run, by any worker."""
+    synced_until = match_engine.synced_until.get(profile_type)
+    since = synced_until - INDEX_SYNC_OVERLAP if synced_until else None
+    indexed = 0
+    async for page in changed_profiles(profile_type, since):
+        indexed += await match_engine.index_many(profile_type, page)
+        match_engine.synced_until[profile_type] = page[-1]["updated_at"]
+    if indexed:
+        logger.info(f"Indexed {indexed} changed {profile_type} profiles for matching")
+
 @router.post("/startup", response_model=ProfileResponse)
 async def create_startup_profile(profile: StartupProfile, user_id: str):
     """
@@ -79,11 +193,8 @@ async def create_startup_profile(profile: StartupProfile, user_id: str):
     try:
         logger.info(f"Creating startup profile for user: {user_id}")
         
-        # TODO: Implement database storage
-        # For now, return success with mock data
-        profile_data = profile.dict()
-        profile_data["user_id"] = user_id
-        profile_data["profile_type"] = "startup"
+        profile_data = await profiles_db.upsert(STARTUP, user_id, profile.dict())
+        await index_profile(STARTUP, user_id, profile_data)
         
         return ProfileResponse(
             success=True,
@@ -112,10 +223,8 @@ async def create_investor_profile(profile: InvestorProfile, user_id: str):
     try:
         logger.info(f"Creating investor profile for user: {user_id}")
         
-        # TODO: Implement database storage
-        profile_data = profile.dict()
-        profile_data["user_id"] = user_id
-        profile_data["profile_type"] = "investor"
+        profile_data = await profiles_db.upsert(INVESTOR, user_id, profile.dict())
+        await index_profile(INVESTOR, user_id, profile_data)
         
         return ProfileResponse(
             success=True,
@@ -143,13 +252,20 @@ async def get_startup_profile(user_id: str):
     try:
         logger.info(f"Fetching startup profile for user: {user_id}")
         
-        # TODO: Implement database retrieval
-        # For now, return mock data
+        profile_data = await profiles_db.get(STARTUP, user_id)
+        if profile_data is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Startup profile not found"
+            )
+        
         return ProfileResponse(
             success=True,
-            profile={"user_id": user_id, "profile_type": "startup"}
+            profile=profile_data
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching startup profile: {str(e)}")
         raise HTTPException(
@@ -171,12 +287,20 @@ async def get_investor_profile(user_id: str):
     try:
         logger.info(f"Fetching investor profile for user: {user_id}")
         
-        # TODO: Implement database retrieval
+        profile_data = await profiles_db.get(INVESTOR, user_id)
+        if profile_data is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Investor profile not found"
+            )
+        
         return ProfileResponse(
             success=True,
-            profile={"user_id": user_id, "profile_type": "investor"}
+            profile=profile_data
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching investor profile: {str(e)}")
         raise HTTPException(
@@ -184,32 +308,38 @@ async def get_investor_profile(user_id: str):
             detail="Failed to fetch investor profile"
         )
 
-@router.get("/startups", response_model=List[Dict[str, Any]])
+@router.get("/startups", response_model=ProfileListResponse)
 async def list_startup_profiles(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
     industry: Optional[str] = None,
     stage: Optional[str] = None
 ):
     """
-    List all startup profiles with optional filtering.
+    List startup profiles with optional filtering, newest first.
     
     Args:
-        skip: Number of profiles to skip
+        cursor: `next_cursor` of the previous page
         limit: Maximum number of profiles to return
         industry: Filter by industry
         stage: Filter by stage
         
     Returns:
-        List of startup profiles
+        Page of startup profiles and the cursor of the next page
     """
     try:
         logger.info("Fetching startup profiles list")
         
-        # TODO: Implement database query with filtering
-        # For now, return empty list
-        return []
+        profiles, next_cursor = await profiles_db.query(
+            STARTUP,
+            filters={"industry": [industry] if industry else [], "stage": [stage] if stage else []},
+            cursor=cursor,
+            limit=limit
+        )
+        return ProfileListResponse(profiles=profiles, next_cursor=next_cursor, has_more=next_cursor is not None)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching startup profiles: {str(e)}")
         raise HTTPException(
@@ -217,29 +347,36 @@ async def list_startup_profiles(
             detail="Failed to fetch startup profiles"
         )
 
-@router.get("/investors", response_model=List[Dict[str, Any]])
+@router.get("/investors", response_model=ProfileListResponse)
 async def list_investor_profiles(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
     focus: Optional[str] = None
 ):
     """
-    List all investor profiles with optional filtering.
+    List investor profiles with optional filtering, newest first.
     
     Args:
-        skip: Number of profiles to skip
+        cursor: `next_cursor` of the previous page
         limit: Maximum number of profiles to return
         focus: Filter by investment focus
         
     Returns:
-        List of investor profiles
+        Page of investor profiles and the cursor of the next page
     """
     try:
         logger.info("Fetching investor profiles list")
         
-        # TODO: Implement database query with filtering
-        return []
+        profiles, next_cursor = await profiles_db.query(
+            INVESTOR,
+            filters={"focus": [focus] if focus else []},
+            cursor=cursor,
+            limit=limit
+        )
+        return ProfileListResponse(profiles=profiles, next_cursor=next_cursor, has_more=next_cursor is not None)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching investor profiles: {str(e)}")
         raise HTTPException(
@@ -248,14 +385,78 @@ async def list_investor_profiles(
         )
 
 # Discovery and Matching Endpoints
+
+def startup_card(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a stored startup profile to the discovery card shape."""
+    return {
+        "id": profile["user_id"],
+        "company_name": profile.get("company_name"),
+        "industry": profile.get("industry"),
+        "stage": profile.get("stage"),
+        "location": profile.get("location"),
+        "description": profile.get("description"),
+        "funding_raised": profile.get("funding_history"),
+        "team_size": profile.get("team_size"),
+        "founded_year": profile.get("founded_year"),
+        "website": profile.get("website"),
+        "logo_url": profile.get("logo_url"),
+        "tags": profile.get("tags", [])
+    }
+
+def investor_card(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a stored investor profile to the discovery card shape."""
+    return {
+        "id": profile["user_id"],
+        "name": profile.get("name"),
+        "company": profile.get("company"),
+        "title": profile.get("title"),
+        "focus_industries": profile.get("investment_focus", []),
+        "investment_stages": profile.get("investment_stage", []),
+        "location": profile.get("location"),
+        "description": profile.get("bio"),
+        "portfolio_size": f"{len(profile.get('portfolio_companies', []))} companies",
+        "avg_investment": profile.get("typical_investment_size"),
+        "website": profile.get("website"),
+        "linkedin": profile.get("linkedin"),
+        "photo_url": profile.get("photo_url")
+    }
+
+async def query_profiles(profile_type: str, filters, location, search, cursor, limit):
+    """
+    Runs a discovery query: newest first, or ranked by relevance when `search` is given.
+    
+    Search hits are checked against the filters in batches until `limit`
+    matches are found; the cursor resumes after the last returned hit.
+    """
+    if not search:
+        return await profiles_db.query(profile_type, filters=filters, location=location, cursor=cursor, limit=limit)
+    
+    await ensure_search_index(profile_type)
+    after = decode_search_cursor(cursor) if cursor else None
+    batch_size = max(limit * 2, 50)
+    matches: List[Dict[str, Any]] = []
+    while True:
+        hits = await search_index.search(profile_type, search, limit=batch_size, after=after)
+        profiles = await profiles_db.get_many(profile_type, [user_id for _, user_id in hits])
+        for hit in hits:
+            profile = profiles.get(hit[1])
+            if profile and profile_matches(profile_type, profile, filters, location):
+                matches.append(profile)
+                if len(matches) == limit:
+                    has_more = hit is not hits[-1] or len(hits) == batch_size
+                    return matches, encode_search_cursor(hit) if has_more else None
+        if len(hits) < batch_size:
+            return matches, None
+        after = hits[-1]
+
 @router.get("/startups/discover")
 async def discover_startups(
     industry: Optional[str] = Query(None, description="Filter by industry"),
     stage: Optional[str] = Query(None, description="Filter by stage"),
-    location: Optional[str] = Query(None, description="Filter by location"),
+    location: Optional[str] = Query(None, description="Filter by location prefix (e.g. city)"),
     search: Optional[str] = Query(None, description="Search term"),
-    limit: int = Query(50, description="Number of results to return"),
-    offset: int = Query(0, description="Number of results to skip")
+    limit: int = Query(50, ge=1, le=200, description="Number of results to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page")
 ):
     """
     Discover startups with optional filtering.
@@ -263,13 +464,13 @@ async def discover_startups(
     Args:
         industry: Filter by industry (e.g., "Technology", "Healthcare")
         stage: Filter by stage (e.g., "Seed", "Series A")
-        location: Filter by location (e.g., "San Francisco", "New York")
-        search: Search term for company name or description
+        location: Filter by location prefix (e.g., "San Francisco", "New York")
+        search: Search terms (prefix-matched) over company name, description and tags
         limit: Maximum number of results to return
-        offset: Number of results to skip for pagination
+        cursor: Keyset cursor for pagination, from the previous page
         
     Returns:
-        List of startup profiles matching the criteria
+        Page of startup profiles matching the criteria, most relevant first when searching, else newest first
     """
     try:
         print(f"🔍 [DISCOVERY] Discovering startups with filters:")
@@ -277,85 +478,29 @@ async def discover_startups(
         print(f"   Stage: {stage}")
         print(f"   Location: {location}")
         print(f"   Search: {search}")
-        print(f"   Limit: {limit}, Offset: {offset}")
-        
-        # Mock data for now - replace with actual database query
-        mock_startups = [
-            {
-                "id": "startup_1",
-                "company_name": "TechCorp AI",
-                "industry": "Technology",
-                "stage": "Series A",
-                "location": "San Francisco, CA",
-                "description": "AI-powered business automation platform",
-                "funding_raised": "$2.5M",
-                "team_size": "15-20",
-                "founded_year": "2022",
-                "website": "https://techcorp.ai",
-                "logo_url": "https://via.placeholder.com/100x100?text=TC",
-                "tags": ["AI", "Automation", "B2B"]
-            },
-            {
-                "id": "startup_2", 
-                "company_name": "HealthTech Solutions",
-                "industry": "Healthcare",
-                "stage": "Seed",
-                "location": "New York, NY",
-                "description": "Digital health monitoring and analytics",
-                "funding_raised": "$500K",
-                "team_size": "5-10",
-                "founded_year": "2023",
-                "website": "https://healthtech.com",
-                "logo_url": "https://via.placeholder.com/100x100?text=HT",
-                "tags": ["Healthcare", "IoT", "Analytics"]
-            },
-            {
-                "id": "startup_3",
-                "company_name": "GreenEnergy Co",
-                "industry": "Clean Energy",
-                "stage": "Series B",
-                "location": "Austin, TX",
-                "description": "Renewable energy storage solutions",
-                "funding_raised": "$10M",
-                "team_size": "25-30",
-                "founded_year": "2021",
-                "website": "https://greenenergy.co",
-                "logo_url": "https://via.placeholder.com/100x100?text=GE",
-                "tags": ["Clean Energy", "Storage", "Sustainability"]
-            }
-        ]
-        
-        # Apply filters
-        filtered_startups = mock_startups
-        
-        if industry:
-            filtered_startups = [s for s in filtered_startups if s["industry"].lower() == industry.lower()]
-        
-        if stage:
-            filtered_startups = [s for s in filtered_startups if s["stage"].lower() == stage.lower()]
-            
-        if location:
-            filtered_startups = [s for s in filtered_startups if location.lower() in s["location"].lower()]
-            
-        if search:
-            search_lower = search.lower()
-            filtered_startups = [s for s in filtered_startups if 
-                               search_lower in s["company_name"].lower() or 
-                               search_lower in s["description"].lower()]
-        
-        # Apply pagination
-        paginated_startups = filtered_startups[offset:offset + limit]
+        print(f"   Limit: {limit}, Cursor: {cursor}")
+        
+        profiles, next_cursor = await query_profiles(
+            STARTUP,
+            {"industry": [industry] if industry else [], "stage": [stage] if stage else []},
+            location,
+            search,
+            cursor,
+            limit
+        )
+        startups = [startup_card(profile) for profile in profiles]
         
-        print(f"✅ [DISCOVERY] Found {len(paginated_startups)} startups (total: {len(filtered_startups)})")
+        print(f"✅ [DISCOVERY] Found {len(startups)} startups")
         
         return {
-            "startups": paginated_startups,
-            "total": len(filtered_startups),
+            "startups": startups,
             "limit": limit,
-            "offset": offset,
-            "has_more": offset + limit < len(filtered_startups)
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"❌ [DISCOVERY] Error discovering startups: {str(e)}")
         logger.error(f"Error discovering startups: {str(e)}")
@@ -368,10 +513,10 @@ async def discover_startups(
 async def discover_investors(
     focus_industries: Optional[List[str]] = Query(None, description="Filter by focus industries"),
     investment_stages: Optional[List[str]] = Query(None, description="Filter by investment stages"),
-    location: Optional[str] = Query(None, description="Filter by location"),
+    location: Optional[str] = Query(None, description="Filter by location prefix (e.g. city)"),
     search: Optional[str] = Query(None, description="Search term"),
-    limit: int = Query(50, description="Number of results to return"),
-    offset: int = Query(0, description="Number of results to skip")
+    limit: int = Query(50, ge=1, le=200, description="Number of results to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page")
 ):
     """
     Discover investors with optional filtering.
@@ -379,13 +524,13 @@ async def discover_investors(
     Args:
         focus_industries: List of industries the investor focuses on
         investment_stages: List of stages the investor invests in
-        location: Filter by location
-        search: Search term for investor name or company
+        location: Filter by location prefix
+        search: Search terms (prefix-matched) over investor name, company, bio and focus
         limit: Maximum number of results to return
-        offset: Number of results to skip for pagination
+        cursor: Keyset cursor for pagination, from the previous page
         
     Returns:
-        List of investor profiles matching the criteria
+        Page of investor profiles matching the criteria, most relevant first when searching, else newest first
     """
     try:
         print(f"🔍 [DISCOVERY] Discovering investors with filters:")
@@ -393,93 +538,29 @@ async def discover_investors(
         print(f"   Stages: {investment_stages}")
         print(f"   Location: {location}")
         print(f"   Search: {search}")
-        print(f"   Limit: {limit}, Offset: {offset}")
-        
-        # Mock data for now - replace with actual database query
-        mock_investors = [
-            {
-                "id": "investor_1",
-                "name": "John Smith",
-                "company": "TechVentures Capital",
-                "title": "Managing Partner",
-                "focus_industries": ["Technology", "AI", "SaaS"],
-                "investment_stages": ["Seed", "Series A"],
-                "location": "San Francisco, CA",
-                "description": "Early-stage tech investor with 10+ years experience",
-                "portfolio_size": "50+ companies",
-                "avg_investment": "$500K - $2M",
-                "website": "https://techventures.com",
-                "linkedin": "https://linkedin.com/in/johnsmith",
-                "photo_url": "https://via.placeholder.com/100x100?text=JS"
-            },
-            {
-                "id": "investor_2",
-                "name": "Sarah Johnson",
-                "company": "HealthFund Partners",
-                "title": "Investment Director",
-                "focus_industries": ["Healthcare", "Biotech", "MedTech"],
-                "investment_stages": ["Series A", "Series B"],
-                "location": "New York, NY",
-                "description": "Healthcare-focused investor with medical background",
-                "portfolio_size": "30+ companies",
-                "avg_investment": "$1M - $5M",
-                "website": "https://healthfund.com",
-                "linkedin": "https://linkedin.com/in/sarahjohnson",
-                "photo_url": "https://via.placeholder.com/100x100?text=SJ"
-            },
-            {
-                "id": "investor_3",
-                "name": "Mike Chen",
-                "company": "GreenVentures",
-                "title": "Founding Partner",
-                "focus_industries": ["Clean Energy", "Sustainability", "Climate Tech"],
-                "investment_stages": ["Seed", "Series A", "Series B"],
-                "location": "Austin, TX",
-                "description": "Climate tech investor focused on sustainable solutions",
-                "portfolio_size": "40+ companies",
-                "avg_investment": "$250K - $3M",
-                "website": "https://greenventures.com",
-                "linkedin": "https://linkedin.com/in/mikechen",
-                "photo_url": "https://via.placeholder.com/100x100?text=MC"
-            }
-        ]
-        
-        # Apply filters
-        filtered_investors = mock_investors
-        
-        if focus_industries:
-            filtered_investors = [i for i in filtered_investors if 
-                                any(industry.lower() in [ind.lower() for ind in i["focus_industries"]] 
-                                    for industry in focus_industries)]
-        
-        if investment_stages:
-            filtered_investors = [i for i in filtered_investors if 
-                                any(stage.lower() in [s.lower() for s in i["investment_stages"]] 
-                                    for stage in investment_stages)]
-            
-        if location:
-            filtered_investors = [i for i in filtered_investors if location.lower() in i["location"].lower()]
-            
-        if search:
-            search_lower = search.lower()
-            filtered_investors = [i for i in filtered_investors if 
-                               search_lower in i["name"].lower() or 
-                               search_lower in i["company"].lower() or
-                               search_lower in i["description"].lower()]
-        
-        # Apply pagination
-        paginated_investors = filtered_investors[offset:offset + limit]
+        print(f"   Limit: {limit}, Cursor: {cursor}")
+        
+        profiles, next_cursor = await query_profiles(
+            INVESTOR,
+            {"focus": focus_industries or [], "stage": investment_stages or []},
+            location,
+            search,
+            cursor,
+            limit
+        )
+        investors = [investor_card(profile) for profile in profiles]
         
-        print(f"✅ [DISCOVERY] Found {len(paginated_investors)} investors (total: {len(filtered_investors)})")
+        print(f"✅ [DISCOVERY] Found {len(investors)} investors")
         
         return {
-            "investors": paginated_investors,
-            "total": len(filtered_investors),
+            "investors": investors,
             "limit": limit,
-            "offset": offset,
-            "has_more": offset + limit < len(filtered_investors)
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"❌ [DISCOVERY] Error discovering investors: {str(e)}")
         logger.error(f"Error discovering investors: {str(e)}")
@@ -487,3 +568,218 @@ async def discover_investors(
             status_code=500,
             detail="Failed to discover investors"
         )
+
+# Matching: embeddings shortlist the candidates, the LLM only explains the shortlist
+
+_explainer_llm = None
+
+async def explain_matches(startup: Dict[str, Any], investors: List[Dict[str, Any]]) -> Optional[str]:
+    """Asks the LLM why the shortlisted investors fit the startup; None if the call fails."""
+    global _explainer_llm
+    try:
+        if _explainer_llm is None:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            _explainer_llm = ChatGoogleGenerativeAI(
+                model="gemini-2.0-flash",
+                temperature=0.3,
+                google_api_key=settings.google_api_key
+            )
+        prompt = INVESTOR_MATCHING_PROMPT.format(
+            startup_profile=json.dumps(startup, indent=2, default=str),
+            investor_profiles=json.dumps(investors, indent=2, default=str)
+        )
+        response = await _explainer_llm.ainvoke(prompt)
+        return response.content if isinstance(response.content, str) else str(response.content)
+    except Exception as e:
+        logger.error(f"Error explaining matches for startup {startup.get('user_id')}: {str(e)}")
+        return None
+
+async def find_matches(profile_type: str, user_id: str, limit: int, precomputed: bool = False) -> List[Dict[str, Any]]:
+    """
+    Returns the top matches on the other side for a stored profile, best first.
+    
+    Args:
+        profile_type: Type of the profile being matched
+        user_id: Profile being matched
+        limit: Maximum number of matches
+        precomputed: Read the lists stored by the last batch scoring run instead of scoring live
+    
+    Raises:
+        KeyError: If the profile does not exist
+    """
+    profile = await profiles_db.get(profile_type, user_id)
+    if profile is None:
+        raise KeyError(user_id)
+    other_type = INVESTOR if profile_type == STARTUP else STARTUP
+    
+    if precomputed:
+        stored = await profiles_db.get_match_list(profile_type, user_id) or []
+        ranked = [(match["user_id"], match["score"]) for match in stored[:limit]]
+    else:
+        await ensure_match_index(other_type)
+        await match_engine.index(profile_type, profile)
+        ranked = match_engine.match(profile_type, user_id, limit=limit)
+    profiles = await profiles_db.get_many(other_type, [match_id for match_id, _ in ranked])
+    return [
+        {"profile": profiles[match_id], "score": round(score, 4)}
+        for match_id, score in ranked
+        if match_id in profiles
+    ]
+
+@router.get("/startup/{user_id}/matches")
+async def match_investors_for_startup(
+    user_id: str,
+    limit: int = Query(10, ge=1, le=100, description="Number of investors to return"),
+    explain: bool = Query(False, description="Have the LLM explain the shortlist"),
+    precomputed: bool = Query(False, description="Use the lists from the last batch scoring run")
+):
+    """
+    Find the investors that best fit a startup.
+    
+    Investors whose investment focus or stages exclude the startup's industry
+    or stage are filtered out; the rest are ranked by embedding similarity.
+    
+    Args:
+        user_id: Startup's Firebase user ID
+        limit: Maximum number of investors to return
+        explain: Whether to add an LLM explanation of the shortlist
+        precomputed: Whether to read the stored batch results instead of scoring live
+        
+    Returns:
+        Ranked investors with similarity scores, and the optional explanation
+    """
+    try:
+        matches = await find_matches(STARTUP, user_id, limit, precomputed)
+        explanation = None
+        if explain and matches:
+            startup = await profiles_db.get(STARTUP, user_id)
+            explanation = await explain_matches(startup, [match["profile"] for match in matches])
+        
+        return {
+            "startup_id": user_id,
+            "investors": [{**investor_card(match["profile"]), "match_score": match["score"]} for match in matches],
+            "explanation": explanation
+        }
+        
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Startup profile not found")
+    except Exception as e:
+        logger.error(f"Error matching investors for startup {user_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to match investors"
+        )
+
+@router.get("/investor/{user_id}/matches")
+async def match_startups_for_investor(
+    user_id: str,
+    limit: int = Query(10, ge=1, le=100, description="Number of startups to return"),
+    explain: bool = Query(False, description="Have the LLM explain each match"),
+    precomputed: bool = Query(False, description="Use the lists from the last batch scoring run")
+):
+    """
+    Find the startups that best fit an investor.
+    
+    Startups outside the investor's investment focus or stages are filtered
+    out; the rest are ranked by embedding similarity.
+    
+    Args:
+        user_id: Investor's Firebase user ID
+        limit: Maximum number of startups to return
+        explain: Whether to add an LLM explanation to each match
+        precomputed: Whether to read the stored batch results instead of scoring live
+        
+    Returns:
+        Ranked startups with similarity scores (and explanations)
+    """
+    try:
+        matches = await find_matches(INVESTOR, user_id, limit, precomputed)
+        startups = [{**startup_card(match["profile"]), "match_score": match["score"]} for match in matches]
+        if explain and matches:
+            investor = await profiles_db.get(INVESTOR, user_id)
+            explanations = await asyncio.gather(*[
+                explain_matches(match["profile"], [investor]) for match in matches
+            ])
+            for startup, explanation in zip(startups, explanations):
+                startup["explanation"] = explanation
+        
+        return {
+            "investor_id": user_id,
+            "startups": startups
+        }
+        
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Investor profile not found")
+    except Exception as e:
+        logger.error(f"Error matching startups for investor {user_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to match startups"
+        )
+
+_scoring_lock = asyncio.Lock()
+
+@router.post("/matches/recompute", response_model=MatchScoringResponse)
+async def recompute_matches(
+    top_k: int = Query(20, ge=1, le=100, description="Matches to keep per profile"),
+    block_size: int = Query(1024, ge=64, le=8192, description="Tile size of the blocked similarity matrix")
+):
+    """
+    Rescore every startup-investor pair and store each profile's top matches.
+    
+    Run after investor criteria change or a cohort of startups is onboarded.
+    Only lists that changed since the last run are written back.
+    
+    Args:
+        top_k: Number of matches kept per profile
+        block_size: Edge of the similarity tiles, which bounds memory use
+        
+    Returns:
+        Counts, duration and throughput of the run
+    """
+    if _scoring_lock.locked():
+        raise HTTPException(status_code=409, detail="Match scoring is already running")
+    
+    async with _scoring_lock:
+        try:
+            await ensure_match_index(STARTUP)
+            await ensure_match_index(INVESTOR)
+            startups, investors = match_engine.snapshot()
+            
+            started = time.perf_counter()
+            startup_lists, investor_lists = await asyncio.to_thread(score_all_pairs, startups, investors, top_k, block_size)
+            seconds = time.perf_counter() - started
+            pairs = len(startups) * len(investors)
+            
+            updated = {}
+            for profile_type, match_lists in ((STARTUP, startup_lists), (INVESTOR, investor_lists)):
+                stored = await profiles_db.get_match_lists(profile_type)
+                changed = {}
+                for user_id, matches in match_lists.items():
+                    match_list = [{"user_id": match_id, "score": round(score, 4)} for match_id, score in matches]
+                    if stored.get(user_id) != match_list:
+                        changed[user_id] = match_list
+                await profiles_db.save_match_lists(profile_type, changed)
+                updated[profile_type] = len(changed)
+            
+            logger.info(
+                f"Scored {pairs} pairs in {seconds:.2f}s ({pairs / seconds if seconds else 0:.0f} pairs/s), "
+                f"updated {updated[STARTUP]} startup and {updated[INVESTOR]} investor match lists"
+            )
+            
+            return MatchScoringResponse(
+                startups=len(startups),
+                investors=len(investors),
+                pairs=pairs,
+                seconds=round(seconds, 3),
+                pairs_per_second=round(pairs / seconds, 1) if seconds else 0.0,
+                updated_startups=updated[STARTUP],
+                updated_investors=updated[INVESTOR]
+            )
+            
+        except Exception as e:
+            logger.error(f"Error recomputing matches: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to recompute matches"
+            )
@@ -8,8 +8,13 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pydantic import BaseModel, Field
 import logging
+import uuid
+
+from config import get_settings
+from utils.meeting_store import create_meeting_request_repository
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter(tags=["simple-meetings"])
 
@@ -35,8 +40,8 @@ class MeetingResponse(BaseModel):
     created_at: str
     meeting_id: str
 
-# In-memory storage (replace with database in production)
-meeting_requests_db = []
+# Meeting requests are stored in DATABASE_URL (memory:// keeps them in process)
+meeting_requests_db = create_meeting_request_repository(settings.database_url)
 
 @router.post("/request", response_model=MeetingResponse)
 async def create_meeting_request(request: MeetingRequest):
@@ -47,7 +52,7 @@ async def create_meeting_request(request: MeetingRequest):
         logger.info(f"Creating meeting request from {request.investor_email} to startup {request.startup_id}")
         
         # Generate meeting ID
-        meeting_id = f"meet-{int(datetime.now().timestamp())}"
+        meeting_id = f"meet-{int(datetime.now().timestamp())}-{uuid.uuid4().hex[:8]}"
         
         # Create meeting request
         meeting_request = {
@@ -63,8 +68,8 @@ async def create_meeting_request(request: MeetingRequest):
             "created_at": datetime.now().isoformat()
         }
         
-        # Store in database (in-memory for now)
-        meeting_requests_db.append(meeting_request)
+        # Store in database
+        await meeting_requests_db.add(meeting_request)
         
         # TODO: Send email notification to startup
         # TODO: Send email notification to investor
@@ -79,18 +84,15 @@ async def create_meeting_request(request: MeetingRequest):
         )
 
 @router.get("/startup/{startup_id}", response_model=List[MeetingResponse])
-async def get_startup_meeting_requests(startup_id: str):
+async def get_startup_meeting_requests(startup_id: str, status: Optional[str] = None):
     """
-    Get all meeting requests for a specific startup
+    Get all meeting requests for a specific startup, optionally only those with the given status
     """
     try:
         logger.info(f"Getting meeting requests for startup {startup_id}")
         
-        # Filter requests for this startup
-        startup_requests = [
-            req for req in meeting_requests_db 
-            if req["startup_id"] == startup_id
-        ]
+        # Served from the by-startup index
+        startup_requests = await meeting_requests_db.list_for_startup(startup_id, status)
         
         return [MeetingResponse(**req) for req in startup_requests]
         
@@ -102,18 +104,15 @@ async def get_startup_meeting_requests(startup_id: str):
         )
 
 @router.get("/investor/{investor_email}", response_model=List[MeetingResponse])
-async def get_investor_meeting_requests(investor_email: str):
+async def get_investor_meeting_requests(investor_email: str, status: Optional[str] = None):
     """
-    Get all meeting requests from a specific investor
+    Get all meeting requests from a specific investor, optionally only those with the given status
     """
     try:
         logger.info(f"Getting meeting requests from investor {investor_email}")
         
-        # Filter requests from this investor
-        investor_requests = [
-            req for req in meeting_requests_db 
-            if req["investor_email"] == investor_email
-        ]
+        # Served from the by-investor index
+        investor_requests = await meeting_requests_db.list_for_investor(investor_email, status)
         
         return [MeetingResponse(**req) for req in investor_requests]
         
@@ -133,11 +132,7 @@ async def accept_meeting_request(meeting_id: str):
         logger.info(f"Accepting meeting request {meeting_id}")
         
         # Find the meeting request
-        meeting_request = None
-        for req in meeting_requests_db:
-            if req["meeting_id"] == meeting_id:
-                meeting_request = req
-                break
+        meeting_request = await meeting_requests_db.get(meeting_id)
         
         if not meeting_request:
             raise HTTPException(
@@ -146,8 +141,10 @@ async def accept_meeting_request(meeting_id: str):
             )
         
         # Update status
-        meeting_request["status"] = "accepted"
-        meeting_request["accepted_at"] = datetime.now().isoformat()
+        await meeting_requests_db.update(meeting_id, {
+            "status": "accepted",
+            "accepted_at": datetime.now().isoformat()
+        })
         
         # TODO: Send email notification to investor
         # TODO: Send email notification to startup
@@ -159,6 +156,8 @@ async def accept_meeting_request(meeting_id: str):
             "message": "Meeting request accepted successfully"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error accepting meeting request: {e}")
         raise HTTPException(
@@ -175,11 +174,7 @@ async def decline_meeting_request(meeting_id: str, reason: Optional[str] = None)
         logger.info(f"Declining meeting request {meeting_id}")
         
         # Find the meeting request
-        meeting_request = None
-        for req in meeting_requests_db:
-            if req["meeting_id"] == meeting_id:
-                meeting_request = req
-                break
+        meeting_request = await meeting_requests_db.get(meeting_id)
         
         if not meeting_request:
             raise HTTPException(
@@ -188,10 +183,13 @@ async def decline_meeting_request(meeting_id: str, reason: Optional[str] = None)
             )
         
         # Update status
-        meeting_request["status"] = "declined"
-        meeting_request["declined_at"] = datetime.now().isoformat()
+        changes = {
+            "status": "declined",
+            "declined_at": datetime.now().isoformat()
+        }
         if reason:
-            meeting_request["decline_reason"] = reason
+            changes["decline_reason"] = reason
+        await meeting_requests_db.update(meeting_id, changes)
         
         # TODO: Send email notification to investor
         # TODO: Send email notification to startup
@@ -204,6 +202,8 @@ async def decline_meeting_request(meeting_id: str, reason: Optional[str] = None)
             "reason": reason
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error declining meeting request: {e}")
         raise HTTPException(
@@ -220,11 +220,7 @@ async def get_meeting_request(meeting_id: str):
         logger.info(f"Getting meeting request {meeting_id}")
         
         # Find the meeting request
-        meeting_request = None
-        for req in meeting_requests_db:
-            if req["meeting_id"] == meeting_id:
-                meeting_request = req
-                break
+        meeting_request = await meeting_requests_db.get(meeting_id)
         
         if not meeting_request:
             raise HTTPException(
@@ -234,6 +230,8 @@ async def get_meeting_request(meeting_id: str):
         
         return MeetingResponse(**meeting_request)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting meeting request: {e}")
         raise HTTPException(
@@ -250,7 +248,7 @@ async def health_check():
         "status": "healthy",
         "service": "simple-meetings",
         "version": "1.0.0",
-        "total_requests": len(meeting_requests_db),
+        "total_requests": await meeting_requests_db.count(),
         "features": [
             "Simple meeting requests",
             "Investor to startup communication",
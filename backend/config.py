@@ -34,6 +34,56 @@ class Settings(BaseSettings):
         default="sqlite:///./investai.db",
         env="DATABASE_URL"
     )
+    database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")
+    database_auto_migrate: bool = Field(default=True, env="DATABASE_AUTO_MIGRATE")
+    
+    # Profile Full-Text Search (sqlite:///path for SQLite FTS5, or memory://)
+    profile_search_url: str = Field(
+        default="sqlite:///./profile_search.db",
+        env="PROFILE_SEARCH_URL"
+    )
+    
+    # Document Ingestion (shared worker pool for page and document analysis calls)
+    ingestion_max_workers: int = Field(default=8, env="INGESTION_MAX_WORKERS")
+    ingestion_max_files: int = Field(default=50, env="INGESTION_MAX_FILES")
+    ingestion_max_archive_mb: int = Field(default=200, env="INGESTION_MAX_ARCHIVE_MB")
+    ingestion_max_upload_mb: int = Field(default=100, env="INGESTION_MAX_UPLOAD_MB")
+    # Document data that concurrent ingestions may hold in memory at once; documents beyond it wait
+    ingestion_memory_budget_mb: int = Field(default=1024, env="INGESTION_MEMORY_BUDGET_MB")
+    # Worker processes rendering PDF pages for the vision model (0 renders in the ingestion threads)
+    ingestion_render_processes: int = Field(default=4, env="INGESTION_RENDER_PROCESSES")
+    # OCR of scanned PDF pages without a text layer (needs Tesseract; skipped when it isn't installed)
+    ingestion_ocr: bool = Field(default=True, env="INGESTION_OCR")
+    ingestion_ocr_language: str = Field(default="eng", env="INGESTION_OCR_LANGUAGE")
+    ingestion_ocr_dpi: int = Field(default=300, env="INGESTION_OCR_DPI")
+    
+    # Investor-Startup Matching ("gemini" embeddings, or "hash" for tests and offline development)
+    matching_embedder: str = Field(default="gemini", env="MATCHING_EMBEDDER")
+    
+    # Interview Session Store (sqlite:///path, redis://host:port/db or memory://)
+    session_store_url: str = Field(
+        default="sqlite:///./interview_sessions.db",
+        env="SESSION_STORE_URL"
+    )
+    artifact_bucket: Optional[str] = Field(None, env="ARTIFACT_BUCKET")
+    
+    # TTS Audio Cache (content-addressed, shared on disk by workers on one node)
+    tts_cache_dir: Optional[str] = Field(default="./tts_cache", env="TTS_CACHE_DIR")
+    tts_cache_memory_mb: int = Field(default=32, env="TTS_CACHE_MEMORY_MB")
+    tts_cache_disk_mb: int = Field(default=512, env="TTS_CACHE_DISK_MB")
+    
+    # Voice (TTS/STT) Call Limits
+    voice_executor_workers: int = Field(default=8, env="VOICE_EXECUTOR_WORKERS")
+    tts_max_concurrency: int = Field(default=8, env="TTS_MAX_CONCURRENCY")
+    stt_max_concurrency: int = Field(default=4, env="STT_MAX_CONCURRENCY")
+    tts_timeout_seconds: float = Field(default=15.0, env="TTS_TIMEOUT_SECONDS")
+    stt_timeout_seconds: float = Field(default=30.0, env="STT_TIMEOUT_SECONDS")
+    
+    # Streaming Speech Recognition ("google", or "fake" for tests and offline development)
+    speech_recognizer: str = Field(default="google", env="SPEECH_RECOGNIZER")
+    stt_stream_timeout_seconds: float = Field(default=300.0, env="STT_STREAM_TIMEOUT_SECONDS")
+    stt_stream_max_concurrency: int = Field(default=4, env="STT_STREAM_MAX_CONCURRENCY")
     
     # Redis Configuration
     redis_url: str = Field(
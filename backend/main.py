@@ -22,6 +22,8 @@ from config import get_settings, validate_api_keys
 from api.routers import ai_interview_session, ai_voice_service, analysis, profiles, meetings, chatbot
 from api.routers.simple_meetings import router as simple_meetings_router
 from utils.exceptions import InvestAIException
+from utils.database import close_database, init_database
+from utils.rasterizer import shutdown_render_pool
 from ping_service import start_ping_service, stop_ping_service
 # ------------------------------------------------------
 
@@ -57,6 +59,8 @@ async def lifespan(app: FastAPI):
         # Allow server to run but with a clear error message.
         # In a production environment, you might want to raise an exception here.
 
+    await init_database()
+
     backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
     if settings.environment != "development":
         await start_ping_service(backend_url)
@@ -66,6 +70,10 @@ async def lifespan(app: FastAPI):
 
     logger.info("🛑 Shutting down InvestAI backend...")
     stop_ping_service()
+    ai_voice_service.voice_executor.shutdown(wait=False, cancel_futures=True)
+    ai_voice_service.stt_stream_executor.shutdown(wait=False, cancel_futures=True)
+    shutdown_render_pool()
+    await close_database()
     logger.info("✅ InvestAI backend shutdown complete")
 
 
@@ -151,7 +159,7 @@ app.include_router(simple_meetings_router, prefix="/api/simple-meetings", tags=[
 # ai_interview_session router has prefix="/api/interviewer" defined internally.
 app.include_router(ai_interview_session.router) 
 
-# ai_voice_service router exposes /voice/generate and /speech/recognize at the root.
+# ai_voice_service router exposes /voice/generate, /voice/stream, /speech/recognize and /speech/stream at the root.
 app.include_router(ai_voice_service.router)
 
 
@@ -186,7 +194,8 @@ async def api_info():
             "chatbot": "/api/chatbot/*",
             "meetings": "/api/meetings/*",
             "interviewer_session": "/api/interviewer/*", # Included for clarity
-            "voice_tts_stt": "/voice/generate | /speech/recognize", # Included for clarity
+            "interviewer_stream": "/api/interviewer/sessions/{session_id}/stream (WebSocket)",
+            "voice_tts_stt": "/voice/generate | /voice/stream | /voice/audio/{key} | /speech/recognize | /speech/stream (ws)", # Included for clarity
             "health": "/health",
             "status": "/api/status",
             "docs": "/docs"
@@ -0,0 +1,50 @@
+"""
+Alembic environment for the InvestAI database.
+
+Migrations run with the synchronous driver for DATABASE_URL. Run them with
+`alembic upgrade head` from the backend directory; the app also applies them
+on startup when DATABASE_AUTO_MIGRATE is enabled.
+"""
+
+import os
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import get_settings
+from utils.database import Base, sync_database_url
+import utils.meeting_store  # noqa: F401 - registers the meeting tables on Base.metadata
+import utils.profile_store  # noqa: F401 - registers the profile tables on Base.metadata
+import utils.page_cache  # noqa: F401 - registers the page analysis and document version tables on Base.metadata
+
+config = context.config
+# Keep the application's logging setup when migrations run on startup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+database_url = sync_database_url(get_settings().database_url)
+
+
+def run_migrations_offline() -> None:
+    context.configure(url=database_url, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = create_engine(database_url, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,63 @@
+"""Create meeting tables
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "meetings",
+        sa.Column("meeting_id", sa.String(64), primary_key=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("requester_id", sa.String(128), nullable=False),
+        sa.Column("recipient_id", sa.String(128), nullable=False),
+        sa.Column("meeting_type", sa.String(32), nullable=False),
+        sa.Column("preferred_time_slots", sa.JSON(), nullable=False),
+        sa.Column("selected_time_slot", sa.JSON(), nullable=True),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.Column("meeting_duration", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_meetings_requester_created", "meetings", ["requester_id", "created_at"])
+    op.create_index("ix_meetings_recipient_created", "meetings", ["recipient_id", "created_at"])
+    op.create_index("ix_meetings_requester_status", "meetings", ["requester_id", "status"])
+    op.create_index("ix_meetings_recipient_status", "meetings", ["recipient_id", "status"])
+    op.create_index("ix_meetings_status_created", "meetings", ["status", "created_at"])
+
+    op.create_table(
+        "meeting_requests",
+        sa.Column("meeting_id", sa.String(64), primary_key=True),
+        sa.Column("investor_name", sa.String(255), nullable=False),
+        sa.Column("investor_email", sa.String(255), nullable=False),
+        sa.Column("startup_id", sa.String(128), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("preferred_date", sa.String(32), nullable=True),
+        sa.Column("preferred_time", sa.String(32), nullable=True),
+        sa.Column("meeting_type", sa.String(32), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("created_at", sa.String(32), nullable=False),
+        sa.Column("accepted_at", sa.String(32), nullable=True),
+        sa.Column("declined_at", sa.String(32), nullable=True),
+        sa.Column("decline_reason", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_meeting_requests_startup_created", "meeting_requests", ["startup_id", "created_at"])
+    op.create_index("ix_meeting_requests_investor_created", "meeting_requests", ["investor_email", "created_at"])
+    op.create_index("ix_meeting_requests_status", "meeting_requests", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("meeting_requests")
+    op.drop_table("meetings")
@@ -0,0 +1,32 @@
+"""Add confirmed slot columns to meetings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.add_column(sa.Column("slot_start", sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column("slot_end", sa.DateTime(), nullable=True))
+    op.create_index("ix_meetings_requester_slot", "meetings", ["requester_id", "slot_end"])
+    op.create_index("ix_meetings_recipient_slot", "meetings", ["recipient_id", "slot_end"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_meetings_recipient_slot", table_name="meetings")
+    op.drop_index("ix_meetings_requester_slot", table_name="meetings")
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.drop_column("slot_end")
+        batch_op.drop_column("slot_start")
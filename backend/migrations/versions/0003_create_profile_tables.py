@@ -0,0 +1,47 @@
+"""Create profile tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "profiles",
+        sa.Column("profile_type", sa.String(16), primary_key=True),
+        sa.Column("user_id", sa.String(128), primary_key=True),
+        sa.Column("location_key", sa.String(255), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_profiles_type_created", "profiles", ["profile_type", "created_at", "user_id"])
+    op.create_index("ix_profiles_type_location", "profiles", ["profile_type", "location_key"])
+
+    op.create_table(
+        "profile_index",
+        sa.Column("profile_type", sa.String(16), primary_key=True),
+        sa.Column("user_id", sa.String(128), primary_key=True),
+        sa.Column("field", sa.String(32), primary_key=True),
+        sa.Column("value", sa.String(128), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_profile_index_lookup", "profile_index", ["profile_type", "field", "value", "created_at", "user_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("profile_index")
+    op.drop_table("profiles")
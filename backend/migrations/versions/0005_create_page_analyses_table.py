@@ -0,0 +1,38 @@
+"""Create page analyses table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "page_analyses",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("startup_id", sa.String(128), nullable=False),
+        sa.Column("document", sa.String(512), nullable=False),
+        sa.Column("page_number", sa.Integer(), nullable=False),
+        sa.Column("text_hash", sa.String(64), nullable=False),
+        sa.Column("phash", sa.String(16), nullable=True),
+        sa.Column("has_text", sa.Integer(), nullable=False),
+        sa.Column("analysis", sa.Text(), nullable=False),
+        sa.Column("analysis_model", sa.String(16), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_page_analyses_startup_text", "page_analyses", ["startup_id", "text_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_page_analyses_startup_text", table_name="page_analyses")
+    op.drop_table("page_analyses")
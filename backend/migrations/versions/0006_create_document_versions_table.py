@@ -0,0 +1,37 @@
+"""Create document versions table
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_versions",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("startup_id", sa.String(128), nullable=False),
+        sa.Column("document_key", sa.String(255), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(512), nullable=False),
+        sa.Column("pages", sa.JSON(), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("startup_id", "document_key", "version", name="uq_document_versions_version"),
+    )
+    op.create_index("ix_document_versions_startup_created", "document_versions", ["startup_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_versions_startup_created", table_name="document_versions")
+    op.drop_table("document_versions")
@@ -0,0 +1,23 @@
+"""Add profile updated_at index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_profiles_type_updated", "profiles", ["profile_type", "updated_at", "user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profiles_type_updated", table_name="profiles")
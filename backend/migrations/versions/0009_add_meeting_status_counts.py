@@ -0,0 +1,58 @@
+"""Add meeting status counters and listing indexes
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "meeting_status_counts",
+        sa.Column("user_id", sa.String(128), primary_key=True),
+        sa.Column("status", sa.String(20), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    # Counters for the meetings stored so far; a meeting with oneself counts once
+    op.execute(
+        """
+        INSERT INTO meeting_status_counts (user_id, status, count)
+        SELECT user_id, status, COUNT(*) FROM (
+            SELECT requester_id AS user_id, status FROM meetings
+            UNION ALL
+            SELECT recipient_id AS user_id, status FROM meetings WHERE recipient_id <> requester_id
+        ) AS participants
+        GROUP BY user_id, status
+        """
+    )
+
+    op.drop_index("ix_meetings_requester_created", table_name="meetings")
+    op.drop_index("ix_meetings_recipient_created", table_name="meetings")
+    op.drop_index("ix_meetings_requester_status", table_name="meetings")
+    op.drop_index("ix_meetings_recipient_status", table_name="meetings")
+    op.create_index("ix_meetings_requester_created", "meetings", ["requester_id", "created_at", "meeting_id"])
+    op.create_index("ix_meetings_recipient_created", "meetings", ["recipient_id", "created_at", "meeting_id"])
+    op.create_index("ix_meetings_requester_status_created", "meetings", ["requester_id", "status", "created_at", "meeting_id"])
+    op.create_index("ix_meetings_recipient_status_created", "meetings", ["recipient_id", "status", "created_at", "meeting_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_meetings_recipient_status_created", table_name="meetings")
+    op.drop_index("ix_meetings_requester_status_created", table_name="meetings")
+    op.drop_index("ix_meetings_recipient_created", table_name="meetings")
+    op.drop_index("ix_meetings_requester_created", table_name="meetings")
+    op.create_index("ix_meetings_requester_created", "meetings", ["requester_id", "created_at"])
+    op.create_index("ix_meetings_recipient_created", "meetings", ["recipient_id", "created_at"])
+    op.create_index("ix_meetings_requester_status", "meetings", ["requester_id", "status"])
+    op.create_index("ix_meetings_recipient_status", "meetings", ["recipient_id", "status"])
+    op.drop_table("meeting_status_counts")
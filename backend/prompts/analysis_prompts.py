@@ -152,8 +152,8 @@ Please provide your analysis in the following JSON format:
 }
 """
 
-def get_analysis_prompt(analysis_type: str) -> str:
-    """Get analysis prompt based on type."""
+def get_analysis_prompt(analysis_type: str, **format_args) -> str:
+    """Get analysis prompt based on type, filled in with `format_args` when given."""
     prompts = {
         "comprehensive": """
         You are a comprehensive startup analyst. Perform a thorough analysis of the provided startup information covering all key business aspects.
@@ -200,10 +200,91 @@ def get_analysis_prompt(analysis_type: str) -> str:
         {text}
         
         Please provide your market opportunity analysis.
+        """,
+        "multimodal": """
+        You are a data extraction specialist reviewing page {page_number} of a startup document. You are given the page's extracted text and, when available, an image of the page.
+        
+        Instructions:
+        1. Transcribe every number, percentage, date and currency amount, with its label and unit
+        2. Read all data points from charts, graphs and tables shown in the image
+        3. Capture names, titles and roles of any people mentioned
+        4. Capture product, market, business model, traction and funding information
+        5. Note the page's headline and what the page is about
+        6. Do not give opinions or recommendations
+        
+        Extracted page text:
+        {page_text}
+        
+        Please provide all extracted information for page {page_number} in structured format.
+        """,
+        "pdf": """
+        You are a data extraction specialist. Extract all key information from the following startup document.
+        
+        Instructions:
+        1. Extract company, product, market, team, traction and funding information
+        2. Transcribe every number, percentage, date and currency amount with its context
+        3. Distinguish historical figures from projections
+        4. Do not give opinions or recommendations
+        
+        Text to analyze:
+        {text}
+        
+        Please provide the extracted information in structured format.
+        """,
+        "email": """
+        You are a data extraction specialist. Extract all key information from the following email thread between a startup and an investor.
+        
+        Instructions:
+        1. Identify senders, recipients and dates
+        2. Extract metrics, financial figures, milestones and commitments with their dates
+        3. Capture open questions, requests and next steps
+        4. Do not give opinions or recommendations
+        
+        Text to analyze:
+        {text}
+        
+        Please provide the extracted information in structured format.
+        """,
+        "call": """
+        You are a data extraction specialist. Extract all key information from the following call transcript between a startup and investors.
+        
+        Instructions:
+        1. Identify participants and their roles
+        2. Extract metrics, financial figures, milestones and plans mentioned
+        3. Capture questions asked, answers given, concerns raised and next steps
+        4. Do not give opinions or recommendations
+        
+        Text to analyze:
+        {text}
+        
+        Please provide the extracted information in structured format.
+        """,
+        "document_update": """
+        You are a data extraction specialist maintaining the data compilation of a {doc_type} document. A revised version of the document was uploaded; only the pages listed below differ from the previous version.
+        
+        Instructions:
+        1. Start from the previous compilation and keep everything that still applies
+        2. Replace figures and statements that the changed pages update, using the new values exactly
+        3. Add all data points from new pages
+        4. Remove data that only appeared on removed pages
+        5. Update slide/page references to the new page numbers
+        6. Do not give opinions or recommendations
+        
+        Previous compilation:
+        {previous_summary}
+        
+        Page changes:
+        {page_changes}
+        
+        Analyses of changed and new pages:
+        {changed_analyses}
+        
+        Please provide the complete updated compilation in the same structure as the previous one.
         """
     }
     
-    return prompts.get(analysis_type, prompts["comprehensive"])
+    prompt = prompts.get(analysis_type, prompts["comprehensive"])
+    return prompt.format(**format_args) if format_args else prompt
 
 def get_comprehensive_analysis_prompt(analysis_types: list) -> str:
     """Get comprehensive analysis prompt for multiple analysis types."""
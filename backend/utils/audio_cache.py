@@ -0,0 +1,189 @@
+"""
+Content-addressed cache for synthesized speech audio.
+
+Audio is keyed by a hash of (text, voice, pitch, speaking rate), kept in a
+byte-bounded in-memory LRU and spilled to a byte-bounded directory on disk,
+which is shared by all workers on the node. The key doubles as a strong
+ETag for HTTP caching.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# A sweep over the disk directory deletes down to this share of its byte budget,
+# so that writes just over the budget don't each trigger one
+DISK_EVICTION_TARGET = 0.9
+
+
+def audio_cache_key(text: str, voice_name: str, pitch: float, speaking_rate: float, audio_format: str = "mp3") -> str:
+    """Returns the content address of the audio for the given synthesis parameters."""
+    material = "\x1f".join([text, voice_name, repr(float(pitch)), repr(float(speaking_rate)), audio_format])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Two-level (memory, disk) LRU cache of audio bytes keyed by content address."""
+
+    def __init__(self, cache_dir: Optional[str], max_memory_bytes: int = 32 * 1024 * 1024, max_disk_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            with self._disk_lock() as lock_file:
+                total = self._read_disk_total(lock_file)
+                if total is None or total > self.max_disk_bytes:
+                    self._write_disk_total(lock_file, self._evict_disk(self.max_disk_bytes))
+
+    # --- Disk directory ---
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _disk_lock(self):
+        """
+        Opens the directory's lock file, holding an exclusive lock until it is closed.
+
+        Every worker on the node writes to the directory, so the lock file also
+        holds the running total of the audio bytes in it, updated with each write.
+        """
+        lock_file = open(os.path.join(self.cache_dir, ".lock"), "a+")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    @staticmethod
+    def _read_disk_total(lock_file) -> Optional[int]:
+        lock_file.seek(0)
+        try:
+            return int(lock_file.read().strip())
+        except ValueError:
+            return None  # new or corrupt lock file; the directory is measured again
+
+    @staticmethod
+    def _write_disk_total(lock_file, total: int) -> None:
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(total))
+        lock_file.flush()
+
+    def _evict_disk(self, limit: int) -> int:
+        """
+        Deletes the least recently used audio files until the directory holds at most `limit` bytes.
+
+        Only runs when the running total goes over the budget (or is unknown),
+        under the directory lock; it measures the files themselves (reads refresh
+        the mtime), which also corrects any drift of the total.
+
+        Returns:
+            Bytes of audio left in the directory
+        """
+        entries = []
+        with os.scandir(self.cache_dir) as directory:
+            for entry in directory:
+                if not entry.name.endswith(".mp3"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        total = sum(size for _, _, size in entries)
+        # Least recently used first
+        for _, path, size in sorted(entries):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+    # --- Memory LRU ---
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get_from_memory(self, key: str) -> Optional[bytes]:
+        """Returns cached audio if it is held in memory, without touching the disk."""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+            return audio
+
+    # --- Public API ---
+
+    def get_sync(self, key: str) -> Optional[bytes]:
+        audio = self.get_from_memory(key)
+        if audio is not None or not self.cache_dir:
+            return audio
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            # Not cached, or another worker evicted it.
+            return None
+        with self._lock:
+            self._remember(key, audio)
+        return audio
+
+    def put_sync(self, key: str, audio: bytes) -> None:
+        with self._lock:
+            self._remember(key, audio)
+        if not self.cache_dir:
+            return
+        # Atomic write so concurrent readers (and other workers) never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            # Only the rename and the total update run under the directory lock
+            with self._disk_lock() as lock_file:
+                try:
+                    replaced = os.stat(self._path(key)).st_size
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp_path, self._path(key))
+                total = self._read_disk_total(lock_file)
+                total = None if total is None else total + len(audio) - replaced
+                if total is None or total > self.max_disk_bytes:
+                    total = self._evict_disk(int(self.max_disk_bytes * DISK_EVICTION_TARGET))
+                self._write_disk_total(lock_file, total)
+        except OSError as e:
+            logger.warning(f"Failed to write audio cache entry {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+
+    async def get(self, key: str) -> Optional[bytes]:
+        audio = self.get_from_memory(key)
+        if audio is not None or not self.cache_dir:
+            return audio
+        return await asyncio.to_thread(self.get_sync, key)
+
+    async def put(self, key: str, audio: bytes) -> None:
+        await asyncio.to_thread(self.put_sync, key, audio)
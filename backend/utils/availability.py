@@ -0,0 +1,131 @@
+"""
+Availability engine for meeting scheduling.
+
+Each user's confirmed meetings form a set of non-overlapping busy intervals
+(overlaps are rejected before a meeting is confirmed). Kept sorted, the only
+interval that can overlap a proposed slot is the first one ending after the
+slot starts, so conflict checks are a single binary search, and free/busy
+queries only touch the intervals inside the requested range.
+"""
+
+import logging
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# (start, end, meeting_id), with naive UTC datetimes
+BusyInterval = Tuple[datetime, datetime, str]
+
+
+def to_utc(value: datetime, tz_name: str = "UTC") -> datetime:
+    """
+    Returns `value` as a naive UTC datetime.
+
+    Naive values are interpreted in `tz_name` (the slot's timezone), so slots
+    given in different timezones compare correctly.
+    """
+    if value.tzinfo is None:
+        try:
+            value = value.replace(tzinfo=ZoneInfo(tz_name or "UTC"))
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning(f"Unknown timezone '{tz_name}', assuming UTC")
+            value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def slot_bounds(slot: Any) -> Tuple[datetime, datetime]:
+    """Returns the (start, end) of a TimeSlot model or dict in naive UTC."""
+    if not isinstance(slot, dict):
+        slot = slot.dict()
+    tz_name = slot.get("timezone") or "UTC"
+    start, end = slot["start_time"], slot["end_time"]
+    if isinstance(start, str):
+        start = datetime.fromisoformat(start)
+    if isinstance(end, str):
+        end = datetime.fromisoformat(end)
+    return to_utc(start, tz_name), to_utc(end, tz_name)
+
+
+class IntervalIndex:
+    """Sorted, non-overlapping busy intervals of one user."""
+
+    def __init__(self):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        self._ids: List[str] = []
+        self._positions: Dict[str, datetime] = {}  # meeting_id -> start
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[BusyInterval]:
+        """Returns the intervals overlapping [start, end), in order."""
+        # Intervals don't overlap, so ends are sorted like starts.
+        i = bisect_right(self._ends, start)
+        result = []
+        while i < len(self._starts) and self._starts[i] < end:
+            result.append((self._starts[i], self._ends[i], self._ids[i]))
+            i += 1
+        return result
+
+    def find_conflict(self, start: datetime, end: datetime, exclude_id: Optional[str] = None) -> Optional[BusyInterval]:
+        """Returns an interval overlapping [start, end), ignoring `exclude_id`, or None."""
+        i = bisect_right(self._ends, start)
+        while i < len(self._starts) and self._starts[i] < end:
+            if self._ids[i] != exclude_id:
+                return (self._starts[i], self._ends[i], self._ids[i])
+            i += 1
+        return None
+
+    def add(self, start: datetime, end: datetime, meeting_id: str) -> None:
+        if meeting_id in self._positions:
+            self.remove(meeting_id)
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._ids.insert(i, meeting_id)
+        self._positions[meeting_id] = start
+
+    def remove(self, meeting_id: str) -> None:
+        start = self._positions.pop(meeting_id, None)
+        if start is None:
+            return
+        i = bisect_right(self._starts, start) - 1
+        while i >= 0 and self._ids[i] != meeting_id:
+            i -= 1
+        if i >= 0:
+            del self._starts[i], self._ends[i], self._ids[i]
+
+
+def free_intervals(
+    busy: List[BusyInterval],
+    range_start: datetime,
+    range_end: datetime,
+    min_duration: timedelta = timedelta(0),
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Returns the gaps between sorted busy intervals within [range_start, range_end).
+
+    Args:
+        busy: Busy intervals overlapping the range, sorted by start
+        range_start: Start of the queried range
+        range_end: End of the queried range
+        min_duration: Shortest gap worth returning
+
+    Returns:
+        List of (start, end) free intervals
+    """
+    free = []
+    cursor = range_start
+    for start, end, _ in busy:
+        if start > cursor and start - cursor >= min_duration:
+            free.append((cursor, start))
+        cursor = max(cursor, end)
+        if cursor >= range_end:
+            break
+    if cursor < range_end and range_end - cursor >= min_duration:
+        free.append((cursor, range_end))
+    return free
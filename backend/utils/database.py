@@ -0,0 +1,120 @@
+"""
+SQL database access for InvestAI platform.
+
+Provides the shared SQLAlchemy async engine (with connection pooling), the
+session factory, the declarative base for ORM models, and schema migrations
+through Alembic.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ALEMBIC_INI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# Async and sync (migration) drivers for each supported database
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+_SYNC_DRIVERS = {
+    "sqlite": "sqlite",
+    "postgresql": "postgresql+psycopg2",
+    "postgres": "postgresql+psycopg2",
+}
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all ORM models."""
+
+
+def _with_driver(database_url: str, drivers: dict) -> str:
+    scheme, separator, rest = database_url.partition("://")
+    if not separator:
+        raise ValueError(f"Invalid database URL: {database_url}")
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in drivers:
+        raise ValueError(f"Unsupported database: {dialect}")
+    return f"{drivers[dialect]}://{rest}"
+
+
+def async_database_url(database_url: str) -> str:
+    """Returns `database_url` with the async driver for its dialect."""
+    return _with_driver(database_url, _ASYNC_DRIVERS)
+
+
+def sync_database_url(database_url: str) -> str:
+    """Returns `database_url` with the synchronous driver used for migrations."""
+    return _with_driver(database_url, _SYNC_DRIVERS)
+
+
+# --- Engine and Sessions ---
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def get_engine() -> AsyncEngine:
+    """Returns the process-wide async engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        url = async_database_url(settings.database_url)
+        if url.startswith("sqlite"):
+            # SQLite serializes writers anyway; a pool only adds lock contention.
+            _engine = create_async_engine(url, connect_args={"timeout": 30})
+        else:
+            _engine = create_async_engine(
+                url,
+                pool_size=settings.database_pool_size,
+                max_overflow=settings.database_max_overflow,
+                pool_pre_ping=True,
+                pool_recycle=1800,
+            )
+    return _engine
+
+
+def get_sessionmaker() -> async_sessionmaker:
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(get_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _sessionmaker
+
+
+def run_migrations() -> None:
+    """Upgrades the database schema to the latest Alembic revision (blocking call)."""
+    from alembic import command
+    from alembic.config import Config
+
+    alembic_config = Config(ALEMBIC_INI_PATH)
+    alembic_config.attributes["configure_logger"] = False
+    command.upgrade(alembic_config, "head")
+
+
+async def init_database() -> None:
+    """Applies pending migrations when `database_auto_migrate` is enabled."""
+    if not settings.database_auto_migrate or settings.database_url.startswith("memory://"):
+        return
+    try:
+        await asyncio.to_thread(run_migrations)
+        logger.info("Database schema is up to date.")
+    except Exception as e:
+        # Another worker may be migrating the same database concurrently.
+        logger.error(f"Database migration failed: {e}", exc_info=True)
+
+
+async def close_database() -> None:
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _sessionmaker = None
@@ -0,0 +1,446 @@
+"""
+Embedding-based matching between startups and investors.
+
+Each profile is embedded once (and again only when its text changes) into a
+unit vector held in a per-type matrix. Vectors are also saved with the
+profiles, keyed by a fingerprint of the embedder and text, so other workers
+and restarted processes load them instead of embedding the profile again. Matching a profile against the other
+side is one matrix-vector product for cosine similarity, with the hard
+filters (industry vs. investment focus, stage vs. investment stages) applied
+as boolean masks over the same rows, then a partial sort for the top N. The
+LLM is only asked to explain the resulting shortlist.
+
+For portfolio-wide recomputation, `score_all_pairs` scores every
+startup-investor pair in fixed-size blocks, so memory stays bounded by the
+block size rather than the product of the two populations.
+
+Embedders:
+    gemini   Gemini embeddings (default)
+    hash     Hashed bag-of-words vectors, for tests and offline development
+"""
+
+import abc
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.profile_search import tokenize
+from utils.profile_store import INVESTOR, STARTUP, index_values
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_ID = "models/gemini-embedding-001"
+
+# (startup field, investor field) pairs that must agree for a match;
+# an investor without values for a field accepts any startup
+FILTER_PAIRS: Tuple[Tuple[str, str], ...] = (("industry", "focus"), ("stage", "stage"))
+
+# (user_id, cosine similarity)
+Match = Tuple[str, float]
+
+
+def profile_text(profile_type: str, profile: Dict[str, Any]) -> str:
+    """Returns the text a profile is embedded from."""
+    if profile_type == STARTUP:
+        fields = ("company_name", "industry", "stage", "description", "value_proposition",
+                  "target_market", "business_model", "competitive_advantage", "tags")
+    else:
+        fields = ("company", "investment_focus", "investment_stage", "investment_criteria",
+                  "bio", "portfolio_companies", "typical_investment_size")
+    lines = []
+    for field in fields:
+        value = profile.get(field)
+        if isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        if value:
+            lines.append(f"{field.replace('_', ' ')}: {value}")
+    return "\n".join(lines)
+
+
+# --- Embedders ---
+
+class Embedder(abc.ABC):
+    """Base class for text embedders."""
+
+    # Identifies the model (and dimensions); part of the fingerprint of stored vectors
+    name = ""
+
+    @abc.abstractmethod
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Returns one row per text, L2-normalized."""
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class GeminiEmbedder(Embedder):
+    """Gemini embeddings, requested in batches off the event loop."""
+
+    name = EMBEDDING_MODEL_ID
+
+    def __init__(self, batch_size: int = 100):
+        self.batch_size = batch_size
+        self._model = None
+
+    def _embed_sync(self, texts: List[str]) -> List[List[float]]:
+        if self._model is None:
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+            from config import get_settings
+
+            self._model = GoogleGenerativeAIEmbeddings(
+                model=EMBEDDING_MODEL_ID,
+                task_type="SEMANTIC_SIMILARITY",
+                google_api_key=get_settings().google_api_key
+            )
+        return self._model.embed_documents(texts)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(await asyncio.to_thread(self._embed_sync, texts[start:start + self.batch_size]))
+        return _normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+
+class HashingEmbedder(Embedder):
+    """Signed feature hashing of word unigrams and bigrams (no model calls)."""
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+        self.name = f"hash-{dimensions}"
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        tokens = tokenize(text)
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.dimensions] += 1.0 if (digest >> 63) & 1 else -1.0
+        return vector
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return _normalize_rows(np.stack([self._embed_one(text) for text in texts]))
+
+
+def create_embedder(name: str) -> Embedder:
+    if name == "gemini":
+        return GeminiEmbedder()
+    if name == "hash":
+        return HashingEmbedder()
+    raise ValueError(f"Unsupported matching embedder: {name}")
+
+
+# --- Vector Index ---
+
+class ProfileVectors:
+    """Embeddings and filter masks for the profiles of one type, one row per profile."""
+
+    def __init__(self):
+        self.vectors: Optional[np.ndarray] = None
+        self.user_ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.values: Dict[str, Dict[str, List[str]]] = {}  # user_id -> filter field -> values
+        self.fingerprints: Dict[str, str] = {}
+        self._active = np.zeros(0, dtype=bool)
+        self._masks: Dict[Tuple[str, str], np.ndarray] = {}  # (field, value) -> rows having it
+        self._has_field: Dict[str, np.ndarray] = {}  # field -> rows with any value
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def _grow(self, dimensions: int) -> None:
+        capacity = 0 if self.vectors is None else self.vectors.shape[0]
+        if len(self.user_ids) < capacity:
+            return
+        new_capacity = max(64, capacity * 2)
+
+        def grown(array: np.ndarray) -> np.ndarray:
+            result = np.zeros((new_capacity,) + array.shape[1:], dtype=array.dtype)
+            result[:capacity] = array
+            return result
+
+        self.vectors = grown(self.vectors if self.vectors is not None else np.zeros((0, dimensions), dtype=np.float32))
+        self._active = grown(self._active)
+        self._masks = {key: grown(mask) for key, mask in self._masks.items()}
+        self._has_field = {key: grown(mask) for key, mask in self._has_field.items()}
+
+    def _mask(self, store: Dict, key) -> np.ndarray:
+        if key not in store:
+            store[key] = np.zeros(self.vectors.shape[0], dtype=bool)
+        return store[key]
+
+    def set(self, user_id: str, vector: np.ndarray, values: Dict[str, List[str]], fingerprint: str) -> None:
+        row = self.rows.get(user_id)
+        if row is None:
+            self._grow(vector.shape[0])
+            row = len(self.user_ids)
+            self.user_ids.append(user_id)
+            self.rows[user_id] = row
+        else:
+            for field, old_values in self.values[user_id].items():
+                for value in old_values:
+                    self._masks[(field, value)][row] = False
+                self._has_field[field][row] = False
+        self.vectors[row] = vector
+        self._active[row] = True
+        for field, field_values in values.items():
+            for value in field_values:
+                self._mask(self._masks, (field, value))[row] = True
+            self._mask(self._has_field, field)[row] = bool(field_values)
+        self.values[user_id] = values
+        self.fingerprints[user_id] = fingerprint
+
+    def rows_with_any(self, field: str, values: List[str]) -> np.ndarray:
+        """Returns the rows holding at least one of `values` in `field`."""
+        mask = np.zeros(len(self), dtype=bool)
+        for value in values:
+            if (field, value) in self._masks:
+                mask |= self._masks[(field, value)][:len(self)]
+        return mask
+
+    def rows_without(self, field: str) -> np.ndarray:
+        if field not in self._has_field:
+            return np.ones(len(self), dtype=bool)
+        return ~self._has_field[field][:len(self)]
+
+    def active(self) -> np.ndarray:
+        return self._active[:len(self)]
+
+    def vector(self, user_id: str) -> np.ndarray:
+        return self.vectors[self.rows[user_id]]
+
+    def snapshot(self) -> "VectorSnapshot":
+        """Returns the current rows for scoring off the event loop; later updates don't affect it."""
+        user_ids = list(self.user_ids)
+        vectors = self.vectors[:len(user_ids)].copy() if user_ids else np.zeros((0, 0), dtype=np.float32)
+        return VectorSnapshot(user_ids, vectors, [self.values[user_id] for user_id in user_ids])
+
+
+class VectorSnapshot:
+    """Immutable copy of the rows of a `ProfileVectors`."""
+
+    def __init__(self, user_ids: List[str], vectors: np.ndarray, values: List[Dict[str, List[str]]]):
+        self.user_ids = user_ids
+        self.vectors = vectors
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def membership(self, field: str, vocabulary: Dict[str, int]) -> np.ndarray:
+        """Returns a rows x vocabulary 0/1 matrix of the values each row has in `field`."""
+        matrix = np.zeros((len(self), len(vocabulary)), dtype=np.float32)
+        for row, values in enumerate(self.values):
+            for value in values.get(field, []):
+                matrix[row, vocabulary[value]] = 1.0
+        return matrix
+
+
+class MatchingEngine:
+    """
+    Keeps startup and investor embeddings and ranks one side against the other.
+
+    With a `store` (the profile repository), vectors are loaded from and saved
+    to it, so a profile is only embedded once across all workers and restarts.
+    """
+
+    def __init__(self, embedder: Embedder, store=None):
+        self.embedder = embedder
+        self.store = store
+        self.sides = {STARTUP: ProfileVectors(), INVESTOR: ProfileVectors()}
+        # profile_type -> `updated_at` up to which stored profiles have been indexed
+        self.synced_until: Dict[str, datetime] = {}
+
+    def count(self, profile_type: str) -> int:
+        return len(self.sides[profile_type])
+
+    def fingerprint(self, text: str) -> str:
+        return hashlib.sha256(f"{self.embedder.name}\n{text}".encode("utf-8")).hexdigest()
+
+    async def index_many(self, profile_type: str, profiles: List[Dict[str, Any]]) -> int:
+        """
+        Indexes new or changed profiles (each a stored profile with `user_id`).
+
+        Vectors saved for the same text are reused; the remaining profiles are
+        embedded in one batch and their vectors saved.
+
+        Returns:
+            Number of profiles (re)indexed
+        """
+        side = self.sides[profile_type]
+        pending = []
+        for profile in profiles:
+            text = profile_text(profile_type, profile)
+            fingerprint = self.fingerprint(text)
+            values = index_values(profile_type, profile)
+            if side.fingerprints.get(profile["user_id"]) == fingerprint and side.values.get(profile["user_id"]) == values:
+                continue
+            pending.append((profile["user_id"], text, fingerprint, values))
+        if not pending:
+            return 0
+
+        stored = await self.store.get_embeddings(profile_type, [user_id for user_id, _, _, _ in pending]) if self.store else {}
+        to_embed = []
+        for user_id, text, fingerprint, values in pending:
+            saved = stored.get(user_id)
+            if saved is not None and saved[0] == fingerprint:
+                side.set(user_id, np.frombuffer(saved[1], dtype=np.float32), values, fingerprint)
+            else:
+                to_embed.append((user_id, text, fingerprint, values))
+        if to_embed:
+            vectors = await self.embedder.embed([text for _, text, _, _ in to_embed])
+            for (user_id, _, fingerprint, values), vector in zip(to_embed, vectors):
+                side.set(user_id, vector, values, fingerprint)
+            if self.store:
+                await self.store.save_embeddings(profile_type, {
+                    user_id: (fingerprint, np.asarray(vector, dtype=np.float32).tobytes())
+                    for (user_id, _, fingerprint, _), vector in zip(to_embed, vectors)
+                })
+        return len(pending)
+
+    async def index(self, profile_type: str, profile: Dict[str, Any]) -> None:
+        await self.index_many(profile_type, [profile])
+
+    def _candidates(self, profile_type: str, user_id: str) -> np.ndarray:
+        """Hard filters: rows of the other side compatible with `user_id` on industry and stage."""
+        own = self.sides[profile_type].values[user_id]
+        if profile_type == STARTUP:
+            other = self.sides[INVESTOR]
+            mask = other.active().copy()
+            for startup_field, investor_field in FILTER_PAIRS:
+                if own.get(startup_field):
+                    mask &= other.rows_with_any(investor_field, own[startup_field]) | other.rows_without(investor_field)
+        else:
+            other = self.sides[STARTUP]
+            mask = other.active().copy()
+            for startup_field, investor_field in FILTER_PAIRS:
+                if own.get(investor_field):
+                    mask &= other.rows_with_any(startup_field, own[investor_field])
+        return mask
+
+    def match(self, profile_type: str, user_id: str, limit: int = 10) -> List[Match]:
+        """
+        Returns the best matches on the other side for an indexed profile.
+
+        Args:
+            profile_type: Type of the profile being matched
+            user_id: Profile being matched
+            limit: Number of matches to return
+
+        Returns:
+            List of (user_id, cosine similarity), best first
+
+        Raises:
+            KeyError: If the profile is not indexed
+        """
+        side = self.sides[profile_type]
+        if user_id not in side.rows:
+            raise KeyError(user_id)
+        other = self.sides[INVESTOR if profile_type == STARTUP else STARTUP]
+        if not len(other):
+            return []
+        rows = np.flatnonzero(self._candidates(profile_type, user_id))
+        count = min(limit, len(rows))
+        if count <= 0:
+            return []
+        # Vectors are unit length, so dot products are cosine similarities
+        scores = other.vectors[rows] @ side.vector(user_id)
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(other.user_ids[rows[i]], float(scores[i])) for i in top]
+
+    def snapshot(self) -> Tuple[VectorSnapshot, VectorSnapshot]:
+        """Returns (startups, investors) snapshots for `score_all_pairs`."""
+        return self.sides[STARTUP].snapshot(), self.sides[INVESTOR].snapshot()
+
+
+# --- Batch Scoring ---
+
+def _merge_top(best: Tuple[np.ndarray, np.ndarray], start: int, stop: int, scores: np.ndarray, offset: int, top_k: int) -> None:
+    """Merges a tile of scores (rows start..stop, columns from offset) into the running top-k, in place."""
+    best_scores, best_columns = best
+    columns = np.broadcast_to(np.arange(offset, offset + scores.shape[1]), scores.shape)
+    scores = np.concatenate([best_scores[start:stop], scores], axis=1)
+    columns = np.concatenate([best_columns[start:stop], columns], axis=1)
+    keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    best_scores[start:stop] = np.take_along_axis(scores, keep, axis=1)
+    best_columns[start:stop] = np.take_along_axis(columns, keep, axis=1)
+
+
+def _top_lists(user_ids: List[str], other_ids: List[str], scores: np.ndarray, columns: np.ndarray) -> Dict[str, List[Match]]:
+    order = np.argsort(-scores, axis=1, kind="stable")
+    scores, columns = np.take_along_axis(scores, order, axis=1), np.take_along_axis(columns, order, axis=1)
+    return {
+        user_id: [(other_ids[column], float(score)) for score, column in zip(scores[row], columns[row]) if score > -np.inf]
+        for row, user_id in enumerate(user_ids)
+    }
+
+
+def score_all_pairs(
+    startups: VectorSnapshot,
+    investors: VectorSnapshot,
+    top_k: int = 20,
+    block_size: int = 1024,
+) -> Tuple[Dict[str, List[Match]], Dict[str, List[Match]]]:
+    """
+    Computes the top-k matches of every startup and every investor (blocking; run in a thread).
+
+    The similarity matrix is computed one block_size x block_size tile at a
+    time; filters are applied to each tile as matrix products of the
+    startups' and investors' value memberships, with the same rules as
+    `MatchingEngine.match`. Only the running top-k of each row is kept.
+
+    Args:
+        startups: Startup vectors
+        investors: Investor vectors
+        top_k: Matches to keep per profile
+        block_size: Tile edge; peak memory is about 4 * block_size^2 floats
+
+    Returns:
+        (startup_id -> investor matches, investor_id -> startup matches), best first
+    """
+    startup_count, investor_count = len(startups), len(investors)
+    startup_best = (np.full((startup_count, top_k), -np.inf, dtype=np.float32), np.zeros((startup_count, top_k), dtype=np.int64))
+    investor_best = (np.full((investor_count, top_k), -np.inf, dtype=np.float32), np.zeros((investor_count, top_k), dtype=np.int64))
+    if not startup_count or not investor_count:
+        return _top_lists(startups.user_ids, investors.user_ids, *startup_best), _top_lists(investors.user_ids, startups.user_ids, *investor_best)
+
+    filters = []
+    for startup_field, investor_field in FILTER_PAIRS:
+        vocabulary: Dict[str, int] = {}
+        for snapshot, field in ((startups, startup_field), (investors, investor_field)):
+            for values in snapshot.values:
+                for value in values.get(field, []):
+                    vocabulary.setdefault(value, len(vocabulary))
+        startup_members = startups.membership(startup_field, vocabulary)
+        investor_members = investors.membership(investor_field, vocabulary)
+        filters.append((startup_members, investor_members, ~startup_members.any(axis=1), ~investor_members.any(axis=1)))
+
+    for s0 in range(0, startup_count, block_size):
+        s1 = min(s0 + block_size, startup_count)
+        for i0 in range(0, investor_count, block_size):
+            i1 = min(i0 + block_size, investor_count)
+            scores = startups.vectors[s0:s1] @ investors.vectors[i0:i1].T
+            startup_ok = np.ones(scores.shape, dtype=bool)
+            investor_ok = np.ones(scores.shape, dtype=bool)
+            for startup_members, investor_members, startup_none, investor_none in filters:
+                # Investors without values for a field accept any startup
+                shared = (startup_members[s0:s1] @ investor_members[i0:i1].T) > 0
+                shared |= investor_none[None, i0:i1]
+                investor_ok &= shared
+                # A startup without a value isn't filtered when it looks for investors
+                startup_ok &= shared | startup_none[s0:s1, None]
+            _merge_top(startup_best, s0, s1, np.where(startup_ok, scores, -np.inf), i0, top_k)
+            _merge_top(investor_best, i0, i1, np.where(investor_ok, scores, -np.inf).T, s0, top_k)
+
+    return (
+        _top_lists(startups.user_ids, investors.user_ids, *startup_best),
+        _top_lists(investors.user_ids, startups.user_ids, *investor_best),
+    )
@@ -0,0 +1,699 @@
+"""
+Storage for meetings and simple meeting requests.
+
+Two backends share one async interface: SQL tables (through the shared
+SQLAlchemy engine, with indexes on the lookup columns) so data survives
+restarts and is shared by workers, and in-memory stores for development
+(`DATABASE_URL=memory://`). Both meeting stores keep secondary indexes by
+requester, recipient and status (each ordered by `created_at`) and per-user
+status counters, maintained in the same write as the meeting, so per-user
+listings and stats cost proportional to the page size rather than the total
+number of meetings. Listings are paged with keyset cursors over
+(created_at, meeting_id), newest first.
+"""
+
+import base64
+import heapq
+import json
+import logging
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, func, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.availability import BusyInterval, IntervalIndex, slot_bounds
+from utils.database import Base, get_sessionmaker
+from utils.exceptions import ConflictError
+
+logger = logging.getLogger(__name__)
+
+# Index entries sort by creation time; the id breaks ties.
+IndexEntry = Tuple[Any, str]
+
+
+# Meetings in these statuses occupy their selected time slot on both calendars
+BUSY_STATUSES = ("confirmed",)
+
+# Attempts to apply a status change when concurrent updates keep changing the meeting's status first
+STATUS_UPDATE_ATTEMPTS = 3
+
+
+def _status_key(status: Any) -> str:
+    """Normalizes enum and plain string statuses to the same index key."""
+    return getattr(status, "value", status)
+
+
+def busy_slot(meeting: Dict[str, Any]) -> Optional[Tuple[datetime, datetime]]:
+    """Returns the (start, end) a meeting blocks in naive UTC, or None if it blocks no time."""
+    if _status_key(meeting.get("status")) not in BUSY_STATUSES or not meeting.get("selected_time_slot"):
+        return None
+    return slot_bounds(meeting["selected_time_slot"])
+
+
+def encode_meeting_cursor(key: IndexEntry) -> str:
+    return base64.urlsafe_b64encode(json.dumps([key[0].isoformat(), key[1]]).encode("utf-8")).decode("ascii")
+
+
+def decode_meeting_cursor(cursor: str) -> IndexEntry:
+    """
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        created_at, meeting_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(meeting_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _newest_before(entries: List[IndexEntry], after: Optional[IndexEntry]):
+    """Iterates index entries newest first, starting below `after` (all of them if None)."""
+    position = bisect_left(entries, after) if after else len(entries)
+    return (entries[i] for i in range(position - 1, -1, -1))
+
+
+def slot_conflict_error(user_id: str, slot: Tuple[datetime, datetime], conflict: BusyInterval) -> ConflictError:
+    """The error raised when a meeting would block time already taken by another confirmed meeting."""
+    start, end = slot
+    return ConflictError(
+        f"Time slot {start.isoformat()} - {end.isoformat()} UTC conflicts with confirmed meeting {conflict[2]} of {user_id}",
+        resource="meeting",
+        details={"user_id": user_id, "conflicting_meeting_id": conflict[2]},
+    )
+
+
+class MeetingRepository:
+    """
+    In-memory meeting store with secondary indexes.
+
+    Records are plain dicts with at least `meeting_id`, `requester_id`,
+    `recipient_id`, `status` and `created_at`.
+    """
+
+    def __init__(self):
+        self._meetings: Dict[str, Dict[str, Any]] = {}
+        self._by_requester: Dict[str, List[IndexEntry]] = defaultdict(list)
+        self._by_recipient: Dict[str, List[IndexEntry]] = defaultdict(list)
+        self._by_status: Dict[str, List[IndexEntry]] = defaultdict(list)
+        # (user_id, status) -> meetings the user takes part in, for filtered listings
+        self._by_user_status: Dict[Tuple[str, str], List[IndexEntry]] = defaultdict(list)
+        self._status_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # user_id -> confirmed meeting slots, for conflict checks and free/busy queries
+        self._busy: Dict[str, IntervalIndex] = defaultdict(IntervalIndex)
+
+    # --- Index maintenance ---
+
+    @staticmethod
+    def _participants(meeting: Dict[str, Any]) -> List[str]:
+        # A meeting with oneself is only counted (and listed) once.
+        if meeting["requester_id"] == meeting["recipient_id"]:
+            return [meeting["requester_id"]]
+        return [meeting["requester_id"], meeting["recipient_id"]]
+
+    @staticmethod
+    def _remove_entry(index: Dict[Any, List[IndexEntry]], key: Any, entry: IndexEntry) -> None:
+        entries = index.get(key)
+        if not entries:
+            return
+        position = bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+        if not entries:
+            del index[key]
+
+    def _index_status(self, meeting: Dict[str, Any]) -> None:
+        entry = (meeting["created_at"], meeting["meeting_id"])
+        status = _status_key(meeting["status"])
+        insort(self._by_status[status], entry)
+        for user_id in self._participants(meeting):
+            insort(self._by_user_status[(user_id, status)], entry)
+            self._status_counts[user_id][status] += 1
+
+    def _unindex_status(self, meeting: Dict[str, Any]) -> None:
+        entry = (meeting["created_at"], meeting["meeting_id"])
+        status = _status_key(meeting["status"])
+        self._remove_entry(self._by_status, status, entry)
+        for user_id in self._participants(meeting):
+            self._remove_entry(self._by_user_status, (user_id, status), entry)
+            self._status_counts[user_id][status] -= 1
+
+    def _index_busy(self, meeting: Dict[str, Any]) -> None:
+        slot = busy_slot(meeting)
+        if slot is None:
+            return
+        for user_id in self._participants(meeting):
+            self._busy[user_id].add(slot[0], slot[1], meeting["meeting_id"])
+
+    def _unindex_busy(self, meeting: Dict[str, Any]) -> None:
+        for user_id in self._participants(meeting):
+            if user_id in self._busy:
+                self._busy[user_id].remove(meeting["meeting_id"])
+
+    # --- Public API ---
+
+    async def count(self) -> int:
+        return len(self._meetings)
+
+    async def add(self, meeting: Dict[str, Any]) -> None:
+        """Stores a new meeting and indexes it."""
+        meeting_id = meeting["meeting_id"]
+        if meeting_id in self._meetings:
+            raise KeyError(f"Meeting {meeting_id} already exists")
+        self._meetings[meeting_id] = meeting
+        entry = (meeting["created_at"], meeting_id)
+        insort(self._by_requester[meeting["requester_id"]], entry)
+        if meeting["recipient_id"] != meeting["requester_id"]:
+            insort(self._by_recipient[meeting["recipient_id"]], entry)
+        self._index_status(meeting)
+        self._index_busy(meeting)
+
+    async def get(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        return self._meetings.get(meeting_id)
+
+    async def update(self, meeting_id: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Applies `changes` to a stored meeting, re-indexing it if its status changes.
+
+        The conflict check and the write run without yielding to the event loop,
+        so two confirmations can't both claim the same time.
+
+        Raises:
+            KeyError: If the meeting does not exist.
+            ConflictError: If the meeting would block time that overlaps another
+                confirmed meeting of a participant.
+        """
+        meeting = self._meetings[meeting_id]
+        slot = busy_slot({**meeting, **changes})
+        if slot is not None:
+            for user_id in self._participants(meeting):
+                conflict = self._busy[user_id].find_conflict(slot[0], slot[1], meeting_id) if user_id in self._busy else None
+                if conflict:
+                    raise slot_conflict_error(user_id, slot, conflict)
+        status_changed = "status" in changes and _status_key(changes["status"]) != _status_key(meeting["status"])
+        if status_changed:
+            self._unindex_status(meeting)
+        self._unindex_busy(meeting)
+        meeting.update(changes)
+        if status_changed:
+            self._index_status(meeting)
+        self._index_busy(meeting)
+        return meeting
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        status: Optional[Any] = None,
+        offset: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        """
+        Returns a page of the user's meetings (as requester or recipient), newest first.
+
+        Args:
+            user_id: User identifier
+            status: Only return meetings with this status (optional)
+            offset: Number of meetings to skip (after the cursor, if any)
+            limit: Maximum number of meetings to return
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            The page of meetings, the total number of matching meetings and
+            the cursor of the next page (None on the last page)
+        """
+        after = decode_meeting_cursor(cursor) if cursor else None
+        if status is not None:
+            entries = self._by_user_status.get((user_id, _status_key(status)), [])
+            newest_first = _newest_before(entries, after)
+            total = len(entries)
+        else:
+            newest_first = heapq.merge(
+                _newest_before(self._by_requester.get(user_id, []), after),
+                _newest_before(self._by_recipient.get(user_id, []), after),
+                reverse=True,
+            )
+            total = sum(self._status_counts.get(user_id, {}).values())
+        page = list(islice(newest_first, offset, offset + limit + 1))
+        next_cursor = encode_meeting_cursor(page[limit - 1]) if len(page) > limit else None
+        return [self._meetings[meeting_id] for _, meeting_id in page[:limit]], total, next_cursor
+
+    async def status_counts(self, user_id: str) -> Dict[str, int]:
+        """Returns the number of the user's meetings in each status."""
+        return {status: count for status, count in self._status_counts.get(user_id, {}).items() if count}
+
+    async def list_by_status(self, status: Any, offset: int = 0, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """Returns a page of all meetings with the given status, newest first, and their total."""
+        entries = self._by_status.get(_status_key(status), [])
+        page = islice(reversed(entries), offset, offset + limit)
+        return [self._meetings[meeting_id] for _, meeting_id in page], len(entries)
+
+    async def find_conflict(
+        self,
+        user_id: str,
+        start: datetime,
+        end: datetime,
+        exclude_meeting_id: Optional[str] = None,
+    ) -> Optional[BusyInterval]:
+        """Returns a confirmed meeting of the user overlapping [start, end) (naive UTC), or None."""
+        if user_id not in self._busy:
+            return None
+        return self._busy[user_id].find_conflict(start, end, exclude_meeting_id)
+
+    async def busy_intervals(self, user_id: str, start: datetime, end: datetime) -> List[BusyInterval]:
+        """Returns the user's confirmed meeting slots overlapping [start, end), sorted by start."""
+        if user_id not in self._busy:
+            return []
+        return self._busy[user_id].overlapping(start, end)
+
+
+# --- SQL Backend ---
+
+class MeetingRecord(Base):
+    __tablename__ = "meetings"
+
+    meeting_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    requester_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    recipient_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    meeting_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    preferred_time_slots: Mapped[list] = mapped_column(JSON, nullable=False)
+    selected_time_slot: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    meeting_duration: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Blocked time (naive UTC) while the meeting is confirmed, NULL otherwise
+    slot_start: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    slot_end: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # One index per listing predicate, in listing order, so a page is a seek plus `limit` rows
+        Index("ix_meetings_requester_created", "requester_id", "created_at", "meeting_id"),
+        Index("ix_meetings_recipient_created", "recipient_id", "created_at", "meeting_id"),
+        Index("ix_meetings_requester_status_created", "requester_id", "status", "created_at", "meeting_id"),
+        Index("ix_meetings_recipient_status_created", "recipient_id", "status", "created_at", "meeting_id"),
+        Index("ix_meetings_status_created", "status", "created_at"),
+        Index("ix_meetings_requester_slot", "requester_id", "slot_end"),
+        Index("ix_meetings_recipient_slot", "recipient_id", "slot_end"),
+    )
+
+
+class MeetingStatusCountRecord(Base):
+    """Number of a user's meetings in one status, kept up to date with every meeting write."""
+    __tablename__ = "meeting_status_counts"
+
+    user_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class MeetingRequestRecord(Base):
+    __tablename__ = "meeting_requests"
+
+    meeting_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    investor_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    investor_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    startup_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    preferred_date: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    preferred_time: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    meeting_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    created_at: Mapped[str] = mapped_column(String(32), nullable=False)
+    accepted_at: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    declined_at: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    decline_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_meeting_requests_startup_created", "startup_id", "created_at"),
+        Index("ix_meeting_requests_investor_created", "investor_email", "created_at"),
+        Index("ix_meeting_requests_status", "status"),
+    )
+
+
+def _record_to_dict(record: Base) -> Dict[str, Any]:
+    return {column.key: getattr(record, column.key) for column in record.__table__.columns}
+
+
+_MEETING_JSON_FIELDS = ("preferred_time_slots", "selected_time_slot")
+
+
+def _meeting_columns(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Converts a meeting dict (enums, nested models) into column values."""
+    columns = {}
+    for key, value in values.items():
+        if key not in MeetingRecord.__table__.columns:
+            continue
+        if key in _MEETING_JSON_FIELDS:
+            value = jsonable_encoder(value)
+        elif key in ("status", "meeting_type"):
+            value = _status_key(value)
+        columns[key] = value
+    return columns
+
+
+class SQLMeetingRepository:
+    """Meeting store backed by the `meetings` table."""
+
+    def __init__(self, sessionmaker=None):
+        self._sessionmaker = sessionmaker
+
+    def _session(self):
+        return (self._sessionmaker or get_sessionmaker())()
+
+    async def count(self) -> int:
+        async with self._session() as session:
+            return await session.scalar(select(func.count()).select_from(MeetingRecord))
+
+    @staticmethod
+    def _set_busy_slot(record: MeetingRecord) -> None:
+        slot = busy_slot({"status": record.status, "selected_time_slot": record.selected_time_slot})
+        record.slot_start, record.slot_end = slot if slot else (None, None)
+
+    @staticmethod
+    def _participants(record: MeetingRecord) -> List[str]:
+        # A meeting with oneself is only counted (and listed) once.
+        return sorted({record.requester_id, record.recipient_id})
+
+    @staticmethod
+    async def _count_status(session, user_ids: List[str], status: str, delta: int) -> None:
+        """Adds `delta` to the users' counters for `status`, in the caller's transaction."""
+        dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+        for user_id in user_ids:
+            statement = dialect.insert(MeetingStatusCountRecord).values(user_id=user_id, status=status, count=delta)
+            await session.execute(statement.on_conflict_do_update(
+                index_elements=["user_id", "status"],
+                set_={"count": MeetingStatusCountRecord.count + delta},
+            ))
+
+    async def add(self, meeting: Dict[str, Any]) -> None:
+        async with self._session() as session:
+            record = MeetingRecord(**_meeting_columns(meeting))
+            self._set_busy_slot(record)
+            session.add(record)
+            await self._count_status(session, self._participants(record), record.status, 1)
+            await session.commit()
+
+    async def get(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        async with self._session() as session:
+            record = await session.get(MeetingRecord, meeting_id)
+            return _record_to_dict(record) if record else None
+
+    async def update(self, meeting_id: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Applies `changes` to a stored meeting.
+
+        If the meeting then blocks time, the conflict check runs in the same
+        transaction as the write, after the participants' calendars are locked,
+        so concurrent confirmations (from any worker) can't overlap.
+
+        A status change also moves the participants' status counters. It is
+        applied only if the stored status is still the one read, so concurrent
+        changes can't count the same transition twice; otherwise the update
+        is retried on the fresh row.
+
+        Raises:
+            KeyError: If the meeting does not exist.
+            ConflictError: If the meeting would block time that overlaps another
+                confirmed meeting of a participant, or its status keeps changing concurrently.
+        """
+        columns = _meeting_columns(changes)
+        for _ in range(STATUS_UPDATE_ATTEMPTS):
+            async with self._session() as session:
+                record = await session.get(MeetingRecord, meeting_id)
+                if record is None:
+                    raise KeyError(meeting_id)
+                participants = self._participants(record)
+                old_status, new_status = record.status, columns.get("status", record.status)
+                if new_status != old_status:
+                    # Writing first also takes SQLite's database write lock for the rest of the transaction
+                    result = await session.execute(
+                        update(MeetingRecord)
+                        .where(MeetingRecord.meeting_id == meeting_id, MeetingRecord.status == old_status)
+                        .values(status=new_status)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount != 1:
+                        await session.rollback()
+                        continue
+                    await self._count_status(session, participants, old_status, -1)
+                    await self._count_status(session, participants, new_status, 1)
+                for key, value in columns.items():
+                    setattr(record, key, value)
+                self._set_busy_slot(record)
+                if record.slot_end is not None:
+                    await session.flush()
+                    if session.bind.dialect.name == "postgresql":
+                        for user_id in participants:
+                            await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"meetings:{user_id}"))))
+                    slot = (record.slot_start, record.slot_end)
+                    for user_id in participants:
+                        conflict = await self._find_conflict(session, user_id, slot[0], slot[1], meeting_id)
+                        if conflict:
+                            await session.rollback()
+                            raise slot_conflict_error(user_id, slot, conflict)
+                await session.commit()
+                return _record_to_dict(record)
+        raise ConflictError(
+            f"Meeting {meeting_id} was modified concurrently",
+            resource="meeting",
+            details={"meeting_id": meeting_id},
+        )
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        status: Optional[Any] = None,
+        offset: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        after = decode_meeting_cursor(cursor) if cursor else None
+        wanted = offset + limit + 1
+        sides = []
+        async with self._session() as session:
+            # One seek per side over its (user[, status], created_at, meeting_id) index, merged here,
+            # instead of an OR that can't walk either index in order
+            for column in (MeetingRecord.requester_id, MeetingRecord.recipient_id):
+                query = select(MeetingRecord).where(column == user_id)
+                if column is MeetingRecord.recipient_id:
+                    query = query.where(MeetingRecord.requester_id != user_id)
+                if status is not None:
+                    query = query.where(MeetingRecord.status == _status_key(status))
+                if after:
+                    query = query.where(tuple_(MeetingRecord.created_at, MeetingRecord.meeting_id) < tuple_(*after))
+                query = query.order_by(MeetingRecord.created_at.desc(), MeetingRecord.meeting_id.desc()).limit(wanted)
+                sides.append([_record_to_dict(record) for record in await session.scalars(query)])
+            counts = select(func.coalesce(func.sum(MeetingStatusCountRecord.count), 0)).where(MeetingStatusCountRecord.user_id == user_id)
+            if status is not None:
+                counts = counts.where(MeetingStatusCountRecord.status == _status_key(status))
+            total = await session.scalar(counts)
+        newest_first = heapq.merge(*sides, key=lambda meeting: (meeting["created_at"], meeting["meeting_id"]), reverse=True)
+        page = list(islice(newest_first, offset, offset + limit + 1))
+        next_cursor = encode_meeting_cursor((page[limit - 1]["created_at"], page[limit - 1]["meeting_id"])) if len(page) > limit else None
+        return page[:limit], total, next_cursor
+
+    async def status_counts(self, user_id: str) -> Dict[str, int]:
+        async with self._session() as session:
+            rows = await session.execute(
+                select(MeetingStatusCountRecord.status, MeetingStatusCountRecord.count)
+                .where(MeetingStatusCountRecord.user_id == user_id, MeetingStatusCountRecord.count > 0)
+            )
+            return {status: count for status, count in rows}
+
+    async def list_by_status(self, status: Any, offset: int = 0, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        condition = MeetingRecord.status == _status_key(status)
+        async with self._session() as session:
+            total = await session.scalar(select(func.count()).select_from(MeetingRecord).where(condition))
+            records = await session.scalars(
+                select(MeetingRecord)
+                .where(condition)
+                .order_by(MeetingRecord.created_at.desc(), MeetingRecord.meeting_id.desc())
+                .offset(offset)
+                .limit(limit)
+            )
+            return [_record_to_dict(record) for record in records], total
+
+
+    @staticmethod
+    async def _find_conflict(session, user_id: str, start: datetime, end: datetime, exclude_meeting_id: Optional[str]) -> Optional[BusyInterval]:
+        for column in (MeetingRecord.requester_id, MeetingRecord.recipient_id):
+            # Busy slots of a user don't overlap, so only the first one ending after `start`
+            # can overlap [start, end); the (user, slot_end) indexes serve this seek.
+            query = (
+                select(MeetingRecord.slot_start, MeetingRecord.slot_end, MeetingRecord.meeting_id)
+                .where(column == user_id, MeetingRecord.slot_end > start)
+                .order_by(MeetingRecord.slot_end)
+                .limit(1)
+            )
+            if exclude_meeting_id:
+                query = query.where(MeetingRecord.meeting_id != exclude_meeting_id)
+            row = (await session.execute(query)).first()
+            if row is not None and row.slot_start < end:
+                return tuple(row)
+        return None
+
+    async def find_conflict(
+        self,
+        user_id: str,
+        start: datetime,
+        end: datetime,
+        exclude_meeting_id: Optional[str] = None,
+    ) -> Optional[BusyInterval]:
+        async with self._session() as session:
+            return await self._find_conflict(session, user_id, start, end, exclude_meeting_id)
+
+    async def busy_intervals(self, user_id: str, start: datetime, end: datetime) -> List[BusyInterval]:
+        intervals = {}
+        async with self._session() as session:
+            for column in (MeetingRecord.requester_id, MeetingRecord.recipient_id):
+                query = (
+                    select(MeetingRecord.slot_start, MeetingRecord.slot_end, MeetingRecord.meeting_id)
+                    .where(column == user_id, MeetingRecord.slot_end > start, MeetingRecord.slot_start < end)
+                    .order_by(MeetingRecord.slot_end)
+                )
+                for slot_start, slot_end, meeting_id in await session.execute(query):
+                    intervals[meeting_id] = (slot_start, slot_end, meeting_id)
+        return sorted(intervals.values())
+
+
+class SQLMeetingRequestRepository:
+    """Simple meeting request store backed by the `meeting_requests` table."""
+
+    def __init__(self, sessionmaker=None):
+        self._sessionmaker = sessionmaker
+
+    def _session(self):
+        return (self._sessionmaker or get_sessionmaker())()
+
+    async def count(self) -> int:
+        async with self._session() as session:
+            return await session.scalar(select(func.count()).select_from(MeetingRequestRecord))
+
+    async def add(self, meeting_request: Dict[str, Any]) -> None:
+        async with self._session() as session:
+            session.add(MeetingRequestRecord(**meeting_request))
+            await session.commit()
+
+    async def get(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        async with self._session() as session:
+            record = await session.get(MeetingRequestRecord, meeting_id)
+            return _record_to_dict(record) if record else None
+
+    async def update(self, meeting_id: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._session() as session:
+            record = await session.get(MeetingRequestRecord, meeting_id)
+            if record is None:
+                raise KeyError(meeting_id)
+            for key, value in changes.items():
+                setattr(record, key, value)
+            await session.commit()
+            return _record_to_dict(record)
+
+    async def _list(self, condition) -> List[Dict[str, Any]]:
+        async with self._session() as session:
+            records = await session.scalars(
+                select(MeetingRequestRecord).where(condition).order_by(MeetingRequestRecord.created_at)
+            )
+            return [_record_to_dict(record) for record in records]
+
+    async def list_for_startup(self, startup_id: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        condition = MeetingRequestRecord.startup_id == startup_id
+        if status is not None:
+            condition = condition & (MeetingRequestRecord.status == status)
+        return await self._list(condition)
+
+    async def list_for_investor(self, investor_email: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        condition = MeetingRequestRecord.investor_email == investor_email
+        if status is not None:
+            condition = condition & (MeetingRequestRecord.status == status)
+        return await self._list(condition)
+
+    async def list_by_status(self, status: str) -> List[Dict[str, Any]]:
+        return await self._list(MeetingRequestRecord.status == status)
+
+
+# --- In-memory Meeting Requests ---
+
+class MeetingRequestRepository:
+    """
+    In-memory simple meeting request store.
+
+    Requests are hash-indexed by id, with by-startup and by-investor-email
+    multimaps (in creation order) and per-status buckets, so lookups and
+    status changes are O(1). Listings are returned in creation order, like
+    the SQL store: per-startup and per-investor listings walk that side's
+    requests and filter by status, since a status bucket is ordered by when
+    requests entered the status.
+    """
+
+    def __init__(self):
+        self._requests: Dict[str, Dict[str, Any]] = {}
+        # Dicts used as insertion-ordered sets of meeting ids
+        self._by_startup: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._by_investor: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._by_status: Dict[str, Dict[str, None]] = defaultdict(dict)
+
+    def _select(self, meeting_ids: Dict[str, None], status: Optional[str]) -> List[Dict[str, Any]]:
+        requests = (self._requests[meeting_id] for meeting_id in meeting_ids)
+        if status is None:
+            return list(requests)
+        return [meeting_request for meeting_request in requests if meeting_request["status"] == status]
+
+    async def count(self) -> int:
+        return len(self._requests)
+
+    async def add(self, meeting_request: Dict[str, Any]) -> None:
+        meeting_id = meeting_request["meeting_id"]
+        if meeting_id in self._requests:
+            raise KeyError(f"Meeting request {meeting_id} already exists")
+        self._requests[meeting_id] = meeting_request
+        self._by_startup[meeting_request["startup_id"]][meeting_id] = None
+        self._by_investor[meeting_request["investor_email"]][meeting_id] = None
+        self._by_status[meeting_request["status"]][meeting_id] = None
+
+    async def get(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        return self._requests.get(meeting_id)
+
+    async def update(self, meeting_id: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        meeting_request = self._requests[meeting_id]
+        if "status" in changes and changes["status"] != meeting_request["status"]:
+            bucket = self._by_status[meeting_request["status"]]
+            bucket.pop(meeting_id, None)
+            if not bucket:
+                del self._by_status[meeting_request["status"]]
+            self._by_status[changes["status"]][meeting_id] = None
+        meeting_request.update(changes)
+        return meeting_request
+
+    async def list_for_startup(self, startup_id: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._select(self._by_startup.get(startup_id, {}), status)
+
+    async def list_for_investor(self, investor_email: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._select(self._by_investor.get(investor_email, {}), status)
+
+    async def list_by_status(self, status: str) -> List[Dict[str, Any]]:
+        requests = [self._requests[meeting_id] for meeting_id in self._by_status.get(status, {})]
+        return sorted(requests, key=lambda meeting_request: meeting_request["created_at"])
+
+
+# --- Factories ---
+
+def create_meeting_repository(database_url: str):
+    """Returns the meeting store for `database_url` (`memory://` keeps meetings in process)."""
+    if database_url.startswith("memory://"):
+        return MeetingRepository()
+    return SQLMeetingRepository()
+
+
+def create_meeting_request_repository(database_url: str):
+    """Returns the simple meeting request store for `database_url`."""
+    if database_url.startswith("memory://"):
+        return MeetingRequestRepository()
+    return SQLMeetingRequestRepository()
@@ -0,0 +1,410 @@
+"""
+Page fingerprints and the per-startup cache of page analyses.
+
+Each extracted page gets two fingerprints: a hash of its normalized text and
+structured data, and a 64-bit perceptual hash (pHash) of a small grayscale
+rendering. Two pages are near-duplicates when their text hashes are equal and
+their pHashes differ in only a few bits, so a re-exported slide or a template
+page repeated in the appendix matches, while a slide whose numbers changed
+does not.
+
+Successful page analyses are cached per startup, keyed by the text hash, so a
+page seen in an earlier upload of the same startup reuses its analysis.
+
+Each ingested deck is also recorded as a version of a document (the page
+fingerprints and the summary), so a revised upload can be diffed page by page
+against the previous version and its summary updated instead of rebuilt.
+
+Two backends share one async interface: the `page_analyses` table through the
+shared SQLAlchemy engine, and an in-memory store for development
+(`DATABASE_URL=memory://`).
+"""
+
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pathlib import PurePosixPath
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, UniqueConstraint, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.database import Base, get_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Side of the grayscale thumbnail the pHash is computed from
+PHASH_SIZE = 32
+# Low-frequency DCT block kept for the hash (8x8 = 64 bits)
+PHASH_BLOCK = 8
+# Maximum differing bits for pages that have text (the text hash must match exactly)
+PHASH_MAX_DISTANCE = 6
+# Stricter for pages without text, where the image is the only evidence
+PHASH_MAX_DISTANCE_NO_TEXT = 2
+
+_WHITESPACE = re.compile(r"\s+")
+# Version markers at the end of a file name: "deck_v2", "Deck (1)", "deck-final", "deck 2024-05-01"...
+_VERSION_SUFFIX = re.compile(
+    r"[\s_.-]*(v\d+(\.\d+)*|version[\s_-]*\d+|rev[\s_-]*\d+|\(\d+\)|final|draft|updated|latest|copy|\d{4}[-_]?\d{2}([-_]?\d{2})?)$",
+    re.IGNORECASE
+)
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix, so that the 2D transform of X is C @ X @ C.T."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def text_fingerprint(text: Optional[str], structured_data: Optional[Dict[str, Any]] = None) -> str:
+    """Hashes a page's text (Unicode, case and whitespace normalized) together with its structured data."""
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip().lower()
+    if structured_data:
+        normalized += "\n" + json.dumps(structured_data, sort_keys=True, default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def perceptual_hash(samples: bytes, width: int, height: int) -> str:
+    """
+    Computes the pHash of a grayscale image.
+
+    Args:
+        samples: One byte per pixel, row-major
+        width: Image width; the image should be PHASH_SIZE square, others are resampled
+        height: Image height
+
+    Returns:
+        The 64-bit hash as 16 hex digits
+    """
+    pixels = np.frombuffer(samples, dtype=np.uint8)[:width * height].reshape(height, width).astype(np.float64)
+    if pixels.shape != (PHASH_SIZE, PHASH_SIZE):
+        rows = np.linspace(0, height - 1, PHASH_SIZE).round().astype(int)
+        cols = np.linspace(0, width - 1, PHASH_SIZE).round().astype(int)
+        pixels = pixels[np.ix_(rows, cols)]
+    block = (_DCT @ pixels @ _DCT.T)[:PHASH_BLOCK, :PHASH_BLOCK].ravel()
+    # The DC term only reflects overall brightness, so it stays out of the median
+    bits = block > np.median(block[1:])
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+
+def hash_distance(first: str, second: str) -> int:
+    """Number of differing bits between two pHashes."""
+    return bin(int(first, 16) ^ int(second, 16)).count("1")
+
+
+def is_near_duplicate(text_hash: str, phash: Optional[str], other_text_hash: str, other_phash: Optional[str], has_text: bool = True) -> bool:
+    """
+    Whether two pages can share one analysis.
+
+    The text hashes must be equal. Pages that were both hashed visually must
+    also look alike; a page without a pHash only matches another without one
+    (its text hash then covers everything the model saw).
+    """
+    if text_hash != other_text_hash:
+        return False
+    if phash is None or other_phash is None:
+        return phash is None and other_phash is None
+    max_distance = PHASH_MAX_DISTANCE if has_text else PHASH_MAX_DISTANCE_NO_TEXT
+    return hash_distance(phash, other_phash) <= max_distance
+
+
+def document_key(filename: str) -> str:
+    """Name shared by the versions of a document: the file stem without version markers, case or punctuation."""
+    key = PurePosixPath(filename).stem.lower()
+    while True:
+        stripped = _VERSION_SUFFIX.sub("", key)
+        if stripped == key or not stripped:
+            break
+        key = stripped
+    return re.sub(r"[^0-9a-z]+", " ", key).strip() or PurePosixPath(filename).stem.lower()
+
+
+def page_fingerprint(page: Dict[str, Any]) -> Dict[str, Any]:
+    """The fingerprint fields of an extracted page, as stored with a document version."""
+    return {
+        "page_number": page["page_number"],
+        "text_hash": page["text_hash"],
+        "phash": page.get("phash"),
+        "has_text": bool(page.get("has_text", page.get("text_content")))
+    }
+
+
+def diff_pages(previous_pages: List[Dict[str, Any]], pages: List[Dict[str, Any]]) -> Dict[str, List]:
+    """
+    Diffs two versions of a document page by page.
+
+    Pages are matched by fingerprint wherever they moved, preferring the same
+    page number. An unmatched page counts as changed if the previous version's
+    page at its position was not matched either, and as new otherwise.
+
+    Args:
+        previous_pages: Fingerprints of the previous version
+        pages: Fingerprints of the new version
+
+    Returns:
+        `unchanged` ({page_number, previous_page_number} pairs), `changed`
+        and `new` page numbers, and `removed` previous page numbers
+    """
+    by_hash: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for previous in previous_pages:
+        by_hash[previous["text_hash"]].append(previous)
+    matched = set()
+    unchanged, unmatched = [], []
+    for page in pages:
+        candidates = sorted(
+            (previous for previous in by_hash.get(page["text_hash"], []) if previous["page_number"] not in matched),
+            key=lambda previous: (previous["page_number"] != page["page_number"], previous["page_number"])
+        )
+        match = next((
+            previous for previous in candidates
+            if is_near_duplicate(page["text_hash"], page["phash"], previous["text_hash"], previous["phash"], page["has_text"] and previous["has_text"])
+        ), None)
+        if match:
+            matched.add(match["page_number"])
+            unchanged.append({"page_number": page["page_number"], "previous_page_number": match["page_number"]})
+        else:
+            unmatched.append(page["page_number"])
+
+    previous_numbers = {previous["page_number"] for previous in previous_pages}
+    changed = [number for number in unmatched if number in previous_numbers and number not in matched]
+    return {
+        "unchanged": unchanged,
+        "changed": changed,
+        "new": [number for number in unmatched if number not in changed],
+        "removed": sorted(previous_numbers - matched - set(changed))
+    }
+
+
+# --- In-Memory Backend ---
+
+class PageAnalysisRepository:
+    """
+    In-memory cache of page analyses.
+
+    Entries are dicts with `startup_id`, `document`, `page_number`,
+    `text_hash`, `phash`, `has_text`, `analysis`, `analysis_model` and
+    `created_at`.
+    """
+
+    def __init__(self):
+        # (startup_id, text_hash) -> entries, oldest first
+        self._entries: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+
+    async def find(self, startup_id: str, text_hash: str, phash: Optional[str], has_text: bool = True) -> Optional[Dict[str, Any]]:
+        """Returns the most recent cached analysis of a near-duplicate page, or None."""
+        for entry in reversed(self._entries.get((startup_id, text_hash), [])):
+            if is_near_duplicate(text_hash, phash, entry["text_hash"], entry["phash"], has_text):
+                return entry
+        return None
+
+    async def add(self, entry: Dict[str, Any]) -> None:
+        entry = {**entry, "created_at": entry.get("created_at") or datetime.utcnow()}
+        self._entries[(entry["startup_id"], entry["text_hash"])].append(entry)
+
+    async def count(self, startup_id: str) -> int:
+        return sum(len(entries) for (owner, _), entries in self._entries.items() if owner == startup_id)
+
+
+class DocumentVersionRepository:
+    """
+    In-memory store of document versions.
+
+    Entries are dicts with `startup_id`, `document_key`, `version`,
+    `filename`, `pages` (page fingerprints), `summary` and `created_at`.
+    """
+
+    def __init__(self):
+        # (startup_id, document_key) -> versions, oldest first
+        self._versions: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+
+    async def latest_versions(self, startup_id: str) -> List[Dict[str, Any]]:
+        """The latest version of each of a startup's documents, newest first."""
+        latest = [versions[-1] for (owner, _), versions in self._versions.items() if owner == startup_id and versions]
+        return sorted(latest, key=lambda entry: entry["created_at"], reverse=True)
+
+    async def add(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Stores the next version of a document and returns it with its version number."""
+        versions = self._versions[(entry["startup_id"], entry["document_key"])]
+        entry = {
+            **entry,
+            "version": versions[-1]["version"] + 1 if versions else 1,
+            "created_at": entry.get("created_at") or datetime.utcnow()
+        }
+        versions.append(entry)
+        return entry
+
+
+# --- SQL Backend ---
+
+class PageAnalysisRecord(Base):
+    """Analysis of one page of a startup's document, reusable for near-duplicate pages."""
+    __tablename__ = "page_analyses"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    startup_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    document: Mapped[str] = mapped_column(String(512), nullable=False)
+    page_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    text_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # 64-bit pHash as hex; NULL for pages that were not hashed visually
+    phash: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    has_text: Mapped[int] = mapped_column(Integer, nullable=False)
+    analysis: Mapped[str] = mapped_column(Text, nullable=False)
+    analysis_model: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_page_analyses_startup_text", "startup_id", "text_hash"),
+    )
+
+
+_ENTRY_FIELDS = ("startup_id", "document", "page_number", "text_hash", "phash", "has_text", "analysis", "analysis_model", "created_at")
+
+
+class SQLPageAnalysisRepository:
+    """Page analysis cache backed by the `page_analyses` table."""
+
+    def __init__(self, sessionmaker=None):
+        self._sessionmaker = sessionmaker
+
+    def _session(self):
+        return (self._sessionmaker or get_sessionmaker())()
+
+    async def find(self, startup_id: str, text_hash: str, phash: Optional[str], has_text: bool = True) -> Optional[Dict[str, Any]]:
+        """Returns the most recent cached analysis of a near-duplicate page, or None."""
+        async with self._session() as session:
+            records = await session.scalars(
+                select(PageAnalysisRecord)
+                .where(PageAnalysisRecord.startup_id == startup_id, PageAnalysisRecord.text_hash == text_hash)
+                .order_by(PageAnalysisRecord.id.desc())
+            )
+            for record in records:
+                if is_near_duplicate(text_hash, phash, record.text_hash, record.phash, has_text):
+                    entry = {field: getattr(record, field) for field in _ENTRY_FIELDS}
+                    entry["has_text"] = bool(entry["has_text"])
+                    return entry
+        return None
+
+    async def add(self, entry: Dict[str, Any]) -> None:
+        values = {field: entry.get(field) for field in _ENTRY_FIELDS}
+        values["has_text"] = int(bool(values["has_text"]))
+        values["created_at"] = values["created_at"] or datetime.utcnow()
+        async with self._session() as session:
+            session.add(PageAnalysisRecord(**values))
+            await session.commit()
+
+    async def count(self, startup_id: str) -> int:
+        async with self._session() as session:
+            return await session.scalar(
+                select(func.count()).select_from(PageAnalysisRecord).where(PageAnalysisRecord.startup_id == startup_id)
+            )
+
+
+class DocumentVersionRecord(Base):
+    """One ingested version of a startup's document: its page fingerprints and summary."""
+    __tablename__ = "document_versions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    startup_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    document_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    filename: Mapped[str] = mapped_column(String(512), nullable=False)
+    pages: Mapped[list] = mapped_column(JSON, nullable=False)
+    # NULL when the summary could not be generated, so the next version rebuilds it
+    summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("startup_id", "document_key", "version", name="uq_document_versions_version"),
+        Index("ix_document_versions_startup_created", "startup_id", "created_at"),
+    )
+
+
+_VERSION_FIELDS = ("startup_id", "document_key", "version", "filename", "pages", "summary", "created_at")
+
+# Attempts to store a version when concurrent uploads of the same document claim its number first
+VERSION_INSERT_ATTEMPTS = 5
+
+
+class SQLDocumentVersionRepository:
+    """Document version store backed by the `document_versions` table."""
+
+    def __init__(self, sessionmaker=None):
+        self._sessionmaker = sessionmaker
+
+    def _session(self):
+        return (self._sessionmaker or get_sessionmaker())()
+
+    async def latest_versions(self, startup_id: str) -> List[Dict[str, Any]]:
+        """The latest version of each of a startup's documents, newest first."""
+        latest = (
+            select(DocumentVersionRecord.document_key, func.max(DocumentVersionRecord.version).label("version"))
+            .where(DocumentVersionRecord.startup_id == startup_id)
+            .group_by(DocumentVersionRecord.document_key)
+            .subquery()
+        )
+        async with self._session() as session:
+            records = await session.scalars(
+                select(DocumentVersionRecord)
+                .join(latest, (DocumentVersionRecord.document_key == latest.c.document_key) & (DocumentVersionRecord.version == latest.c.version))
+                .where(DocumentVersionRecord.startup_id == startup_id)
+                .order_by(DocumentVersionRecord.created_at.desc())
+            )
+            return [{field: getattr(record, field) for field in _VERSION_FIELDS} for record in records]
+
+    async def add(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stores the next version of a document and returns it with its version number.
+
+        The number is max(version) + 1; when a concurrent upload of the same
+        document claims it first, the unique constraint rejects the insert and
+        the next number is tried.
+        """
+        values = {field: entry.get(field) for field in _VERSION_FIELDS}
+        values["created_at"] = values["created_at"] or datetime.utcnow()
+        for attempt in range(VERSION_INSERT_ATTEMPTS):
+            async with self._session() as session:
+                current = await session.scalar(
+                    select(func.max(DocumentVersionRecord.version)).where(
+                        DocumentVersionRecord.startup_id == entry["startup_id"],
+                        DocumentVersionRecord.document_key == entry["document_key"]
+                    )
+                )
+                values["version"] = (current or 0) + 1
+                session.add(DocumentVersionRecord(**values))
+                try:
+                    await session.commit()
+                    return values
+                except IntegrityError:
+                    await session.rollback()
+                    if attempt == VERSION_INSERT_ATTEMPTS - 1:
+                        raise
+                    logger.info(f"Version {values['version']} of {entry['document_key']} was taken concurrently, retrying")
+
+
+# --- Factories ---
+
+def create_page_analysis_repository(database_url: str):
+    """Returns the page analysis cache for `database_url` (`memory://` keeps it in process)."""
+    if database_url.startswith("memory://"):
+        return PageAnalysisRepository()
+    return SQLPageAnalysisRepository()
+
+
+def create_document_version_repository(database_url: str):
+    """Returns the document version store for `database_url`."""
+    if database_url.startswith("memory://"):
+        return DocumentVersionRepository()
+    return SQLDocumentVersionRepository()
@@ -0,0 +1,434 @@
+"""
+Full-text search over startup and investor profiles.
+
+Profiles are kept in an inverted index over three fields (name, description
+and tags) and ranked with BM25, name matches weighing most. Every query
+token is prefix-matched ("fin" finds "fintech"), and all tokens must match.
+Lookups only touch the postings of the query terms, so latency tracks the
+number of matches rather than the number of profiles. Profiles are
+(re)indexed individually whenever they change, each with its `updated_at`
+as version. The index also records up to which `updated_at` it has been
+reconciled with the profile store, so changes made through other workers
+or nodes are picked up incrementally.
+
+Backends:
+    sqlite:///./profile_search.db  SQLite FTS5 (shared by workers on one node)
+    memory://                      In-process inverted index
+"""
+
+import abc
+import asyncio
+import base64
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("name", "description", "tags")
+FIELD_WEIGHTS = {"name": 10.0, "description": 2.0, "tags": 5.0}
+
+# (score, user_id); higher scores rank first
+SearchHit = Tuple[float, str]
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercases, strips diacritics and splits on non-word characters (like FTS5 unicode61)."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _TOKEN.findall(text.lower())
+
+
+def encode_search_cursor(hit: SearchHit) -> str:
+    return base64.urlsafe_b64encode(json.dumps(["search", hit[0], hit[1]]).encode("utf-8")).decode("ascii")
+
+
+def decode_search_cursor(cursor: str) -> SearchHit:
+    """
+    Raises:
+        ValueError: If the cursor is malformed or not a search cursor.
+    """
+    try:
+        kind, score, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if kind != "search":
+            raise ValueError(kind)
+        return float(score), str(user_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class ProfileSearchIndex(abc.ABC):
+    """Base class for profile search backends."""
+
+    @abc.abstractmethod
+    async def index(self, profile_type: str, user_id: str, fields: Dict[str, str], version: str = "") -> None:
+        """Adds or replaces the searchable fields of one profile, recording the profile version indexed."""
+
+    @abc.abstractmethod
+    async def remove(self, profile_type: str, user_id: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def count(self, profile_type: str) -> int:
+        ...
+
+    @abc.abstractmethod
+    async def versions(self, profile_type: str, user_ids: List[str]) -> Dict[str, str]:
+        """Returns the indexed version of each of the given profiles that is in the index."""
+
+    @abc.abstractmethod
+    async def synced_until(self, profile_type: str) -> Optional[str]:
+        """Returns the `updated_at` (ISO format) up to which the index was reconciled with the profile store."""
+
+    @abc.abstractmethod
+    async def set_synced_until(self, profile_type: str, updated_at: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def search(
+        self,
+        profile_type: str,
+        query: str,
+        limit: int = 50,
+        after: Optional[SearchHit] = None,
+    ) -> List[SearchHit]:
+        """
+        Returns the best matches for `query`, best first.
+
+        Args:
+            profile_type: "startup" or "investor"
+            query: Free-text query; every token is prefix-matched
+            limit: Maximum number of hits
+            after: Last hit of the previous page (keyset pagination)
+
+        Returns:
+            List of (score, user_id), ordered by score descending then user_id
+        """
+
+
+# --- In-memory Backend ---
+
+class InMemorySearchIndex(ProfileSearchIndex):
+    """Inverted index with BM25 ranking, kept in process."""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        # profile_type -> term -> user_id -> field -> term frequency
+        self._postings: Dict[str, Dict[str, Dict[str, Dict[str, int]]]] = defaultdict(dict)
+        # profile_type -> user_id -> field -> Counter of terms
+        self._documents: Dict[str, Dict[str, Dict[str, Counter]]] = defaultdict(dict)
+        self._field_totals: Dict[str, Counter] = defaultdict(Counter)
+        # Sorted vocabulary per profile type, for prefix expansion
+        self._terms: Dict[str, List[str]] = defaultdict(list)
+        self._versions: Dict[str, Dict[str, str]] = defaultdict(dict)
+        self._synced_until: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, profile_type: str, user_id: str) -> None:
+        self._versions[profile_type].pop(user_id, None)
+        document = self._documents[profile_type].pop(user_id, None)
+        if document is None:
+            return
+        postings, terms = self._postings[profile_type], self._terms[profile_type]
+        for field, counts in document.items():
+            self._field_totals[profile_type][field] -= sum(counts.values())
+            for term in counts:
+                entry = postings.get(term)
+                if entry is None:
+                    continue
+                entry.pop(user_id, None)
+                if not entry:
+                    del postings[term]
+                    position = bisect_left(terms, term)
+                    if position < len(terms) and terms[position] == term:
+                        del terms[position]
+
+    async def index(self, profile_type: str, user_id: str, fields: Dict[str, str], version: str = "") -> None:
+        with self._lock:
+            self._remove(profile_type, user_id)
+            postings, terms = self._postings[profile_type], self._terms[profile_type]
+            document = {}
+            for field in SEARCH_FIELDS:
+                counts = Counter(tokenize(fields.get(field, "")))
+                document[field] = counts
+                self._field_totals[profile_type][field] += sum(counts.values())
+                for term, frequency in counts.items():
+                    if term not in postings:
+                        postings[term] = {}
+                        insort(terms, term)
+                    postings[term].setdefault(user_id, {})[field] = frequency
+            self._documents[profile_type][user_id] = document
+            self._versions[profile_type][user_id] = version
+
+    async def remove(self, profile_type: str, user_id: str) -> None:
+        with self._lock:
+            self._remove(profile_type, user_id)
+
+    async def count(self, profile_type: str) -> int:
+        return len(self._documents[profile_type])
+
+    async def versions(self, profile_type, user_ids):
+        versions = self._versions[profile_type]
+        return {user_id: versions[user_id] for user_id in user_ids if user_id in versions}
+
+    async def synced_until(self, profile_type):
+        return self._synced_until.get(profile_type)
+
+    async def set_synced_until(self, profile_type, updated_at):
+        self._synced_until[profile_type] = updated_at
+
+    def _expand(self, profile_type: str, token: str) -> List[str]:
+        terms = self._terms[profile_type]
+        position = bisect_left(terms, token)
+        expanded = []
+        while position < len(terms) and terms[position].startswith(token):
+            expanded.append(terms[position])
+            position += 1
+        return expanded
+
+    async def search(self, profile_type, query, limit=50, after=None):
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        with self._lock:
+            documents = self._documents[profile_type]
+            total_documents = len(documents)
+            if not total_documents:
+                return []
+            postings = self._postings[profile_type]
+            average_lengths = {
+                field: (self._field_totals[profile_type][field] / total_documents) or 1.0 for field in SEARCH_FIELDS
+            }
+            scores: Optional[Dict[str, float]] = None
+            for token in tokens:
+                token_scores: Dict[str, float] = defaultdict(float)
+                for term in self._expand(profile_type, token):
+                    entry = postings[term]
+                    idf = math.log(1 + (total_documents - len(entry) + 0.5) / (len(entry) + 0.5))
+                    for user_id, frequencies in entry.items():
+                        for field, frequency in frequencies.items():
+                            length = sum(documents[user_id][field].values())
+                            norm = self.K1 * (1 - self.B + self.B * length / average_lengths[field])
+                            token_scores[user_id] += FIELD_WEIGHTS[field] * idf * frequency * (self.K1 + 1) / (frequency + norm)
+                # Every token must match
+                if scores is None:
+                    scores = dict(token_scores)
+                else:
+                    scores = {user_id: score + token_scores[user_id] for user_id, score in scores.items() if user_id in token_scores}
+                if not scores:
+                    return []
+
+        hits = sorted(((score, user_id) for user_id, score in scores.items()), key=lambda hit: (-hit[0], hit[1]))
+        if after is not None:
+            hits = [hit for hit in hits if (-hit[0], hit[1]) > (-after[0], after[1])]
+        return hits[:limit]
+
+
+# --- SQLite FTS5 Backend ---
+
+class SQLiteSearchIndex(ProfileSearchIndex):
+    """
+    SQLite FTS5 index, one table per profile type.
+
+    `search_docs` maps (profile_type, user_id) to the FTS rowid and the
+    indexed profile version, so re-indexing a profile replaces its row
+    directly. `search_sync` holds the reconciliation watermark per type.
+    """
+
+    TABLES = {"startup": "startup_search", "investor": "investor_search"}
+
+    def __init__(self, db_path: str = "./profile_search.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        # The index file and its tables are created on first use, not when the
+        # index is constructed (e.g. at import of the profiles router).
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            if self.db_path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                # An in-memory database lives on its connection, so each one needs the tables
+                if not self._schema_ready or self.db_path == ":memory:":
+                    self._init_schema(conn)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        statements = [
+            """
+            CREATE TABLE IF NOT EXISTS search_docs (
+                doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                profile_type TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                version TEXT NOT NULL DEFAULT '',
+                UNIQUE (profile_type, user_id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS search_sync (
+                profile_type TEXT PRIMARY KEY,
+                synced_until TEXT NOT NULL
+            )
+            """,
+        ]
+        for table in self.TABLES.values():
+            statements.append(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                "name, description, tags, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+        for statement in statements:
+            conn.execute(statement)
+        # Index files created before versions were recorded: their documents get
+        # an empty version, so the next reconciliation re-indexes them once
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(search_docs)")}
+        if "version" not in columns:
+            conn.execute("ALTER TABLE search_docs ADD COLUMN version TEXT NOT NULL DEFAULT ''")
+
+    async def _run(self, fn, *args):
+        # In-memory databases are per-connection, so they must stay on one thread.
+        if self.db_path == ":memory:":
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _table(self, profile_type: str) -> str:
+        if profile_type not in self.TABLES:
+            raise ValueError(f"Unknown profile type: {profile_type}")
+        return self.TABLES[profile_type]
+
+    def _index_sync(self, profile_type: str, user_id: str, fields: Dict[str, str], version: str) -> None:
+        table = self._table(profile_type)
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO search_docs (profile_type, user_id, version) VALUES (?, ?, ?) "
+                "ON CONFLICT (profile_type, user_id) DO UPDATE SET version = excluded.version",
+                (profile_type, user_id, version),
+            )
+            doc_id = conn.execute(
+                "SELECT doc_id FROM search_docs WHERE profile_type = ? AND user_id = ?", (profile_type, user_id)
+            ).fetchone()[0]
+            conn.execute(f"DELETE FROM {table} WHERE rowid = ?", (doc_id,))
+            conn.execute(
+                f"INSERT INTO {table} (rowid, name, description, tags) VALUES (?, ?, ?, ?)",
+                (doc_id, fields.get("name", ""), fields.get("description", ""), fields.get("tags", "")),
+            )
+
+    def _remove_sync(self, profile_type: str, user_id: str) -> None:
+        table = self._table(profile_type)
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT doc_id FROM search_docs WHERE profile_type = ? AND user_id = ?", (profile_type, user_id)
+            ).fetchone()
+            if row:
+                conn.execute(f"DELETE FROM {table} WHERE rowid = ?", (row[0],))
+                conn.execute("DELETE FROM search_docs WHERE doc_id = ?", (row[0],))
+
+    def _count_sync(self, profile_type: str) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM search_docs WHERE profile_type = ?", (profile_type,)
+        ).fetchone()[0]
+
+    def _versions_sync(self, profile_type: str, user_ids: List[str]) -> Dict[str, str]:
+        versions = {}
+        conn = self._connection()
+        # Stay under SQLite's bound parameter limit
+        for start in range(0, len(user_ids), 500):
+            batch = user_ids[start:start + 500]
+            rows = conn.execute(
+                f"SELECT user_id, version FROM search_docs WHERE profile_type = ? AND user_id IN ({', '.join('?' * len(batch))})",
+                [profile_type, *batch],
+            )
+            versions.update(dict(rows))
+        return versions
+
+    def _synced_until_sync(self, profile_type: str) -> Optional[str]:
+        row = self._connection().execute("SELECT synced_until FROM search_sync WHERE profile_type = ?", (profile_type,)).fetchone()
+        return row[0] if row else None
+
+    def _set_synced_until_sync(self, profile_type: str, updated_at: str) -> None:
+        self._connection().execute(
+            "INSERT INTO search_sync (profile_type, synced_until) VALUES (?, ?) "
+            "ON CONFLICT (profile_type) DO UPDATE SET synced_until = MAX(synced_until, excluded.synced_until)",
+            (profile_type, updated_at),
+        )
+
+    def _search_sync(self, profile_type: str, match: str, limit: int, after: Optional[SearchHit]) -> List[SearchHit]:
+        table = self._table(profile_type)
+        weights = ", ".join(str(FIELD_WEIGHTS[field]) for field in SEARCH_FIELDS)
+        # bm25() is lower-is-better; scores are returned negated so higher ranks first
+        sql = (
+            f"SELECT -s.rank_score, d.user_id FROM ("
+            f"SELECT rowid, bm25({table}, {weights}) AS rank_score FROM {table} WHERE {table} MATCH ?"
+            f") s JOIN search_docs d ON d.doc_id = s.rowid"
+        )
+        params: List = [match]
+        if after is not None:
+            sql += " WHERE s.rank_score > ? OR (s.rank_score = ? AND d.user_id > ?)"
+            params += [-after[0], -after[0], after[1]]
+        sql += " ORDER BY s.rank_score, d.user_id LIMIT ?"
+        params.append(limit)
+        return [(score, user_id) for score, user_id in self._connection().execute(sql, params)]
+
+    async def index(self, profile_type, user_id, fields, version=""):
+        await self._run(self._index_sync, profile_type, user_id, fields, version)
+
+    async def remove(self, profile_type, user_id):
+        await self._run(self._remove_sync, profile_type, user_id)
+
+    async def count(self, profile_type):
+        return await self._run(self._count_sync, profile_type)
+
+    async def versions(self, profile_type, user_ids):
+        return await self._run(self._versions_sync, profile_type, list(user_ids))
+
+    async def synced_until(self, profile_type):
+        return await self._run(self._synced_until_sync, profile_type)
+
+    async def set_synced_until(self, profile_type, updated_at):
+        await self._run(self._set_synced_until_sync, profile_type, updated_at)
+
+    async def search(self, profile_type, query, limit=50, after=None):
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        # Quoted prefix queries, implicitly ANDed; quoting keeps FTS5 operators out of user input
+        match = " ".join(f'"{token}"*' for token in tokens)
+        return await self._run(self._search_sync, profile_type, match, limit, after)
+
+
+# --- Factory ---
+
+def create_search_index(search_url: str) -> ProfileSearchIndex:
+    """
+    Build a profile search index from a URL.
+
+    Supported URLs:
+        sqlite:///./profile_search.db  (SQLite FTS5, shared by workers on one node)
+        memory://                      (in-process inverted index)
+    """
+    if search_url.startswith("sqlite:///"):
+        return SQLiteSearchIndex(search_url[len("sqlite:///"):] or ":memory:")
+    if search_url.startswith("memory://"):
+        return InMemorySearchIndex()
+    raise ValueError(f"Unsupported profile search URL: {search_url}")
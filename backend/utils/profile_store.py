@@ -0,0 +1,582 @@
+"""
+Storage for startup and investor profiles.
+
+Profiles are stored whole (as JSON) alongside an index of the fields
+discovery filters on: industry and stage for startups, investment focus and
+stage for investors, plus a normalized location for prefix matching. Lists
+are paged with keyset cursors over (created_at, user_id), newest first, so a
+page costs the same wherever it is in the result set.
+
+Each profile's precomputed top matches (from the batch matching job) and
+its matching embedding are stored next to it. Profiles can also be read in `updated_at` order, so
+derived indexes (search, matching) can catch up on changes made by any
+worker.
+
+Two backends share one async interface: SQL tables through the shared
+SQLAlchemy engine, and an in-memory store for development
+(`DATABASE_URL=memory://`).
+"""
+
+import base64
+import heapq
+import json
+import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import JSON, DateTime, Index, LargeBinary, String, delete, exists, func, select, tuple_
+from sqlalchemy.orm import Mapped, aliased, mapped_column
+
+from utils.database import Base, get_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+STARTUP = "startup"
+INVESTOR = "investor"
+
+# Filterable field -> profile attribute it is read from, per profile type
+INDEXED_FIELDS: Dict[str, Dict[str, str]] = {
+    STARTUP: {"industry": "industry", "stage": "stage"},
+    INVESTOR: {"focus": "investment_focus", "stage": "investment_stage"},
+}
+
+LOCATION_FIELD = "location"
+
+# (created_at, user_id); also the keyset pagination key
+SortKey = Tuple[datetime, str]
+
+# (updated_at, user_id); keyset for reading changed profiles
+ChangeKey = Tuple[datetime, str]
+
+# Precomputed top matches of a profile: [{"user_id": ..., "score": ...}], best first
+MatchList = List[Dict[str, Any]]
+
+# Stored matching embedding of a profile: (fingerprint of embedder and text, float32 vector bytes)
+StoredEmbedding = Tuple[str, bytes]
+
+
+def normalize(value: Any) -> str:
+    """Normalizes a filter or indexed value (case and surrounding whitespace)."""
+    return str(value).strip().lower()
+
+
+def index_values(profile_type: str, profile: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Returns the normalized indexed values of a profile, by field."""
+    values = {}
+    for field, attribute in INDEXED_FIELDS[profile_type].items():
+        raw = profile.get(attribute)
+        if raw is None:
+            raw = []
+        elif isinstance(raw, str):
+            raw = [raw]
+        values[field] = sorted({normalize(value) for value in raw if str(value).strip()})
+    return values
+
+
+def profile_matches(
+    profile_type: str,
+    profile: Dict[str, Any],
+    filters: Optional[Dict[str, List[str]]] = None,
+    location: Optional[str] = None,
+) -> bool:
+    """Checks a profile against `query` filters, for candidates found by other means (e.g. search)."""
+    indexed = index_values(profile_type, profile)
+    for field, values in (filters or {}).items():
+        if values and not set(indexed.get(field, [])) & {normalize(value) for value in values}:
+            return False
+    return not location or normalize(profile.get(LOCATION_FIELD) or "").startswith(normalize(location))
+
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps([key[0].isoformat(), key[1]]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        created_at, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(user_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _newest_before(entries: List[SortKey], after: Optional[SortKey]) -> Iterator[SortKey]:
+    """Iterates sorted keys newest first, starting below `after` (all of them if None)."""
+    position = bisect_left(entries, after) if after else len(entries)
+    return (entries[i] for i in range(position - 1, -1, -1))
+
+
+def _profile_result(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **record["data"],
+        "user_id": record["user_id"],
+        "profile_type": record["profile_type"],
+        "created_at": record["created_at"],
+        "updated_at": record["updated_at"],
+    }
+
+
+# --- In-memory Backend ---
+
+class ProfileRepository:
+    """
+    In-memory profile store.
+
+    Keeps, per profile type, all sort keys in order plus one sorted key list
+    per (field, value), so filtered pages are read by walking the smallest
+    matching index backwards from the cursor (merging the lists of a
+    multi-value filter as they are walked).
+    """
+
+    def __init__(self):
+        self._profiles: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self._all: Dict[str, List[SortKey]] = defaultdict(list)
+        self._by_updated: Dict[str, List[ChangeKey]] = defaultdict(list)
+        self._index: Dict[Tuple[str, str, str], List[SortKey]] = defaultdict(list)
+        self._match_lists: Dict[str, Dict[str, MatchList]] = defaultdict(dict)
+        self._embeddings: Dict[str, Dict[str, StoredEmbedding]] = defaultdict(dict)
+
+    def _unindex(self, record: Dict[str, Any]) -> None:
+        profile_type = record["profile_type"]
+        key = (record["created_at"], record["user_id"])
+        for field, values in record["index"].items():
+            for value in values:
+                entries = self._index.get((profile_type, field, value))
+                if entries:
+                    position = bisect_left(entries, key)
+                    if position < len(entries) and entries[position] == key:
+                        del entries[position]
+                    if not entries:
+                        del self._index[(profile_type, field, value)]
+
+    async def count(self, profile_type: str) -> int:
+        return len(self._profiles[profile_type])
+
+    async def upsert(self, profile_type: str, user_id: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Creates or replaces a profile; the creation time (and so its position) is kept."""
+        now = datetime.utcnow()
+        existing = self._profiles[profile_type].get(user_id)
+        if existing:
+            self._unindex(existing)
+            self._remove_change_key(profile_type, (existing["updated_at"], user_id))
+            created_at = existing["created_at"]
+        else:
+            created_at = now
+            insort(self._all[profile_type], (created_at, user_id))
+        record = {
+            "profile_type": profile_type,
+            "user_id": user_id,
+            "data": profile,
+            "index": index_values(profile_type, profile),
+            "location": normalize(profile.get(LOCATION_FIELD) or ""),
+            "created_at": created_at,
+            "updated_at": now,
+        }
+        for field, values in record["index"].items():
+            for value in values:
+                insort(self._index[(profile_type, field, value)], (created_at, user_id))
+        insort(self._by_updated[profile_type], (now, user_id))
+        self._profiles[profile_type][user_id] = record
+        return _profile_result(record)
+
+    def _remove_change_key(self, profile_type: str, key: ChangeKey) -> None:
+        entries = self._by_updated[profile_type]
+        position = bisect_left(entries, key)
+        if position < len(entries) and entries[position] == key:
+            del entries[position]
+
+    async def get(self, profile_type: str, user_id: str) -> Optional[Dict[str, Any]]:
+        record = self._profiles[profile_type].get(user_id)
+        return _profile_result(record) if record else None
+
+    async def get_many(self, profile_type: str, user_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        profiles = self._profiles[profile_type]
+        return {user_id: _profile_result(profiles[user_id]) for user_id in user_ids if user_id in profiles}
+
+    def _matches(self, record: Dict[str, Any], filters: Dict[str, List[str]], location: Optional[str]) -> bool:
+        for field, values in filters.items():
+            if not set(record["index"].get(field, [])) & set(values):
+                return False
+        return not location or record["location"].startswith(location)
+
+    async def query(
+        self,
+        profile_type: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+        location: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Returns a page of profiles, newest first, and the cursor of the next page.
+
+        Args:
+            profile_type: "startup" or "investor"
+            filters: Indexed field -> accepted values (any of them matches; all fields must match)
+            location: Location prefix
+            cursor: Cursor returned with the previous page
+            limit: Page size
+
+        Returns:
+            The profiles and the next cursor (None on the last page)
+        """
+        filters = {field: [normalize(v) for v in values] for field, values in (filters or {}).items() if values}
+        location = normalize(location) if location else None
+        # Drive from the smallest candidate: all profiles, or the index lists of one filter's values
+        candidates = [[self._all[profile_type]]]
+        for field, values in filters.items():
+            candidates.append([self._index.get((profile_type, field, value), []) for value in values])
+        driving = min(candidates, key=lambda lists: sum(len(entries) for entries in lists))
+
+        # Each list is walked backwards from the cursor and merged lazily, newest first,
+        # so only as many keys are read as the page needs
+        after = decode_cursor(cursor) if cursor else None
+        walks = [_newest_before(entries, after) for entries in driving]
+        newest_first = walks[0] if len(walks) == 1 else heapq.merge(*walks, reverse=True)
+
+        page: List[Dict[str, Any]] = []
+        last_key = None
+        profiles = self._profiles[profile_type]
+        for key in newest_first:
+            if len(page) > limit:
+                break
+            if key == last_key:
+                continue  # a multi-valued field matched more than one value
+            last_key = key
+            record = profiles[key[1]]
+            if self._matches(record, filters, location):
+                page.append(record)
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor((page[-1]["created_at"], page[-1]["user_id"]))
+        return [_profile_result(record) for record in page], next_cursor
+
+    async def changed_since(
+        self,
+        profile_type: str,
+        since: Optional[datetime] = None,
+        after: Optional[ChangeKey] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns profiles updated after `since`, oldest change first.
+
+        Args:
+            profile_type: "startup" or "investor"
+            since: Only profiles with a later `updated_at` (all profiles if None)
+            after: (updated_at, user_id) of the last profile of the previous page
+            limit: Page size
+        """
+        entries = self._by_updated[profile_type]
+        if after is not None:
+            position = bisect_right(entries, tuple(after))
+        elif since is not None:
+            position = bisect_left(entries, (since,))
+            while position < len(entries) and entries[position][0] <= since:
+                position += 1
+        else:
+            position = 0
+        profiles = self._profiles[profile_type]
+        return [_profile_result(profiles[user_id]) for _, user_id in entries[position:position + limit]]
+
+    async def get_match_list(self, profile_type: str, user_id: str) -> Optional[MatchList]:
+        return self._match_lists[profile_type].get(user_id)
+
+    async def get_match_lists(self, profile_type: str) -> Dict[str, MatchList]:
+        return dict(self._match_lists[profile_type])
+
+    async def save_match_lists(self, profile_type: str, match_lists: Dict[str, MatchList]) -> None:
+        """Replaces the stored top matches of the given profiles."""
+        self._match_lists[profile_type].update(match_lists)
+
+    async def get_embeddings(self, profile_type: str, user_ids: Iterable[str]) -> Dict[str, StoredEmbedding]:
+        embeddings = self._embeddings[profile_type]
+        return {user_id: embeddings[user_id] for user_id in user_ids if user_id in embeddings}
+
+    async def save_embeddings(self, profile_type: str, embeddings: Dict[str, StoredEmbedding]) -> None:
+        """Replaces the stored matching embeddings of the given profiles."""
+        self._embeddings[profile_type].update(embeddings)
+
+
+# --- SQL Backend ---
+
+class ProfileRecord(Base):
+    __tablename__ = "profiles"
+
+    profile_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    location_key: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_profiles_type_created", "profile_type", "created_at", "user_id"),
+        Index("ix_profiles_type_location", "profile_type", "location_key"),
+        Index("ix_profiles_type_updated", "profile_type", "updated_at", "user_id"),
+    )
+
+
+class ProfileIndexRecord(Base):
+    """One row per indexed (field, value) of a profile, e.g. ("industry", "fintech")."""
+    __tablename__ = "profile_index"
+
+    profile_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    field: Mapped[str] = mapped_column(String(32), primary_key=True)
+    value: Mapped[str] = mapped_column(String(128), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Serves filtered keyset pages directly: seek to the cursor, read newest first
+        Index("ix_profile_index_lookup", "profile_type", "field", "value", "created_at", "user_id"),
+    )
+
+
+class ProfileMatchRecord(Base):
+    """Precomputed top matches of a profile, written by the batch scoring job."""
+    __tablename__ = "profile_matches"
+
+    profile_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    matches: Mapped[list] = mapped_column(JSON, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class ProfileEmbeddingRecord(Base):
+    """Matching embedding of a profile, reused by every worker while the fingerprint matches."""
+    __tablename__ = "profile_embeddings"
+
+    profile_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+def _record_result(record: ProfileRecord) -> Dict[str, Any]:
+    return _profile_result({
+        "profile_type": record.profile_type,
+        "user_id": record.user_id,
+        "data": record.data,
+        "created_at": record.created_at,
+        "updated_at": record.updated_at,
+    })
+
+
+class SQLProfileRepository:
+    """Profile store backed by the `profiles` and `profile_index` tables."""
+
+    def __init__(self, sessionmaker=None):
+        self._sessionmaker = sessionmaker
+
+    def _session(self):
+        return (self._sessionmaker or get_sessionmaker())()
+
+    async def count(self, profile_type: str) -> int:
+        async with self._session() as session:
+            return await session.scalar(
+                select(func.count()).select_from(ProfileRecord).where(ProfileRecord.profile_type == profile_type)
+            )
+
+    async def upsert(self, profile_type: str, user_id: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        async with self._session() as session:
+            record = await session.get(ProfileRecord, (profile_type, user_id))
+            if record is None:
+                record = ProfileRecord(profile_type=profile_type, user_id=user_id, created_at=now)
+                session.add(record)
+            record.data = profile
+            record.location_key = normalize(profile.get(LOCATION_FIELD) or "")
+            record.updated_at = now
+            await session.execute(
+                delete(ProfileIndexRecord).where(
+                    ProfileIndexRecord.profile_type == profile_type, ProfileIndexRecord.user_id == user_id
+                )
+            )
+            for field, values in index_values(profile_type, profile).items():
+                for value in values:
+                    session.add(ProfileIndexRecord(
+                        profile_type=profile_type, user_id=user_id, field=field, value=value, created_at=record.created_at
+                    ))
+            await session.commit()
+            return _record_result(record)
+
+    async def get(self, profile_type: str, user_id: str) -> Optional[Dict[str, Any]]:
+        async with self._session() as session:
+            record = await session.get(ProfileRecord, (profile_type, user_id))
+            return _record_result(record) if record else None
+
+    async def get_many(self, profile_type: str, user_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        async with self._session() as session:
+            records = await session.scalars(
+                select(ProfileRecord).where(ProfileRecord.profile_type == profile_type, ProfileRecord.user_id.in_(user_ids))
+            )
+            return {record.user_id: _record_result(record) for record in records}
+
+    @staticmethod
+    def _field_condition(profile_type: str, user_id_column, field: str, values: List[str]):
+        probe = aliased(ProfileIndexRecord)
+        return exists().where(
+            probe.profile_type == profile_type,
+            probe.user_id == user_id_column,
+            probe.field == field,
+            probe.value.in_(values),
+        )
+
+    async def query(
+        self,
+        profile_type: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+        location: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        filters = {field: sorted({normalize(v) for v in values}) for field, values in (filters or {}).items() if values}
+        location = normalize(location) if location else None
+        after = decode_cursor(cursor) if cursor else None
+
+        if filters:
+            # Drive from the index rows of the first filter; the rest are EXISTS probes
+            driving_field, driving_values = next(iter(filters.items()))
+            created_at, user_id = ProfileIndexRecord.created_at, ProfileIndexRecord.user_id
+            query = select(ProfileIndexRecord.created_at, ProfileIndexRecord.user_id).where(
+                ProfileIndexRecord.profile_type == profile_type,
+                ProfileIndexRecord.field == driving_field,
+                ProfileIndexRecord.value.in_(driving_values),
+            )
+            if len(driving_values) > 1:
+                query = query.distinct()
+            for field, values in list(filters.items())[1:]:
+                query = query.where(self._field_condition(profile_type, ProfileIndexRecord.user_id, field, values))
+            if location:
+                query = query.where(exists().where(
+                    ProfileRecord.profile_type == profile_type,
+                    ProfileRecord.user_id == ProfileIndexRecord.user_id,
+                    ProfileRecord.location_key.startswith(location, autoescape=True),
+                ))
+        else:
+            created_at, user_id = ProfileRecord.created_at, ProfileRecord.user_id
+            query = select(ProfileRecord.created_at, ProfileRecord.user_id).where(ProfileRecord.profile_type == profile_type)
+            if location:
+                query = query.where(ProfileRecord.location_key.startswith(location, autoescape=True))
+
+        if after:
+            query = query.where(tuple_(created_at, user_id) < tuple_(*after))
+        query = query.order_by(created_at.desc(), user_id.desc()).limit(limit + 1)
+
+        async with self._session() as session:
+            keys = [(row[0], row[1]) for row in await session.execute(query)]
+            profiles = {}
+            if keys:
+                records = await session.scalars(
+                    select(ProfileRecord).where(
+                        ProfileRecord.profile_type == profile_type,
+                        ProfileRecord.user_id.in_([key[1] for key in keys[:limit]]),
+                    )
+                )
+                profiles = {record.user_id: _record_result(record) for record in records}
+
+        next_cursor = encode_cursor(keys[limit - 1]) if len(keys) > limit else None
+        return [profiles[key[1]] for key in keys[:limit] if key[1] in profiles], next_cursor
+
+    async def changed_since(
+        self,
+        profile_type: str,
+        since: Optional[datetime] = None,
+        after: Optional[ChangeKey] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        query = select(ProfileRecord).where(ProfileRecord.profile_type == profile_type)
+        if after is not None:
+            query = query.where(tuple_(ProfileRecord.updated_at, ProfileRecord.user_id) > tuple_(*after))
+        elif since is not None:
+            query = query.where(ProfileRecord.updated_at > since)
+        query = query.order_by(ProfileRecord.updated_at, ProfileRecord.user_id).limit(limit)
+        async with self._session() as session:
+            return [_record_result(record) for record in await session.scalars(query)]
+
+    async def get_match_list(self, profile_type: str, user_id: str) -> Optional[MatchList]:
+        async with self._session() as session:
+            record = await session.get(ProfileMatchRecord, (profile_type, user_id))
+            return record.matches if record else None
+
+    async def get_match_lists(self, profile_type: str) -> Dict[str, MatchList]:
+        async with self._session() as session:
+            rows = await session.execute(
+                select(ProfileMatchRecord.user_id, ProfileMatchRecord.matches).where(
+                    ProfileMatchRecord.profile_type == profile_type
+                )
+            )
+            return {user_id: matches for user_id, matches in rows}
+
+    async def save_match_lists(self, profile_type: str, match_lists: Dict[str, MatchList], batch_size: int = 500) -> None:
+        """Replaces the stored top matches of the given profiles, one transaction per batch."""
+        now = datetime.utcnow()
+        user_ids = list(match_lists)
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start:start + batch_size]
+            async with self._session() as session:
+                await session.execute(
+                    delete(ProfileMatchRecord).where(
+                        ProfileMatchRecord.profile_type == profile_type, ProfileMatchRecord.user_id.in_(batch)
+                    )
+                )
+                session.add_all([
+                    ProfileMatchRecord(profile_type=profile_type, user_id=user_id, matches=match_lists[user_id], computed_at=now)
+                    for user_id in batch
+                ])
+                await session.commit()
+
+
+    async def get_embeddings(self, profile_type: str, user_ids: Iterable[str]) -> Dict[str, StoredEmbedding]:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        async with self._session() as session:
+            rows = await session.execute(
+                select(ProfileEmbeddingRecord.user_id, ProfileEmbeddingRecord.fingerprint, ProfileEmbeddingRecord.vector).where(
+                    ProfileEmbeddingRecord.profile_type == profile_type, ProfileEmbeddingRecord.user_id.in_(user_ids)
+                )
+            )
+            return {user_id: (fingerprint, vector) for user_id, fingerprint, vector in rows}
+
+    async def save_embeddings(self, profile_type: str, embeddings: Dict[str, StoredEmbedding], batch_size: int = 500) -> None:
+        """Replaces the stored matching embeddings of the given profiles, one transaction per batch."""
+        now = datetime.utcnow()
+        user_ids = list(embeddings)
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start:start + batch_size]
+            async with self._session() as session:
+                await session.execute(
+                    delete(ProfileEmbeddingRecord).where(
+                        ProfileEmbeddingRecord.profile_type == profile_type, ProfileEmbeddingRecord.user_id.in_(batch)
+                    )
+                )
+                session.add_all([
+                    ProfileEmbeddingRecord(
+                        profile_type=profile_type, user_id=user_id, fingerprint=embeddings[user_id][0],
+                        vector=embeddings[user_id][1], updated_at=now
+                    )
+                    for user_id in batch
+                ])
+                await session.commit()
+
+
+# --- Factory ---
+
+def create_profile_repository(database_url: str):
+    """Returns the profile store for `database_url` (`memory://` keeps profiles in process)."""
+    if database_url.startswith("memory://"):
+        return ProfileRepository()
+    return SQLProfileRepository()
@@ -0,0 +1,158 @@
+"""
+PDF page rasterization and OCR in worker processes.
+
+Rendering pages and encoding them as PNG is CPU-bound and holds the GIL, so
+in the API process a large deck pins a core and starves the event loop. Pages
+are rendered by a pool of worker processes instead, one page per task, right
+before the page's model call: each task opens the PDF from disk and returns
+the PNG. Concurrent model calls keep the workers busy, so throughput scales
+with the number of workers. Scanned pages without a text layer are OCRed
+with PyMuPDF's Tesseract integration in the same pool, in ranges of pages,
+when Tesseract is installed.
+
+This module only imports PyMuPDF. Spawned workers still import the main
+module of the parent process (as `__mp_main__`): under `uvicorn main:app`
+that is uvicorn's entry point, but with `python main.py` every worker loads
+the application (routers, model clients) once when it starts, so run the
+server through uvicorn in production.
+"""
+
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# Pages per OCR task: enough to amortize opening the document in the worker,
+# few enough that one deck spreads over all workers
+OCR_CHUNK_PAGES = 4
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+# Ingestion threads render concurrently; without it two of them could each start a pool
+_render_pool_lock = threading.Lock()
+
+
+def render_page_png(page, zoom: float = 2) -> bytes:
+    """Renders one page as PNG bytes at `zoom` times its size."""
+    return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes("png")
+
+
+def _render_page(pdf_path: str, page_number: int, zoom: float) -> bytes:
+    """Worker task: renders one page (0-based) as PNG bytes."""
+    with fitz.open(pdf_path) as doc:
+        return render_page_png(doc.load_page(page_number), zoom)
+
+
+def ocr_page_text(page, language: str = "eng", dpi: int = 300) -> str:
+    """Returns the text of a page recognized by Tesseract ("" if OCR fails)."""
+    try:
+        textpage = page.get_textpage_ocr(language=language, dpi=dpi, full=True)
+        return page.get_text("text", textpage=textpage).strip()
+    except Exception as e:
+        logger.warning(f"OCR failed on page {page.number + 1}: {e}")
+        return ""
+
+
+def _ocr_range(pdf_path: str, page_numbers: List[int], language: str, dpi: int) -> List[Tuple[int, str]]:
+    """Worker task: OCRs the given pages (0-based)."""
+    with fitz.open(pdf_path) as doc:
+        return [(page_number, ocr_page_text(doc.load_page(page_number), language, dpi)) for page_number in page_numbers]
+
+
+@lru_cache(maxsize=1)
+def ocr_available() -> bool:
+    """Whether Tesseract and its language data can be found for PyMuPDF's OCR."""
+    try:
+        return bool(fitz.get_tessdata())
+    except AttributeError:
+        # PyMuPDF < 1.24 has no lookup helper; it needs TESSDATA_PREFIX
+        return bool(os.environ.get("TESSDATA_PREFIX")) and shutil.which("tesseract") is not None
+    except Exception:
+        return False
+
+
+def get_render_pool(max_workers: int) -> Optional[ProcessPoolExecutor]:
+    """Shared rendering pool, or None when `max_workers` is 0 (render in the calling thread)."""
+    global _render_pool
+    if max_workers <= 0:
+        return None
+    with _render_pool_lock:
+        if _render_pool is None:
+            # Spawned, not forked: the API process runs threads (and MuPDF state) that a fork would copy mid-flight
+            _render_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+
+
+def render_page(pdf_path: str, page_number: int, zoom: float = 2, max_workers: int = 0) -> bytes:
+    """
+    Renders one page of a PDF on disk as PNG, in the rendering pool.
+
+    Blocks until the page is rendered, so call it from a worker thread,
+    not from the event loop.
+
+    Args:
+        pdf_path: Path of the PDF
+        page_number: 0-based number of the page to render
+        zoom: Scale factor (2 renders at 144 dpi)
+        max_workers: Size of the rendering pool; 0 renders in the calling thread
+
+    Returns:
+        PNG bytes of the page
+    """
+    pool = get_render_pool(max_workers)
+    if pool is not None:
+        try:
+            return pool.submit(_render_page, pdf_path, page_number, zoom).result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); start a fresh pool next time and render here
+            logger.warning(f"Rendering pool failed, rendering in process: {e}")
+            shutdown_render_pool()
+
+    return _render_page(pdf_path, page_number, zoom)
+
+
+def ocr_pages(pdf_path: str, page_numbers: List[int], language: str = "eng", dpi: int = 300, max_workers: int = 0) -> Dict[int, str]:
+    """
+    OCRs pages of a PDF on disk, in parallel across the rendering pool.
+
+    Blocks until all pages are done, so call it from a worker thread.
+
+    Args:
+        pdf_path: Path of the PDF
+        page_numbers: 0-based numbers of the pages to OCR
+        language: Tesseract language(s), e.g. "eng" or "eng+deu"
+        dpi: Resolution the pages are rendered at for recognition
+        max_workers: Size of the rendering pool; 0 runs OCR in the calling thread
+
+    Returns:
+        Recognized text by 0-based page number
+    """
+    if not page_numbers:
+        return {}
+    pool = get_render_pool(max_workers)
+    if pool is not None:
+        chunks = [page_numbers[start:start + OCR_CHUNK_PAGES] for start in range(0, len(page_numbers), OCR_CHUNK_PAGES)]
+        try:
+            futures = [pool.submit(_ocr_range, pdf_path, chunk, language, dpi) for chunk in chunks]
+            return {page_number: text for future in futures for page_number, text in future.result()}
+        except BrokenProcessPool as e:
+            logger.warning(f"Rendering pool failed, running OCR in process: {e}")
+            shutdown_render_pool()
+
+    return dict(_ocr_range(pdf_path, page_numbers, language, dpi))
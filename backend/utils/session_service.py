@@ -0,0 +1,694 @@
+"""
+Persistent session services for the ADK-based AI interviewer.
+
+Replaces the process-local InMemorySessionService so interview sessions
+survive restarts and can be served by any uvicorn worker or node.
+State is stored one row (or hash field) per top-level key, and
+`update_session` only writes the keys that changed since the session was
+last loaded or saved.
+
+Data that only grows (conversation history) goes into append-only session
+logs, and large immutable inputs (startup context, generated question
+sets) are stored once as content-addressed blobs, so neither is reloaded or
+rewritten on each turn.
+"""
+
+import abc
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.events.event import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+from utils.exceptions import ConflictError, ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+
+# --- State Diffing ---
+
+def encode_state(state: Dict[str, Any]) -> Dict[str, str]:
+    """Encode every top-level state value as a canonical JSON string."""
+    return {
+        key: json.dumps(value, sort_keys=True, default=str)
+        for key, value in state.items()
+        if not key.startswith(State.TEMP_PREFIX)
+    }
+
+
+def diff_state(previous: Dict[str, str], current: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Compute the minimal change set between two encoded states.
+
+    Args:
+        previous: Encoded state as last persisted
+        current: Encoded state to persist
+
+    Returns:
+        Tuple of (changed or added keys with their encoded values, removed keys)
+    """
+    changed = {key: value for key, value in current.items() if previous.get(key) != value}
+    removed = [key for key in previous if key not in current]
+    return changed, removed
+
+
+class PersistentSessionService(BaseSessionService):
+    """
+    Base class for storage-backed session services.
+
+    Keeps a bounded cache of the last persisted encoded state and version of
+    each session touched by this process, so that saves can be reduced to a
+    state diff. Every save is guarded by an optimistic version check, which
+    lets several workers share the same store safely.
+    """
+
+    def __init__(self, snapshot_cache_size: int = 1024, max_loaded_events: Optional[int] = None):
+        self._snapshots: "OrderedDict[str, Tuple[int, Dict[str, str]]]" = OrderedDict()
+        self._snapshot_cache_size = snapshot_cache_size
+        # Cap on events loaded by get_session when no config is given, so a
+        # long session does not make every turn reload its whole event list.
+        self.max_loaded_events = max_loaded_events
+
+    # --- Backend hooks ---
+
+    @abc.abstractmethod
+    async def _insert(self, session: Session, encoded: Dict[str, str]) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def _load(self, session_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, str], int]]:
+        """Return (session metadata, encoded state, version) or None."""
+
+    @abc.abstractmethod
+    async def _load_events(self, session_id: str, config: Optional[GetSessionConfig]) -> List[Event]:
+        ...
+
+    @abc.abstractmethod
+    async def _write_diff(
+        self,
+        session: Session,
+        changed: Dict[str, str],
+        removed: List[str],
+        expected_version: int,
+        event: Optional[Event] = None,
+    ) -> int:
+        """Apply a state diff (and optional event) atomically, returning the new version."""
+
+    @abc.abstractmethod
+    async def _list(self, app_name: str, user_id: str) -> List[Dict[str, Any]]:
+        ...
+
+    @abc.abstractmethod
+    async def _delete(self, session_id: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def _append_log(self, session_id: str, log_name: str, entries: List[str]) -> int:
+        """Append encoded entries to a session log, returning the new log length."""
+
+    @abc.abstractmethod
+    async def _read_log(self, session_id: str, log_name: str, start: int, end: Optional[int]) -> List[str]:
+        ...
+
+    @abc.abstractmethod
+    async def _put_blob(self, ref: str, data: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def _get_blob(self, ref: str) -> Optional[str]:
+        ...
+
+    # --- Snapshot cache ---
+
+    def _remember(self, session_id: str, version: int, encoded: Dict[str, str]) -> None:
+        self._snapshots[session_id] = (version, encoded)
+        self._snapshots.move_to_end(session_id)
+        while len(self._snapshots) > self._snapshot_cache_size:
+            self._snapshots.popitem(last=False)
+
+    async def _snapshot(self, session_id: str) -> Tuple[int, Dict[str, str]]:
+        cached = self._snapshots.get(session_id)
+        if cached is not None:
+            return cached
+        loaded = await self._load(session_id)
+        if loaded is None:
+            raise ConflictError(f"Session {session_id} no longer exists.", resource="session")
+        _, encoded, version = loaded
+        self._remember(session_id, version, encoded)
+        return version, encoded
+
+    # --- BaseSessionService API ---
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = Session(
+            id=session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4()),
+            app_name=app_name,
+            user_id=user_id,
+            state=dict(state or {}),
+            last_update_time=time.time(),
+        )
+        encoded = encode_state(session.state)
+        await self._insert(session, encoded)
+        self._remember(session.id, 0, encoded)
+        return session
+
+    async def get_session(
+        self,
+        session_id: Optional[str] = None,
+        *,
+        app_name: Optional[str] = None,
+        user_id: Optional[str] = None,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        """
+        Load a session by id.
+
+        Session ids are globally unique, so `app_name` and `user_id` are only
+        used to reject lookups that belong to another app or user.
+        """
+        loaded = await self._load(session_id)
+        if loaded is None:
+            return None
+        meta, encoded, version = loaded
+        if (app_name and meta["app_name"] != app_name) or (user_id and meta["user_id"] != user_id):
+            return None
+
+        self._remember(session_id, version, encoded)
+        if config is None and self.max_loaded_events:
+            config = GetSessionConfig(num_recent_events=self.max_loaded_events)
+        return Session(
+            id=session_id,
+            app_name=meta["app_name"],
+            user_id=meta["user_id"],
+            state={key: json.loads(value) for key, value in encoded.items()},
+            events=await self._load_events(session_id, config),
+            last_update_time=meta["last_update_time"],
+        )
+
+    async def update_session(self, session: Session) -> Session:
+        """Persist only the state keys that changed since the last load or save."""
+        version, previous = await self._snapshot(session.id)
+        encoded = encode_state(session.state)
+        changed, removed = diff_state(previous, encoded)
+        if not changed and not removed:
+            return session
+
+        session.last_update_time = time.time()
+        new_version = await self._write_diff(session, changed, removed, version)
+        self._remember(session.id, new_version, encoded)
+        return session
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        version, previous = await self._snapshot(session.id)
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        encoded = encode_state(session.state)
+        changed, removed = diff_state(previous, encoded)
+        new_version = await self._write_diff(session, changed, removed, version, event=event)
+        self._remember(session.id, new_version, encoded)
+        return event
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        rows = await self._list(app_name, user_id)
+        return ListSessionsResponse(
+            sessions=[
+                Session(id=row["id"], app_name=app_name, user_id=user_id, last_update_time=row["last_update_time"])
+                for row in rows
+            ]
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await self._delete(session_id)
+        self._snapshots.pop(session_id, None)
+
+    # --- Append-only logs and blobs ---
+
+    async def append_log(self, session_id: str, log_name: str, entries: List[Any]) -> int:
+        """
+        Append entries to a named, append-only session log.
+
+        Only the new entries are encoded and written, so the cost of a call is
+        independent of how long the log already is.
+
+        Returns:
+            The length of the log after the append
+        """
+        encoded = [json.dumps(entry, sort_keys=True, default=str) for entry in entries]
+        return await self._append_log(session_id, log_name, encoded)
+
+    async def read_log(self, session_id: str, log_name: str, start: int = 0, end: Optional[int] = None) -> List[Any]:
+        """Read entries [start, end) of a session log."""
+        return [json.loads(raw) for raw in await self._read_log(session_id, log_name, start, end)]
+
+    async def save_blob(self, data: str, ref: Optional[str] = None) -> str:
+        """
+        Store an immutable text blob once and return its content-addressed reference.
+
+        If `ref` is given the blob is stored under that key instead (first write wins),
+        which lets callers use the store as a shared cache for deterministic results.
+        """
+        ref = ref or hashlib.sha256(data.encode("utf-8")).hexdigest()
+        await self._put_blob(ref, data)
+        return ref
+
+    async def load_blob(self, ref: str) -> Optional[str]:
+        """Load a blob previously stored with save_blob."""
+        return await self._get_blob(ref)
+
+
+# --- SQLite Backend ---
+
+class SQLiteSessionService(PersistentSessionService):
+    """
+    Session service backed by a local SQLite database.
+
+    Intended for local development, tests and single-node deployments with
+    several workers sharing one database file (WAL mode).
+    """
+
+    def __init__(
+        self,
+        db_path: str = "./interview_sessions.db",
+        snapshot_cache_size: int = 1024,
+        max_loaded_events: Optional[int] = None,
+    ):
+        super().__init__(snapshot_cache_size, max_loaded_events)
+        self.db_path = db_path
+        self._local = threading.local()
+        # An in-memory database only exists on the connection that created it,
+        # so it gets one connection shared by all threads, used under a lock.
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        self._memory_lock = threading.Lock()
+        # The database file and its schema are created on first use, not when
+        # the service is constructed (e.g. at import of the router module).
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self.db_path == ":memory:":
+            with self._schema_lock:
+                if self._memory_conn is None:
+                    self._memory_conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+                    self._init_schema(self._memory_conn)
+            return self._memory_conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._init_schema(conn)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                app_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0,
+                last_update_time REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_sessions_app_user ON sessions (app_name, user_id);
+            CREATE TABLE IF NOT EXISTS session_state (
+                session_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (session_id, key)
+            );
+            CREATE TABLE IF NOT EXISTS session_logs (
+                session_id TEXT NOT NULL,
+                log_name TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (session_id, log_name, seq)
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                ref TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS session_events (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                timestamp REAL NOT NULL,
+                event TEXT NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            );
+            """
+        )
+
+    def _run_shared(self, fn, *args):
+        with self._memory_lock:
+            return fn(*args)
+
+    async def _run(self, fn, *args):
+        if self.db_path == ":memory:":
+            # Queries on the shared in-memory connection are quick; the lock
+            # keeps transactions from different threads from interleaving.
+            return self._run_shared(fn, *args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _insert_sync(self, session: Session, encoded: Dict[str, str]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO sessions (id, app_name, user_id, version, last_update_time) VALUES (?, ?, ?, 0, ?)",
+                (session.id, session.app_name, session.user_id, session.last_update_time),
+            )
+            conn.executemany(
+                "INSERT INTO session_state (session_id, key, value) VALUES (?, ?, ?)",
+                [(session.id, key, value) for key, value in encoded.items()],
+            )
+
+    def _load_sync(self, session_id: str):
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT app_name, user_id, version, last_update_time FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        encoded = dict(conn.execute("SELECT key, value FROM session_state WHERE session_id = ?", (session_id,)))
+        meta = {"app_name": row[0], "user_id": row[1], "last_update_time": row[3]}
+        return meta, encoded, row[2]
+
+    def _load_events_sync(self, session_id: str, config: Optional[GetSessionConfig]) -> List[Event]:
+        query = "SELECT event FROM session_events WHERE session_id = ?"
+        params: List[Any] = [session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        query += " ORDER BY seq DESC"
+        if config and config.num_recent_events:
+            query += " LIMIT ?"
+            params.append(config.num_recent_events)
+        rows = self._connection().execute(query, params).fetchall()
+        return [Event.model_validate_json(row[0]) for row in reversed(rows)]
+
+    def _write_diff_sync(self, session, changed, removed, expected_version, event) -> int:
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE sessions SET version = version + 1, last_update_time = ? WHERE id = ? AND version = ?",
+                (session.last_update_time, session.id, expected_version),
+            )
+            if cursor.rowcount != 1:
+                raise ConflictError(
+                    f"Session {session.id} was modified concurrently.",
+                    resource="session",
+                    details={"expected_version": expected_version},
+                )
+            if changed:
+                conn.executemany(
+                    "INSERT INTO session_state (session_id, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (session_id, key) DO UPDATE SET value = excluded.value",
+                    [(session.id, key, value) for key, value in changed.items()],
+                )
+            if removed:
+                conn.executemany(
+                    "DELETE FROM session_state WHERE session_id = ? AND key = ?",
+                    [(session.id, key) for key in removed],
+                )
+            if event is not None:
+                conn.execute(
+                    "INSERT INTO session_events (session_id, seq, timestamp, event) VALUES ("
+                    "?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM session_events WHERE session_id = ?), ?, ?)",
+                    (session.id, session.id, event.timestamp, event.model_dump_json(exclude_none=True)),
+                )
+        return expected_version + 1
+
+    def _list_sync(self, app_name: str, user_id: str) -> List[Dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT id, last_update_time FROM sessions WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+        ).fetchall()
+        return [{"id": row[0], "last_update_time": row[1]} for row in rows]
+
+    def _delete_sync(self, session_id: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM session_events WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM session_logs WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM session_state WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def _append_log_sync(self, session_id: str, log_name: str, entries: List[str]) -> int:
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            length = conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM session_logs WHERE session_id = ? AND log_name = ?",
+                (session_id, log_name),
+            ).fetchone()[0]
+            conn.executemany(
+                "INSERT INTO session_logs (session_id, log_name, seq, value) VALUES (?, ?, ?, ?)",
+                [(session_id, log_name, length + i, entry) for i, entry in enumerate(entries)],
+            )
+        return length + len(entries)
+
+    def _read_log_sync(self, session_id: str, log_name: str, start: int, end: Optional[int]) -> List[str]:
+        query = "SELECT value FROM session_logs WHERE session_id = ? AND log_name = ? AND seq >= ?"
+        params: List[Any] = [session_id, log_name, start]
+        if end is not None:
+            query += " AND seq < ?"
+            params.append(end)
+        rows = self._connection().execute(query + " ORDER BY seq", params).fetchall()
+        return [row[0] for row in rows]
+
+    def _put_blob_sync(self, ref: str, data: str) -> None:
+        self._connection().execute("INSERT OR IGNORE INTO blobs (ref, value) VALUES (?, ?)", (ref, data))
+
+    def _get_blob_sync(self, ref: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM blobs WHERE ref = ?", (ref,)).fetchone()
+        return row[0] if row else None
+
+    async def _insert(self, session, encoded):
+        await self._run(self._insert_sync, session, encoded)
+
+    async def _load(self, session_id):
+        return await self._run(self._load_sync, session_id)
+
+    async def _load_events(self, session_id, config):
+        return await self._run(self._load_events_sync, session_id, config)
+
+    async def _write_diff(self, session, changed, removed, expected_version, event=None):
+        return await self._run(self._write_diff_sync, session, changed, removed, expected_version, event)
+
+    async def _list(self, app_name, user_id):
+        return await self._run(self._list_sync, app_name, user_id)
+
+    async def _delete(self, session_id):
+        await self._run(self._delete_sync, session_id)
+
+    async def _append_log(self, session_id, log_name, entries):
+        return await self._run(self._append_log_sync, session_id, log_name, entries)
+
+    async def _read_log(self, session_id, log_name, start, end):
+        return await self._run(self._read_log_sync, session_id, log_name, start, end)
+
+    async def _put_blob(self, ref, data):
+        await self._run(self._put_blob_sync, ref, data)
+
+    async def _get_blob(self, ref):
+        return await self._run(self._get_blob_sync, ref)
+
+
+# --- Redis Backend ---
+
+class RedisSessionService(PersistentSessionService):
+    """
+    Session service backed by Redis, for multi-node deployments.
+
+    Each session uses a metadata hash, a state hash (one field per key), an
+    event list and one list per log, so a diff translates to a single
+    HSET/HDEL script call and a log append to a single RPUSH.
+    """
+
+    # Compare-and-set on the version field, then apply the diff atomically.
+    _WRITE_SCRIPT = """
+    local version = tonumber(redis.call('HGET', KEYS[1], 'version'))
+    if version == nil or version ~= tonumber(ARGV[1]) then
+        return -1
+    end
+    redis.call('HSET', KEYS[1], 'version', version + 1, 'last_update_time', ARGV[2])
+    local n_changed = tonumber(ARGV[3])
+    local i = 4
+    for _ = 1, n_changed do
+        redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 1])
+        i = i + 2
+    end
+    local n_removed = tonumber(ARGV[i])
+    i = i + 1
+    for _ = 1, n_removed do
+        redis.call('HDEL', KEYS[2], ARGV[i])
+        i = i + 1
+    end
+    if ARGV[i] ~= '' then
+        redis.call('RPUSH', KEYS[3], ARGV[i])
+    end
+    return version + 1
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        snapshot_cache_size: int = 1024,
+        max_loaded_events: Optional[int] = None,
+        key_prefix: str = "investai:session",
+    ):
+        super().__init__(snapshot_cache_size, max_loaded_events)
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise ConfigurationError("session_store_url", f"redis package is required for Redis sessions: {e}")
+        self._redis = redis_asyncio.from_url(redis_url, decode_responses=True)
+        self._prefix = key_prefix
+        self._write_script = self._redis.register_script(self._WRITE_SCRIPT)
+
+    def _keys(self, session_id: str) -> Tuple[str, str, str]:
+        base = f"{self._prefix}:{session_id}"
+        return f"{base}:meta", f"{base}:state", f"{base}:events"
+
+    def _index_key(self, app_name: str, user_id: str) -> str:
+        return f"{self._prefix}:index:{app_name}:{user_id}"
+
+    def _log_key(self, session_id: str, log_name: str) -> str:
+        return f"{self._prefix}:{session_id}:log:{log_name}"
+
+    async def _insert(self, session, encoded):
+        meta_key, state_key, _ = self._keys(session.id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(meta_key, mapping={
+                "app_name": session.app_name,
+                "user_id": session.user_id,
+                "version": 0,
+                "last_update_time": session.last_update_time,
+            })
+            if encoded:
+                pipe.hset(state_key, mapping=encoded)
+            pipe.sadd(self._index_key(session.app_name, session.user_id), session.id)
+            await pipe.execute()
+
+    async def _load(self, session_id):
+        meta_key, state_key, _ = self._keys(session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(meta_key)
+            pipe.hgetall(state_key)
+            meta, encoded = await pipe.execute()
+        if not meta:
+            return None
+        return (
+            {"app_name": meta["app_name"], "user_id": meta["user_id"], "last_update_time": float(meta["last_update_time"])},
+            encoded,
+            int(meta["version"]),
+        )
+
+    async def _load_events(self, session_id, config):
+        _, _, events_key = self._keys(session_id)
+        start = -config.num_recent_events if config and config.num_recent_events else 0
+        events = [Event.model_validate_json(raw) for raw in await self._redis.lrange(events_key, start, -1)]
+        if config and config.after_timestamp:
+            events = [event for event in events if event.timestamp >= config.after_timestamp]
+        return events
+
+    async def _write_diff(self, session, changed, removed, expected_version, event=None):
+        args: List[Any] = [expected_version, session.last_update_time, len(changed)]
+        for key, value in changed.items():
+            args.extend([key, value])
+        args.append(len(removed))
+        args.extend(removed)
+        args.append(event.model_dump_json(exclude_none=True) if event is not None else "")
+
+        new_version = await self._write_script(keys=list(self._keys(session.id)), args=args)
+        if int(new_version) < 0:
+            raise ConflictError(
+                f"Session {session.id} was modified concurrently.",
+                resource="session",
+                details={"expected_version": expected_version},
+            )
+        return int(new_version)
+
+    async def _list(self, app_name, user_id):
+        session_ids = sorted(await self._redis.smembers(self._index_key(app_name, user_id)))
+        rows = []
+        for session_id in session_ids:
+            last_update_time = await self._redis.hget(self._keys(session_id)[0], "last_update_time")
+            if last_update_time is not None:
+                rows.append({"id": session_id, "last_update_time": float(last_update_time)})
+        return rows
+
+    async def _delete(self, session_id):
+        meta_key, state_key, events_key = self._keys(session_id)
+        meta = await self._redis.hgetall(meta_key)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            if meta:
+                pipe.srem(self._index_key(meta["app_name"], meta["user_id"]), session_id)
+            pipe.delete(meta_key, state_key, events_key)
+            await pipe.execute()
+        async for log_key in self._redis.scan_iter(match=self._log_key(session_id, "*")):
+            await self._redis.delete(log_key)
+
+    async def _append_log(self, session_id, log_name, entries):
+        if not entries:
+            return await self._redis.llen(self._log_key(session_id, log_name))
+        return await self._redis.rpush(self._log_key(session_id, log_name), *entries)
+
+    async def _read_log(self, session_id, log_name, start, end):
+        if end is not None and end <= start:
+            # LRANGE would read -1 as "up to the last entry"
+            return []
+        return await self._redis.lrange(self._log_key(session_id, log_name), start, -1 if end is None else end - 1)
+
+    async def _put_blob(self, ref, data):
+        await self._redis.set(f"{self._prefix}:blob:{ref}", data, nx=True)
+
+    async def _get_blob(self, ref):
+        return await self._redis.get(f"{self._prefix}:blob:{ref}")
+
+
+# --- Factory ---
+
+def create_session_service(store_url: str, **kwargs) -> PersistentSessionService:
+    """
+    Build a session service from a store URL.
+
+    Supported URLs:
+        sqlite:///./interview_sessions.db  (local file, shared by workers on one node)
+        redis://host:6379/0                (shared across nodes)
+        memory://                          (in-memory SQLite, process-local, for quick experiments)
+
+    Extra keyword arguments are passed to the service constructor.
+    """
+    if store_url.startswith("sqlite:///"):
+        return SQLiteSessionService(store_url[len("sqlite:///"):] or ":memory:", **kwargs)
+    if store_url.startswith(("redis://", "rediss://")):
+        return RedisSessionService(store_url, **kwargs)
+    if store_url.startswith("memory://"):
+        logger.warning("Using in-memory session store. Sessions will be lost on restart.")
+        return SQLiteSessionService(":memory:", **kwargs)
+    raise ConfigurationError("session_store_url", f"Unsupported session store URL: {store_url}")
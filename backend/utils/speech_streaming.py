@@ -0,0 +1,167 @@
+"""
+Streaming speech recognition backends.
+
+A recognizer consumes an async stream of audio chunks and yields interim and
+final transcripts as they become available, so callers can show (and act
+on) what the founder says while they are still speaking.
+"""
+
+import abc
+import asyncio
+import logging
+import queue
+from concurrent.futures import Executor, Future
+from typing import AsyncIterator, Iterator, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a recognition stream on the thread -> event loop queue.
+_END_OF_STREAM = object()
+
+
+def release_when_done(future: Future, slots: asyncio.Semaphore) -> None:
+    """
+    Releases a slot of `slots` once `future`, running on an executor thread, has finished.
+
+    Call from the event loop. A caller that stops waiting (timeout, disconnect)
+    can't stop the thread, so the slot stays taken until the thread is free again.
+    """
+    loop = asyncio.get_running_loop()
+
+    def release(_):
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:
+            pass  # The event loop has already been closed
+
+    future.add_done_callback(release)
+
+
+class TranscriptResult(BaseModel):
+    """An interim or final transcript for the current utterance."""
+    transcript: str
+    is_final: bool
+    stability: Optional[float] = None
+    confidence: Optional[float] = None
+
+
+class StreamingRecognizer(abc.ABC):
+    """Base class for streaming recognizers."""
+
+    @abc.abstractmethod
+    def recognize(
+        self,
+        audio_chunks: AsyncIterator[bytes],
+        encoding,
+        sample_rate_hertz: int,
+    ) -> AsyncIterator[TranscriptResult]:
+        """Yields interim and final transcripts for the audio until the stream ends."""
+
+
+class GoogleStreamingRecognizer(StreamingRecognizer):
+    """
+    Google Cloud streaming recognition.
+
+    The synchronous gRPC stream runs on the given (bounded) executor; audio is fed to
+    it through a thread-safe queue and results are handed back to the event loop as
+    they arrive. `slots` limits the number of concurrent streams.
+    """
+
+    def __init__(self, client, executor: Executor, slots: asyncio.Semaphore, timeout: float, language_code: str = "en-US"):
+        self.client = client
+        self.executor = executor
+        self.slots = slots
+        self.timeout = timeout
+        self.language_code = language_code
+
+    def _recognize_sync(self, audio: Iterator[bytes], encoding, sample_rate_hertz: int) -> Iterator[TranscriptResult]:
+        from google.cloud import speech
+
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=encoding,
+                sample_rate_hertz=sample_rate_hertz,
+                language_code=self.language_code,
+                model="default",
+            ),
+            interim_results=True,
+        )
+        requests = (speech.StreamingRecognizeRequest(audio_content=chunk) for chunk in audio)
+        for response in self.client.streaming_recognize(config=streaming_config, requests=requests, timeout=self.timeout):
+            for result in response.results:
+                if not result.alternatives:
+                    continue
+                alternative = result.alternatives[0]
+                yield TranscriptResult(
+                    transcript=alternative.transcript,
+                    is_final=result.is_final,
+                    stability=result.stability or None,
+                    confidence=alternative.confidence if result.is_final else None,
+                )
+
+    async def recognize(self, audio_chunks, encoding, sample_rate_hertz):
+        loop = asyncio.get_running_loop()
+        audio_queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        results: asyncio.Queue = asyncio.Queue()
+
+        def run_stream():
+            try:
+                for result in self._recognize_sync(iter(audio_queue.get, None), encoding, sample_rate_hertz):
+                    loop.call_soon_threadsafe(results.put_nowait, result)
+            except Exception as e:
+                loop.call_soon_threadsafe(results.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(results.put_nowait, _END_OF_STREAM)
+
+        async def pump_audio():
+            try:
+                async for chunk in audio_chunks:
+                    if chunk:
+                        audio_queue.put(chunk)
+            finally:
+                audio_queue.put(None)
+
+        await asyncio.wait_for(self.slots.acquire(), timeout=self.timeout)
+        try:
+            stream_future = self.executor.submit(run_stream)
+        except BaseException:
+            self.slots.release()
+            raise
+        release_when_done(stream_future, self.slots)
+        pump_task = asyncio.create_task(pump_audio())
+        try:
+            while True:
+                item = await results.get()
+                if item is _END_OF_STREAM:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Ends the request iterator, which lets the gRPC stream (and its thread) finish.
+            pump_task.cancel()
+            audio_queue.put(None)
+
+
+class FakeStreamingRecognizer(StreamingRecognizer):
+    """
+    Local recognizer for tests and offline development.
+
+    Audio chunks are treated as UTF-8 text. An interim result is emitted after every
+    chunk, and a final result whenever the pending text ends a sentence and when the
+    stream ends.
+    """
+
+    async def recognize(self, audio_chunks, encoding, sample_rate_hertz):
+        pending = ""
+        async for chunk in audio_chunks:
+            pending += chunk.decode("utf-8", errors="ignore")
+            if pending.rstrip().endswith((".", "?", "!")):
+                yield TranscriptResult(transcript=pending.strip(), is_final=True, confidence=1.0)
+                pending = ""
+            elif pending.strip():
+                yield TranscriptResult(transcript=pending.strip(), is_final=False, stability=0.5)
+        if pending.strip():
+            yield TranscriptResult(transcript=pending.strip(), is_final=True, confidence=1.0)